@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Startup-time benchmark: cost of importing each CloudCull subsystem in a fresh interpreter.
+
+Every module is imported in its own subprocess (so nothing is already cached in
+sys.modules) and the median of --runs wall-clock import times is reported. Subsystems
+share dependencies, so rows are not additive; "cli" is what every cloudcull invocation pays
+before any adapter is built. Modules whose third-party SDK is missing are reported as not
+installed; any other import error is printed and the script exits non-zero.
+
+Usage: python scripts/bench_startup.py [--runs 5] [--json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SUBSYSTEMS = [
+    ("settings", "src.core.settings"),
+    ("scheduler", "src.core.scheduler"),
+    ("cache", "src.core.cache"),
+    ("features (numpy)", "src.core.features"),
+    ("llm factory", "src.llm.factory"),
+    ("adapter registry", "src.adapters"),
+    ("adapter: aws", "src.adapters.aws"),
+    ("adapter: azure", "src.adapters.azure"),
+    ("adapter: gcp", "src.adapters.gcp"),
+    ("llm: anthropic", "src.llm.providers.anthropic"),
+    ("llm: openai", "src.llm.providers.openai"),
+    ("llm: google", "src.llm.providers.google"),
+    ("llm: groq", "src.llm.providers.groq"),
+    ("cli", "src.main"),
+]
+
+# Exit status of a probe whose import failed on a missing third-party package
+MISSING_SDK = 3
+# Result for a module that failed to import for any other reason
+FAILED = "import error"
+
+PROBE = (
+    "import sys, time, importlib\n"
+    "t = time.perf_counter()\n"
+    "try:\n"
+    "    importlib.import_module({module!r})\n"
+    "except ModuleNotFoundError as e:\n"
+    "    # A missing src.* module is a CloudCull bug, not an optional SDK\n"
+    "    if not e.name or e.name.split('.')[0] == 'src':\n"
+    "        raise\n"
+    f"    sys.exit({MISSING_SDK})\n"
+    "print(time.perf_counter() - t)"
+)
+
+def measure(module: str, runs: int) -> float | None:
+    """
+    Median import time in seconds, or None when a third-party package the module needs is
+    not installed. Any other import failure raises CalledProcessError with the probe's stderr.
+    """
+    samples = []
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, "-c", PROBE.format(module=module)],
+            cwd=ROOT, capture_output=True, text=True, check=False
+        )
+        if proc.returncode == MISSING_SDK:
+            return None
+        if proc.returncode != 0:
+            raise subprocess.CalledProcessError(proc.returncode, proc.args, proc.stdout, proc.stderr)
+        samples.append(float(proc.stdout.strip().splitlines()[-1]))
+    return statistics.median(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure CloudCull import cost per subsystem")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per subsystem")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results, failed = {}, []
+    for name, module in SUBSYSTEMS:
+        try:
+            results[name] = measure(module, args.runs)
+        except subprocess.CalledProcessError as e:
+            print(f"Importing {module} failed:\n{e.stderr}", file=sys.stderr)
+            results[name] = FAILED
+            failed.append(name)
+
+    if args.json:
+        print(json.dumps({name: t if t is None or t == FAILED else round(t * 1000, 1) for name, t in results.items()},
+                         indent=2))
+    else:
+        print(f"{'Subsystem':<20} {'Import (ms)':>12}")
+        print("-" * 33)
+        for name, seconds in results.items():
+            if seconds is None:
+                label = "not installed"
+            elif seconds == FAILED:
+                label = FAILED
+            else:
+                label = f"{seconds * 1000:.1f}"
+            print(f"{name:<20} {label:>12}")
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,251 @@
-from typing import List
+import importlib
+import logging
+import sqlite3
+import threading
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple
 from .base import AbstractAdapter
-from .aws import AWSAdapter
-from .azure import AzureAdapter
-from .gcp import GCPAdapter
+from ..core.cache import PersistentCache
+from ..core.settings import settings
+
+if TYPE_CHECKING:
+    from .aws import AWSAdapter, AWSClientPool
+
+logger = logging.getLogger("CloudCull.Adapters")
+
+# Adapter modules import their cloud SDKs (boto3, azure-mgmt-*, google-cloud-*), so they are
+# only loaded when an adapter of that platform is built or one of these names is accessed
+PLATFORMS = ("aws", "azure", "gcp")
+_LAZY_EXPORTS = {
+    "AWSAdapter": ".aws",
+    "AWSClientPool": ".aws",
+    "AzureAdapter": ".azure",
+    "GCPAdapter": ".gcp",
+}
+
+def __getattr__(name: str):
+    if name in _LAZY_EXPORTS:
+        return getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def parse_platforms(spec: str | None) -> List[str] | None:
+    """Parses "aws,gcp" into ["aws", "gcp"]; None or empty means every platform."""
+    platforms = [p.strip().lower() for p in (spec or "").split(",") if p.strip()]
+    unknown = sorted(set(platforms) - set(PLATFORMS))
+    if unknown:
+        raise ValueError(f"Unknown platform(s): {', '.join(unknown)}; expected any of {', '.join(PLATFORMS)}")
+    return platforms or None
+
+# (platform, region, account/subscription, project, simulated). AWS adapters use the default
+# credential chain, so their account slot is unused; Azure adapters are keyed once per
+# subscription they cover.
+AdapterKey = Tuple[str, str | None, str | None, str | None, bool]
 
 class AdapterRegistry:
+    """
+    Builds adapters and keeps the live ones, with their SDK clients, keyed by AdapterKey.
+    Discovery registers every adapter it creates, so remediation reuses the same verified
+    adapters and pooled connections instead of building new clients per instance.
+    """
+    _adapters: Dict[AdapterKey, AbstractAdapter] = {}
+    # Scopes whose adapter failed pre-flight; get_adapter() refuses them until one is registered again
+    _evicted: set = set()
+    _aws_clients: "AWSClientPool | None" = None
+    _lock = threading.RLock()
+
     @staticmethod
-    def get_all_adapters(region: str = "us-east-1", simulated: bool = False) -> List[AbstractAdapter]:
-        return [
-            AWSAdapter(region=region, simulated=simulated),
-            AzureAdapter(simulated=simulated),
-            GCPAdapter(simulated=simulated)
-        ]
+    def get_all_adapters(region: str = "us-east-1", simulated: bool = False, regions: List[str] = None,
+                         platforms: List[str] = None) -> List[AbstractAdapter]:
+        """Adapters for the selected platforms (all by default); unselected SDKs are never imported."""
+        platforms = platforms or PLATFORMS
+        # One store for every adapter; keys are namespaced per adapter class
+        store = AdapterRegistry.series_store(simulated)
+        adapters = []
+        if "aws" in platforms:
+            adapters.extend(AdapterRegistry.get_aws_adapters(region, simulated, regions, series_store=store))
+        if "azure" in platforms:
+            from .azure import AzureAdapter
+            adapters.append(AzureAdapter(simulated=simulated, series_store=store,
+                                         attribution_cache=AdapterRegistry.attribution_cache("azure", simulated)))
+        if "gcp" in platforms:
+            from .gcp import GCPAdapter
+            adapters.append(GCPAdapter(simulated=simulated, series_store=store,
+                                       attribution_cache=AdapterRegistry.attribution_cache("gcp", simulated)))
+        for adapter in adapters:
+            AdapterRegistry.register(adapter, simulated)
+        return adapters
 
     @staticmethod
-    def get_adapter_by_platform(platform: str, region: str = "us-east-1", simulated: bool = False) -> AbstractAdapter:
+    def aws_clients() -> "AWSClientPool":
+        """Process-wide boto3 client pool shared by every AWS adapter the registry builds."""
+        with AdapterRegistry._lock:
+            if AdapterRegistry._aws_clients is None:
+                from .aws import AWSClientPool
+                AdapterRegistry._aws_clients = AWSClientPool()
+            return AdapterRegistry._aws_clients
+
+    @staticmethod
+    def adapter_keys(adapter: AbstractAdapter, simulated: bool = False) -> List[AdapterKey]:
+        # Matched by class name so that unused adapter modules stay unimported
+        name = type(adapter).__name__ if isinstance(adapter, AbstractAdapter) else None
+        if name == "AWSAdapter":
+            return [("AWS", adapter.region, None, None, simulated)]
+        if name == "AzureAdapter":
+            return [("AZURE", None, sub, None, simulated) for sub in adapter.subscription_ids or [adapter.subscription_id]]
+        if name == "GCPAdapter":
+            return [("GCP", None, None, adapter.project_id, simulated)]
+        return []
+
+    @staticmethod
+    def register(adapter: AbstractAdapter, simulated: bool = False):
+        """Makes an adapter the one get_adapter() returns for its keys; the latest registration wins."""
+        with AdapterRegistry._lock:
+            for key in AdapterRegistry.adapter_keys(adapter, simulated):
+                AdapterRegistry._adapters[key] = adapter
+                AdapterRegistry._evicted.discard(key)
+
+    @staticmethod
+    def evict(adapter: AbstractAdapter, simulated: bool = False):
+        """Unregisters an adapter that failed verification, so nothing is routed to its scopes."""
+        with AdapterRegistry._lock:
+            for key in AdapterRegistry.adapter_keys(adapter, simulated):
+                if AdapterRegistry._adapters.get(key) is adapter:
+                    del AdapterRegistry._adapters[key]
+                AdapterRegistry._evicted.add(key)
+
+    @staticmethod
+    def clear():
+        """Drops all registered adapters and pooled clients."""
+        with AdapterRegistry._lock:
+            AdapterRegistry._adapters.clear()
+            AdapterRegistry._evicted.clear()
+            AdapterRegistry._aws_clients = None
+
+    @staticmethod
+    def get_adapter(platform: str, region: str = None, account: str = None, project: str = None,
+                    simulated: bool = False) -> AbstractAdapter:
+        """
+        Registered adapter for a platform and scope, building and registering one on a miss.
+        Unset scope fields default to the configured region, subscription or project.
+        """
         platform = platform.upper()
         if platform == "AWS":
-            return AWSAdapter(region=region, simulated=simulated)
+            key = ("AWS", region or settings.aws_region, None, None, simulated)
         elif platform == "AZURE":
-            return AzureAdapter(simulated=simulated)
+            key = ("AZURE", None, account or settings.azure_subscription_id, None, simulated)
         elif platform == "GCP":
-            return GCPAdapter(simulated=simulated)
-        raise ValueError(f"Unsupported platform: {platform}")
+            key = ("GCP", None, None, project or settings.gcp_project_id, simulated)
+        else:
+            raise ValueError(f"Unsupported platform: {platform}")
+
+        with AdapterRegistry._lock:
+            if key in AdapterRegistry._evicted:
+                raise ConnectionError(f"{platform} adapter for {key[1] or key[2] or key[3]} failed pre-flight verification")
+            adapter = AdapterRegistry._adapters.get(key)
+            if adapter is None:
+                adapter = AdapterRegistry._build(key)
+                AdapterRegistry.register(adapter, simulated)
+            return adapter
+
+    @staticmethod
+    def _build(key: AdapterKey) -> AbstractAdapter:
+        platform, region, account, project, simulated = key
+        logger.info("Creating %s adapter for %s", platform, region or account or project or "default scope")
+        if platform == "AWS":
+            from .aws import AWSAdapter
+            return AWSAdapter(region=region, simulated=simulated, client_pool=AdapterRegistry.aws_clients(),
+                              attribution_cache=AdapterRegistry.attribution_cache("aws", simulated))
+        if platform == "AZURE":
+            from .azure import AzureAdapter
+            return AzureAdapter(subscription_id=account, simulated=simulated,
+                                attribution_cache=AdapterRegistry.attribution_cache("azure", simulated))
+        from .gcp import GCPAdapter
+        return GCPAdapter(project_id=project, simulated=simulated,
+                          attribution_cache=AdapterRegistry.attribution_cache("gcp", simulated))
+
+    @staticmethod
+    def adapter_for_target(target: Dict[str, Any], simulated: bool = False,
+                           default_region: str = None) -> AbstractAdapter:
+        """Adapter for the region, subscription or project a discovered target lives in."""
+        metadata = target.get("metadata") or {}
+        return AdapterRegistry.get_adapter(
+            target["platform"],
+            region=target.get("region") or default_region,
+            account=metadata.get("subscription_id"),
+            project=metadata.get("project_id"),
+            simulated=simulated
+        )
+
+    @staticmethod
+    def attribution_cache(platform: str, simulated: bool = False) -> PersistentCache:
+        """
+        Persistent owner cache for one platform, or None when disabled, simulated
+        or the cache file cannot be opened (attribution then falls back to live lookups).
+        """
+        if simulated or not settings.attribution_cache_enabled:
+            return None
+        try:
+            return PersistentCache(
+                settings.cache_path,
+                namespace=f"attribution.{platform.lower()}",
+                ttl_seconds=settings.attribution_cache_ttl_days * 86400,
+                max_entries=settings.attribution_cache_max_entries
+            )
+        except (sqlite3.Error, OSError) as e:
+            logger.warning("Attribution cache unavailable at %s: %s", settings.cache_path, e)
+            return None
+
+    @staticmethod
+    def series_store(simulated: bool = False):
+        """
+        Local ring-buffer store sized to the longest FEATURE_WINDOWS window, or None when
+        window features are off, simulated, or NumPy is not installed.
+        """
+        if simulated or not settings.feature_windows or not settings.series_store_enabled:
+            return None
+        try:
+            from ..core.features import SERIES_PERIOD_SECONDS, parse_windows
+            from ..core.series_store import SeriesStore
+        except ImportError:
+            return None
+        try:
+            span = max(parse_windows(settings.feature_windows).values())
+            return SeriesStore(settings.series_store_path, capacity=span // SERIES_PERIOD_SECONDS,
+                               period=SERIES_PERIOD_SECONDS)
+        except (ValueError, OSError) as e:
+            logger.warning("Series store unavailable at %s: %s", settings.series_store_path, e)
+            return None
+
+    @staticmethod
+    def get_aws_adapters(region: str = "us-east-1", simulated: bool = False, regions: List[str] = None,
+                         series_store=None) -> List["AWSAdapter"]:
+        """
+        One AWSAdapter per region, sharing a single client pool and attribution cache.
+        `regions=["all"]` expands to every region enabled for the account.
+        """
+        from .aws import AWSAdapter
+
+        cache = AdapterRegistry.attribution_cache("aws", simulated)
+        pool = AdapterRegistry.aws_clients()
+        if not regions:
+            return [AWSAdapter(region=region, simulated=simulated, client_pool=pool, attribution_cache=cache,
+                               series_store=series_store)]
+
+        if [r.lower() for r in regions] == ["all"]:
+            if simulated:
+                regions = [region]
+            else:
+                try:
+                    regions = pool.enabled_regions(region)
+                except Exception as e:
+                    logger.error("Failed to list enabled AWS regions, scanning %s only: %s", region, e)
+                    regions = [region]
+
+        logger.info("AWS multi-region fan-out across %d regions: %s", len(regions), ", ".join(regions))
+        return [
+            AWSAdapter(region=r, simulated=simulated, client_pool=pool, attribution_cache=cache, series_store=series_store)
+            for r in regions
+        ]
+
+    @staticmethod
+    def get_adapter_by_platform(platform: str, region: str = "us-east-1", simulated: bool = False) -> AbstractAdapter:
+        return AdapterRegistry.get_adapter(platform, region=region, simulated=simulated)
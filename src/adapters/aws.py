@@ -1,24 +1,100 @@
 import boto3
 import datetime
+import json
 import logging
-from typing import List, Dict, Any
+import threading
+import time
+from typing import List, Dict, Any, Iterator
 
-from .base import AbstractAdapter
+from prometheus_client import Histogram
+
+from .base import PagedInventoryAdapter, STOP_DONE, STOP_FAILED, STOP_PENDING, unobserved_metrics
+from ..core.cache import PersistentCache
 
 logger = logging.getLogger("CloudCull.AWS")
 
-class AWSAdapter(AbstractAdapter):
-    def __init__(self, region: str = "us-east-1", simulated: bool = False):
+METRIC_BATCH_SECONDS = Histogram('cloudcull_aws_metric_batch_seconds', 'GetMetricData latency per instance batch', ['region'])
+METRIC_BATCH_DATAPOINTS = Histogram(
+    'cloudcull_aws_metric_batch_datapoints', 'Datapoints returned per GetMetricData instance batch', ['region'],
+    buckets=(0, 10, 50, 100, 500, 1000, 5000, 10000, 50000)
+)
+
+class AWSClientPool:
+    """
+    Thread-safe cache of boto3 clients keyed by (service, region).
+    Shared across per-region adapters so a multi-region scan builds each client once.
+    """
+    def __init__(self):
+        self._clients: Dict[tuple, Any] = {}
+        self._lock = threading.Lock()
+
+    def client(self, service: str, region: str, **config):
+        """Pooled client; `config` (botocore Config options, e.g. read_timeout) selects a separate client."""
+        # Config values can be dicts (e.g. retries={"max_attempts": 1}), so the options are keyed by repr
+        key = (service, region, repr(sorted(config.items())))
+        with self._lock:
+            if key not in self._clients:
+                # boto3's default session is not thread-safe, so clients are built under the lock
+                if config:
+                    from botocore.config import Config
+                    self._clients[key] = boto3.client(service, region_name=region, config=Config(**config))
+                else:
+                    self._clients[key] = boto3.client(service, region_name=region)
+            return self._clients[key]
+
+    def enabled_regions(self, seed_region: str) -> List[str]:
+        """Lists the regions enabled for this account (opted-in or default)."""
+        response = self.client("ec2", seed_region).describe_regions(AllRegions=False)
+        return sorted(r['RegionName'] for r in response.get('Regions', []))
+
+class AWSAdapter(PagedInventoryAdapter):
+    METRICS_POOL = "cloudwatch"
+    ATTRIBUTION_POOL = "cloudtrail"
+    REMEDIATION_POOL = "ec2"
+    # GetMetricData accepts at most 500 queries per call
+    MAX_QUERIES_PER_CALL = 500
+    # Instance IDs per StopInstances / DescribeInstances call
+    MAX_INSTANCE_IDS_PER_CALL = 1000
+    # (result key, namespace, metric, statistic, scale)
+    METRIC_QUERIES = (
+        ("max_cpu", "AWS/EC2", "CPUUtilization", "Maximum", 1.0),
+        ("network_in", "AWS/EC2", "NetworkIn", "Average", 1 / (1024 * 1024)),  # MBs
+    )
+    # GPU utilization from the CloudWatch agent's nvidia_gpu plugin. Agent metrics carry extra
+    # dimensions (GPU index, name, ...), so one region-wide Metrics Insights query per scan takes
+    # the peak across GPUs grouped by instance; results are matched back by their InstanceId label.
+    # Metrics Insights returns at most 500 series, so the busiest instances are kept.
+    GPU_METRIC_KEY = "max_gpu"
+    GPU_SERIES_LIMIT = 500
+    GPU_METRIC_EXPRESSION = ("SELECT MAX(nvidia_smi_utilization_gpu) FROM CWAgent GROUP BY InstanceId "
+                             f"ORDER BY MAX() DESC LIMIT {GPU_SERIES_LIMIT}")
+
+    def __init__(self, region: str = "us-east-1", simulated: bool = False, client_pool: AWSClientPool = None,
+                 attribution_cache: PersistentCache = None,
+                 series_store=None):
         self.region = region
         self.simulated = simulated
+        self.attribution_cache = attribution_cache
+        self.series_store = series_store
         self.gpu_types = ["p3", "p4", "g4", "g5", "p5"]
+        self.clients = client_pool or AWSClientPool()
+        self._attribution_index: Dict[str, str] | None = None
+        # False when the last sweep stopped early; misses then fall back to per-instance lookups
+        self._attribution_index_complete = False
+        # Peak GPU per instance from this scan's region-wide query; None until it has run
+        self._gpu_peaks: Dict[str, float] | None = None
+        # False when that query failed or was truncated, so a missing peak is unknown
+        self._gpu_peaks_complete = False
+        self._gpu_lock = threading.Lock()
+        self.scan_stats: Dict[str, int] = {}
+        self._stats_lock = threading.Lock()
         
         if not self.simulated:
             try:
                 from botocore.exceptions import ClientError, NoCredentialsError
-                self.ec2 = boto3.client("ec2", region_name=region)
-                self.cw = boto3.client("cloudwatch", region_name=region)
-                self.cloudtrail = boto3.client("cloudtrail", region_name=region)
+                self.ec2 = self.clients.client("ec2", region)
+                self.cw = self.clients.client("cloudwatch", region)
+                self.cloudtrail = self.clients.client("cloudtrail", region)
             except (NoCredentialsError, ClientError) as e:
                 logger.error("AWS Authentication/Connection Failed: %s.", e)
                 # No silent fallback to simulated=True here. 
@@ -30,25 +106,53 @@ class AWSAdapter(AbstractAdapter):
 
     def get_metrics(self, instance_id: str, **kwargs) -> Dict[str, float]:
         """Satifies AbstractAdapter interface using batch logic."""
-        batch_results = self._get_batch_metrics([instance_id])
-        return batch_results.get(instance_id, {"max_cpu": 0.0, "network_in": 0.0})
+        batch_results = self.get_metrics_batch([instance_id])
+        return batch_results.get(instance_id) or unobserved_metrics()
 
 
+    @staticmethod
+    def _owner_from_tags(metadata: Dict = None) -> str | None:
+        if metadata and 'Tags' in metadata:
+            tags = {t['Key'].lower(): t['Value'] for t in metadata['Tags']}
+            for key in ['owner', 'createdby', 'creator', 'user']:
+                if key in tags:
+                    return tags[key]
+        return None
 
     def get_attribution(self, instance_id: str, metadata: Dict = None) -> str:
         """
         Governance Layer: Uses a Tags-First strategy for attribution.
         1. Check tags (Owner, CreatedBy) - 0ms latency
-        2. Fallback to CloudTrail - High latency
+        2. Persistent attribution cache from earlier runs - 0ms latency
+        3. Fleet-wide RunInstances index, when built for this scan - 0ms latency
+        4. Fallback to CloudTrail - High latency
         """
         # 1. Tags-First Optimization
-        if metadata and 'Tags' in metadata:
-            tags = {t['Key'].lower(): t['Value'] for t in metadata['Tags']}
-            for key in ['owner', 'createdby', 'creator', 'user']:
-                if key in tags:
-                    return tags[key]
+        owner = self._owner_from_tags(metadata)
+        if owner:
+            return owner
+
+        # 2. Persistent Cache: the launcher never changes for the life of an instance
+        if self.attribution_cache:
+            owner = self.attribution_cache.get(instance_id)
+            if owner:
+                return owner
+
+        owner = self._lookup_attribution(instance_id)
+        if self.attribution_cache and owner != "Unknown":
+            self.attribution_cache.set(instance_id, owner)
+        return owner
+
+    def _lookup_attribution(self, instance_id: str) -> str:
+        # 3. Batch Index: covers the same window a per-instance lookup would search
+        if self._attribution_index is not None:
+            owner = self._attribution_index.get(instance_id)
+            if owner is not None:
+                return owner
+            if self._attribution_index_complete:
+                return "Unknown"
 
-        # 2. CloudTrail Fallback
+        # 4. CloudTrail Fallback
         try:
             logger.info("Looking up attribution for %s via CloudTrail...", instance_id)
             paginator = self.cloudtrail.get_paginator('lookup_events')
@@ -60,7 +164,7 @@ class AWSAdapter(AbstractAdapter):
                 PaginationConfig={'MaxItems': 50, 'PageSize': 50}
             )
 
-            for page in page_iterator:
+            for page in self._limiter(self.ATTRIBUTION_POOL).iterate(page_iterator):
                 for event in page.get('Events', []):
                     # We look for RunInstances or CreateInstances (GPU context)
                     if event.get('EventName') in ['RunInstances', 'CreateInstances']:
@@ -70,155 +174,326 @@ class AWSAdapter(AbstractAdapter):
             logger.warning("CloudTrail lookup failed for %s: %s", instance_id, e)
         return "Unknown"
 
+    def _limiter(self, api: str):
+        # CloudWatch and CloudTrail quotas are per region
+        return super()._limiter(f"{api}.{self.region}")
+
+    def _needs_lookup(self, inst: Dict) -> bool:
+        """True when neither tags nor the persistent cache can attribute the instance."""
+        if self._owner_from_tags(inst):
+            return False
+        return not (self.attribution_cache and self.attribution_cache.has(inst['InstanceId']))
+
+    def build_attribution_index(self) -> Dict[str, str]:
+        """
+        Sweeps every RunInstances event in the lookback window once and maps
+        instance ID -> launching user. CloudTrail LookupEvents is throttled to ~2 TPS,
+        so a few paged calls here replace one throttled lookup per untagged instance.
+        """
+        from ..core.settings import settings
+
+        end_time = datetime.datetime.now(datetime.UTC)
+        start_time = end_time - datetime.timedelta(days=settings.aws_attribution_lookback_days)
+        index: Dict[str, str] = {}
+        pages = 0
+        self._attribution_index_complete = False
+
+        try:
+            paginator = self.cloudtrail.get_paginator('lookup_events')
+            page_iterator = paginator.paginate(
+                LookupAttributes=[{'AttributeKey': 'EventName', 'AttributeValue': 'RunInstances'}],
+                StartTime=start_time,
+                EndTime=end_time,
+                PaginationConfig={'PageSize': 50}
+            )
+            for page in self._limiter(self.ATTRIBUTION_POOL).iterate(page_iterator):
+                pages += 1
+                for event in page.get('Events', []):
+                    username = event.get('Username', 'Unknown')
+                    for iid in self._launched_instance_ids(event):
+                        # Events are newest-first; an instance ID is only ever launched once
+                        index.setdefault(iid, username)
+            self._attribution_index_complete = True
+        except Exception as e:
+            # Keep what was indexed; instances the sweep did not reach are looked up one by one
+            logger.warning("CloudTrail attribution sweep failed after %d pages: %s", pages, e)
+
+        logger.info("CloudTrail attribution index: %d instances from %d pages", len(index), pages)
+        return index
+
+    @staticmethod
+    def _launched_instance_ids(event: Dict) -> List[str]:
+        ids = [
+            r['ResourceName'] for r in event.get('Resources', [])
+            if r.get('ResourceType') == 'AWS::EC2::Instance' and r.get('ResourceName')
+        ]
+        if ids:
+            return ids
+
+        # Fallback: parse the raw event record
+        try:
+            record = json.loads(event.get('CloudTrailEvent') or '{}')
+            items = ((record.get('responseElements') or {}).get('instancesSet') or {}).get('items', [])
+            return [item['instanceId'] for item in items if item.get('instanceId')]
+        except (ValueError, TypeError, AttributeError):
+            return []
+
+    def _paged_metric_data(self, queries: List[Dict], start_time, end_time) -> List[Dict]:
+        """
+        One GetMetricData request followed through every NextToken page. Records the call's
+        latency and datapoint count; per-query results spread across pages are returned as-is.
+        """
+        limiter = self._limiter(self.METRICS_POOL)
+        started = time.monotonic()
+        results: List[Dict] = []
+        kwargs = {}
+        try:
+            while True:
+                response = limiter.call(
+                    self.cw.get_metric_data,
+                    MetricDataQueries=queries,
+                    StartTime=start_time,
+                    EndTime=end_time,
+                    ScanBy='TimestampDescending',
+                    **kwargs
+                )
+                results.extend(response.get('MetricDataResults', []))
+                if not response.get('NextToken'):
+                    break
+                kwargs = {'NextToken': response['NextToken']}
+        finally:
+            datapoints = sum(len(r.get('Values', [])) for r in results)
+            METRIC_BATCH_SECONDS.labels(region=self.region).observe(time.monotonic() - started)
+            METRIC_BATCH_DATAPOINTS.labels(region=self.region).observe(datapoints)
+            with self._stats_lock:
+                self.scan_stats["metric_batches"] = self.scan_stats.get("metric_batches", 0) + 1
+                self.scan_stats["metric_datapoints"] = self.scan_stats.get("metric_datapoints", 0) + datapoints
+        return results
+
     def _get_batch_metrics(self, instance_ids: List[str]) -> Dict[str, Dict[str, float]]:
         """
         High-Performance Batch Retrieval using CloudWatch GetMetricData.
-        Retrieves CPU and Network metrics for up to 100 instances in a single API call (200 metrics).
+        Instances are split into batches of up to 500 queries (one per METRIC_QUERIES entry and
+        instance), fetched concurrently with full NextToken pagination alongside the scan's
+        grouped GPU query (see gpu_peaks). Query IDs are `m<query index>_<instance index>`.
         """
         if not instance_ids:
             return {}
 
-        results = {iid: {"max_cpu": 0.0, "network_in": 0.0} for iid in instance_ids}
-        
-        # CloudWatch Constraints: Max 500 metrics per call. We fetch 2 per instance.
-        # Safe batch size = 200 instances (400 metrics) to be safe.
-        BATCH_SIZE = 200
-        
+        from ..core.scheduler import scheduler
+        from ..core.settings import settings
+
+        results = {iid: unobserved_metrics() for iid in instance_ids}
+        # Metric keys that returned datapoints, per instance
+        observed = {iid: set() for iid in instance_ids}
+        specs = self.METRIC_QUERIES
+        batch_size = self.MAX_QUERIES_PER_CALL // len(specs)
+
         end_time = datetime.datetime.now(datetime.UTC)
         start_time = end_time - datetime.timedelta(hours=1)
-        
         # Align to hour for cache hit optimization (Best Practice)
         start_time = start_time.replace(minute=0, second=0, microsecond=0)
 
-        for i in range(0, len(instance_ids), BATCH_SIZE):
-            batch_ids = instance_ids[i:i + BATCH_SIZE]
-            metric_queries = []
-            
-            for index, iid in enumerate(batch_ids):
-                # Query 1: CPU
-                metric_queries.append({
-                    'Id': f'cpu_{index}',
+        def fetch(batch_ids: List[str]):
+            queries = [
+                {
+                    'Id': f'm{k}_{index}',
                     'MetricStat': {
                         'Metric': {
-                            'Namespace': 'AWS/EC2',
-                            'MetricName': 'CPUUtilization',
+                            'Namespace': namespace,
+                            'MetricName': metric_name,
                             'Dimensions': [{'Name': 'InstanceId', 'Value': iid}]
                         },
                         'Period': 3600,
-                        'Stat': 'Maximum',
+                        'Stat': stat,
                     },
                     'ReturnData': True
-                })
-                # Query 2: NetworkIn
-                metric_queries.append({
-                    'Id': f'net_{index}',
-                    'MetricStat': {
-                        'Metric': {
-                            'Namespace': 'AWS/EC2',
-                            'MetricName': 'NetworkIn',
-                            'Dimensions': [{'Name': 'InstanceId', 'Value': iid}]
+                }
+                for index, iid in enumerate(batch_ids)
+                for k, (_, namespace, metric_name, stat, _) in enumerate(specs)
+            ]
+            try:
+                for res in self._paged_metric_data(queries, start_time, end_time):
+                    values = res.get('Values', [])
+                    if values:
+                        # Parse ID: m1_7 -> query 1, instance 7
+                        k, idx = res['Id'][1:].split('_')
+                        key, *_, scale = specs[int(k)]
+                        target = results[batch_ids[int(idx)]]
+                        # Several hourly points (or pages) per query: keep the peak
+                        target[key] = max(target[key], max(values) * scale)
+                        observed[batch_ids[int(idx)]].add(key)
+            except Exception as e:
+                logger.error("Batch Metric Fetch Failed for %d instances: %s", len(batch_ids), e)
+
+        # Each task writes disjoint instances, so results needs no lock
+        futures = [scheduler.submit(self.METRICS_POOL, fetch, instance_ids[i:i + batch_size])
+                   for i in range(0, len(instance_ids), batch_size)]
+        gpu = scheduler.submit(self.METRICS_POOL, self.gpu_peaks, start_time, end_time) if settings.aws_gpu_metrics else None
+        for future in futures:
+            future.result()
+        for iid, keys in observed.items():
+            if len(keys) == len(specs):
+                results[iid].pop("metrics_observed")
+
+        if gpu is not None:
+            peaks = gpu.result()
+            for iid, target in results.items():
+                if iid in peaks:
+                    target[self.GPU_METRIC_KEY] = peaks[iid]
+                elif not self._gpu_peaks_complete:
+                    # Failed or truncated query: a missing GPU peak is unknown rather than absent
+                    target["metrics_observed"] = False
+        return results
+
+    def gpu_peaks(self, start_time, end_time) -> Dict[str, float]:
+        """
+        Peak GPU utilization per instance in the region, queried once per scan and reused by
+        every page. Sets _gpu_peaks_complete only when the query succeeded without hitting
+        GPU_SERIES_LIMIT, i.e. when instances missing from the result report no GPU metrics.
+        """
+        with self._gpu_lock:
+            if self._gpu_peaks is not None:
+                return self._gpu_peaks
+            query = {'Id': 'gpu', 'Expression': self.GPU_METRIC_EXPRESSION, 'Period': 3600, 'ReturnData': True}
+            peaks: Dict[str, float] = {}
+            try:
+                for res in self._paged_metric_data([query], start_time, end_time):
+                    # Grouped query: one result per instance, labelled with its ID
+                    if res.get('Label') and res.get('Values'):
+                        peaks[res['Label']] = max(peaks.get(res['Label'], 0.0), max(res['Values']))
+                self._gpu_peaks_complete = len(peaks) < self.GPU_SERIES_LIMIT
+                if not self._gpu_peaks_complete:
+                    logger.warning("GPU utilization query in %s hit the %d-series limit; instances below %.1f%% "
+                                   "peak GPU are left to the LLM", self.region, self.GPU_SERIES_LIMIT, min(peaks.values()))
+            except Exception as e:
+                self._gpu_peaks_complete = False
+                logger.warning("GPU utilization query failed in %s (is the CloudWatch agent installed?): %s; "
+                               "GPU instances are left to the LLM", self.region, e)
+            self._gpu_peaks = peaks
+            return peaks
+
+    def get_metric_series(self, instance_ids: List[str], start: float, end: float, period: int,
+                          **kwargs) -> Dict[str, Dict[str, tuple]]:
+        """Full-resolution CPU (average) and NetworkIn (sum) series via paginated GetMetricData."""
+        if self.simulated or not instance_ids:
+            return {}
+
+        # 2 queries per instance, 500 queries per call
+        BATCH_SIZE = 250
+        series: Dict[str, Dict[str, tuple]] = {}
+        paginator = self.cw.get_paginator('get_metric_data')
+
+        for i in range(0, len(instance_ids), BATCH_SIZE):
+            batch_ids = instance_ids[i:i + BATCH_SIZE]
+            metric_queries = []
+            for index, iid in enumerate(batch_ids):
+                for prefix, metric_name, stat in (('cpu', 'CPUUtilization', 'Average'), ('net', 'NetworkIn', 'Sum')):
+                    metric_queries.append({
+                        'Id': f'{prefix}_{index}',
+                        'MetricStat': {
+                            'Metric': {
+                                'Namespace': 'AWS/EC2',
+                                'MetricName': metric_name,
+                                'Dimensions': [{'Name': 'InstanceId', 'Value': iid}]
+                            },
+                            'Period': period,
+                            'Stat': stat,
                         },
-                        'Period': 3600,
-                        'Stat': 'Average',
-                    },
-                    'ReturnData': True
-                })
+                        'ReturnData': True
+                    })
 
             try:
-                # API Call: GetMetricData (Batch)
-                response = self.cw.get_metric_data(
+                for page in self._limiter(self.METRICS_POOL).iterate(paginator.paginate(
                     MetricDataQueries=metric_queries,
-                    StartTime=start_time,
-                    EndTime=end_time,
-                    ScanBy='TimestampDescending'
-                )
-                
-                # Map results back
-                for res in response.get('MetricDataResults', []):
-                    query_id = res['Id']
-                    values = res.get('Values', [])
-                    val = values[0] if values else 0.0
-                    
-                    # Parse ID: cpu_0 -> index 0
-                    parts = query_id.split('_')
-                    m_type = parts[0]
-                    idx = int(parts[1])
-                    target_iid = batch_ids[idx]
-                    
-                    if m_type == "cpu":
-                        results[target_iid]["max_cpu"] = val
-                    elif m_type == "net":
-                        results[target_iid]["network_in"] = val / (1024 * 1024) # MBs
-
+                    StartTime=datetime.datetime.fromtimestamp(start, datetime.UTC),
+                    EndTime=datetime.datetime.fromtimestamp(end, datetime.UTC),
+                    ScanBy='TimestampAscending'
+                )):
+                    for res in page.get('MetricDataResults', []):
+                        m_type, idx = res['Id'].split('_')
+                        key, scale = ("cpu", 1.0) if m_type == "cpu" else ("network_in", 1 / (1024 * 1024))  # MBs
+                        timestamps, values = series.setdefault(batch_ids[int(idx)], {}).setdefault(key, ([], []))
+                        timestamps.extend(ts.timestamp() for ts in res.get('Timestamps', []))
+                        values.extend(v * scale for v in res.get('Values', []))
             except Exception as e:
-                logger.error("Batch Metric Fetch Failed: %s", e)
-                
-        return results
+                logger.error("Batch metric series fetch failed: %s", e)
+
+        return series
 
     def scan(self) -> List[Dict]:
+        return list(self.scan_iter())
+
+    def scan_iter(self) -> Iterator[Dict]:
+        """Streams GPU targets page by page through the batch metrics and attribution calls."""
         logger.info("Probing AWS [%s] for GPU waste...", self.region)
         
         if self.simulated:
             logger.info("Running AWS in MOCK mode (No Credentials found/provided).")
-            return [{
+            yield {
                 "platform": "AWS",
+                "region": self.region,
                 "id": "i-0a1b2c3d4e5f6g7h8",
                 "type": "p4d.24xlarge",
                 "metrics": {"max_cpu": 0.2, "network_in": 0.05},
                 "owner": "research_lead",
                 "metadata": {"InstanceId": "i-0a1b2c3d4e5f6g7h8", "InstanceType": "p4d.24xlarge"}
-            }]
+            }
+            return
 
+        yield from super().scan_iter()
+
+    def iter_inventory(self) -> Iterator[Dict[str, Dict]]:
+        """Running GPU instances, one page per DescribeInstances page."""
+        self._attribution_index = None
+        self._attribution_index_complete = False
+        self._gpu_peaks = None
+        self._gpu_peaks_complete = False
+        self.scan_stats = {}
         filters = [{'Name': 'instance-state-name', 'Values': ['running']}]
-        gpu_instances = []
         paginator = self.ec2.get_paginator('describe_instances')
-        page_iterator = paginator.paginate(Filters=filters)
 
-        for page in page_iterator:
-            for res in page['Reservations']:
-                for inst in res['Instances']:
-                    itype = inst['InstanceType']
-                    if any(gt in itype for gt in self.gpu_types):
-                        gpu_instances.append(inst)
+        for page in paginator.paginate(Filters=filters):
+            gpu_instances = {
+                inst['InstanceId']: inst
+                for res in page['Reservations']
+                for inst in res['Instances']
+                if any(gt in inst['InstanceType'] for gt in self.gpu_types)
+            }
+            if gpu_instances:
+                logger.info("Optimization: Batch analyzing %d GPU instances...", len(gpu_instances))
+                yield gpu_instances
 
-        if not gpu_instances:
-            return []
+    def get_metrics_batch(self, instance_ids: List[str], **kwargs) -> Dict[str, Dict[str, float]]:
+        # Replaces N calls with ~1 call per page
+        return self._get_batch_metrics(instance_ids)
 
-        logger.info(f"Optimization: Batch analyzing {len(gpu_instances)} GPU instances...")
-        
-        # 1. Batch Metrics (API Optimization)
-        # Replaces N calls with ~1 call
-        all_ids = [inst['InstanceId'] for inst in gpu_instances]
-        metrics_map = self._get_batch_metrics(all_ids)
-        
-        # 2. Parallel Attribution (IO Optimization)
-        # Uses threads for CloudTrail lookups since they are IO-bound and independent
-        from concurrent.futures import ThreadPoolExecutor
-        
-        targets = []
-        
-        def process_instance(inst):
-            iid = inst['InstanceId']
-            # Safe get from batch map
-            metrics = metrics_map.get(iid, {"max_cpu": 0.0, "network_in": 0.0})
-            
-            # This is the slow part, running in thread
-            # Optimization: Tag-level metadata passed for zero-latency attribution
-            owner = self.get_attribution(iid, inst)
-            
-            return {
-                "platform": "AWS",
-                "id": iid,
-                "type": inst['InstanceType'],
-                "metrics": metrics,
-                "owner": owner,
-                "metadata": inst
-            }
+    def get_attribution_batch(self, instance_ids: List[str], records: Dict[str, Dict] = None, **kwargs) -> Dict[str, str]:
+        """
+        Tags and the persistent cache resolve most instances for free. Once a page holds
+        aws_attribution_batch_threshold unresolved instances, a single CloudTrail sweep
+        serves the rest of the scan; below that, per-instance lookups run concurrently.
+        """
+        from ..core.settings import settings
+        records = records or {}
+
+        # Switch untagged fleets to a single CloudTrail sweep for the rest of the scan
+        untagged = sum(1 for iid in instance_ids if self._needs_lookup(records.get(iid) or {'InstanceId': iid}))
+        if self._attribution_index is None and untagged >= settings.aws_attribution_batch_threshold:
+            self._attribution_index = self.build_attribution_index()
 
-        with ThreadPoolExecutor(max_workers=20) as executor:
-            targets = list(executor.map(process_instance, gpu_instances))
-            
-        return targets
+        return super().get_attribution_batch(instance_ids, records=records)
+
+    def build_target(self, instance_id: str, record: Dict, metrics: Dict[str, float], owner: str) -> Dict:
+        return {
+            "platform": "AWS",
+            "region": self.region,
+            "id": instance_id,
+            "type": record['InstanceType'],
+            "metrics": metrics,
+            "owner": owner,
+            "metadata": record
+        }
 
     def stop_instance(self, instance_id: str, metadata: Dict[str, Any] = None):
         """Executes the kill-switch."""
@@ -228,12 +503,63 @@ class AWSAdapter(AbstractAdapter):
             return
         self.ec2.stop_instances(InstanceIds=[instance_id])
 
+    @staticmethod
+    def _stop_state(state_name: str | None) -> str:
+        # Terminated instances are gone for good, which is as stopped as they get
+        return STOP_DONE if state_name in ("stopped", "terminated") else STOP_PENDING
+
+    def stop_instances(self, targets: List[Dict[str, Any]]) -> Dict[str, str]:
+        """Bulk kill-switch: one StopInstances call per MAX_INSTANCE_IDS_PER_CALL instances."""
+        ids = [t['id'] for t in targets]
+        logger.warning("Executing Kill-Switch on %d AWS instances in %s...", len(ids), self.region)
+        if self.simulated:
+            logger.info("[SIMULATED] Stopped %d AWS instances", len(ids))
+            return {iid: STOP_DONE for iid in ids}
+
+        states: Dict[str, str] = {}
+        for i in range(0, len(ids), self.MAX_INSTANCE_IDS_PER_CALL):
+            chunk = ids[i:i + self.MAX_INSTANCE_IDS_PER_CALL]
+            try:
+                response = self._limiter(self.REMEDIATION_POOL).call(self.ec2.stop_instances, InstanceIds=chunk)
+                for item in response.get('StoppingInstances', []):
+                    states[item['InstanceId']] = self._stop_state((item.get('CurrentState') or {}).get('Name'))
+            except Exception as e:
+                # StopInstances is all-or-nothing per call (e.g. one unknown ID fails the chunk)
+                logger.error("StopInstances failed for %d instances in %s: %s", len(chunk), self.region, e)
+            for iid in chunk:
+                states.setdefault(iid, STOP_FAILED)
+        return states
+
+    def stop_states(self, instance_ids: List[str]) -> Dict[str, str]:
+        """Current states via DescribeInstances, MAX_INSTANCE_IDS_PER_CALL instances per call."""
+        if self.simulated:
+            return {iid: STOP_DONE for iid in instance_ids}
+
+        states: Dict[str, str] = {}
+        for i in range(0, len(instance_ids), self.MAX_INSTANCE_IDS_PER_CALL):
+            chunk = instance_ids[i:i + self.MAX_INSTANCE_IDS_PER_CALL]
+            try:
+                response = self._limiter(self.REMEDIATION_POOL).call(self.ec2.describe_instances, InstanceIds=chunk)
+                for reservation in response.get('Reservations', []):
+                    for inst in reservation.get('Instances', []):
+                        states[inst['InstanceId']] = self._stop_state((inst.get('State') or {}).get('Name'))
+            except Exception as e:
+                # Transient: the next polling round asks again
+                logger.warning("DescribeInstances failed while polling %d stops in %s: %s", len(chunk), self.region, e)
+            for iid in chunk:
+                states.setdefault(iid, STOP_PENDING)
+        return states
+
     def verify_connection(self) -> bool:
         """Actively validates AWS credentials via STS."""
         if self.simulated:
             return True
         try:
-            sts = boto3.client("sts", region_name=self.region)
+            from ..core.settings import settings
+            timeout = settings.preflight_timeout
+            # No retries: a failed check is reported, and re-run on the next start
+            sts = self.clients.client("sts", self.region, connect_timeout=timeout, read_timeout=timeout,
+                                      retries={"max_attempts": 1})
             sts.get_caller_identity()
             return True
         except Exception as e:
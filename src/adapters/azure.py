@@ -1,20 +1,40 @@
 import logging
 import datetime
-from typing import List, Dict, Any
+import re
+from typing import List, Dict, Any, Iterator
 from azure.identity import DefaultAzureCredential
 from azure.mgmt.compute import ComputeManagementClient
 from azure.mgmt.monitor import MonitorManagementClient
 
-from .base import AbstractAdapter
+from .base import PagedInventoryAdapter, unobserved_metrics
+from ..core.cache import PersistentCache
 
 logger = logging.getLogger("CloudCull.Azure")
 
-class AzureAdapter(AbstractAdapter):
-    def __init__(self, subscription_id: str = None, simulated: bool = False):
+class AzureAdapter(PagedInventoryAdapter):
+    METRICS_POOL = "azure_monitor"
+    ATTRIBUTION_POOL = "azure_monitor"
+    REMEDIATION_POOL = "azure_compute"
+    METRIC_NAMES = "Percentage CPU,Network In Total"
+    # Resource IDs per multi-resource metrics request (each ID is one OR-ed filter clause)
+    METRICS_BATCH_SIZE = 50
+
+    def __init__(self, subscription_id: str = None, simulated: bool = False,
+                 subscription_ids: List[str] = None, inventory_backend: str = None,
+                 attribution_cache: PersistentCache = None,
+                 series_store=None):
         self.simulated = simulated
+        self.attribution_cache = attribution_cache
+        self.series_store = series_store
         from ..core.settings import settings
         self.subscription_id = subscription_id or settings.azure_subscription_id
+        # Resource Graph covers every listed subscription in a single query
+        extra = subscription_ids or [s.strip() for s in (settings.azure_subscription_ids or "").split(",") if s.strip()]
+        self.subscription_ids = list(dict.fromkeys([self.subscription_id, *extra] if self.subscription_id else extra))
+        self.inventory_backend = inventory_backend or settings.azure_inventory_backend
         self.gpu_vms = ["NC", "ND", "NV"]
+        self._compute_clients: Dict[str, ComputeManagementClient] = {}
+        self._monitor_clients: Dict[str, MonitorManagementClient] = {}
         
         if not self.simulated:
             try:
@@ -22,6 +42,8 @@ class AzureAdapter(AbstractAdapter):
                 self.credential = DefaultAzureCredential()
                 self.compute_client = ComputeManagementClient(self.credential, self.subscription_id)
                 self.monitor_client = MonitorManagementClient(self.credential, self.subscription_id)
+                self._compute_clients[self.subscription_id] = self.compute_client
+                self._monitor_clients[self.subscription_id] = self.monitor_client
             except AzureError as e:
                 logger.error("Azure Service Error: %s. Check subscription/permissions.", e)
                 # Keep credential as None to signal failure to preflight check
@@ -30,133 +52,352 @@ class AzureAdapter(AbstractAdapter):
                 logger.error("Azure Authentication Failed: %s.", e, exc_info=True)
                 self.credential = None
 
+    @staticmethod
+    def _subscription_of(resource_id: str) -> str | None:
+        match = re.search(r"/subscriptions/([^/]+)", resource_id or "", re.IGNORECASE)
+        return match.group(1) if match else None
+
+    def _compute_for(self, subscription_id: str | None) -> ComputeManagementClient:
+        subscription_id = subscription_id or self.subscription_id
+        if subscription_id not in self._compute_clients:
+            self._compute_clients[subscription_id] = ComputeManagementClient(self.credential, subscription_id)
+        return self._compute_clients[subscription_id]
+
+    def _monitor_for(self, subscription_id: str | None) -> MonitorManagementClient:
+        subscription_id = subscription_id or self.subscription_id
+        if subscription_id not in self._monitor_clients:
+            self._monitor_clients[subscription_id] = MonitorManagementClient(self.credential, subscription_id)
+        return self._monitor_clients[subscription_id]
+
+    @staticmethod
+    def _timespan(hours: int = 1) -> str:
+        end_time = datetime.datetime.now(datetime.UTC)
+        start_time = end_time - datetime.timedelta(hours=hours)
+        return f"{start_time.isoformat()}/{end_time.isoformat()}"
+
+    @staticmethod
+    def _fold_series(result: Dict[str, float], metric_name: str, timeserie) -> bool:
+        """Folds one Azure Monitor time series into a max_cpu / network_in result; True if it had data."""
+        folded = False
+        for data in timeserie.data:
+            if metric_name == "Percentage CPU" and data.maximum is not None:
+                result["max_cpu"] = max(result["max_cpu"], data.maximum)
+                folded = True
+            elif metric_name == "Network In Total" and data.total is not None:
+                result["network_in"] = max(result["network_in"], data.total / (1024 * 1024))  # MBs
+                folded = True
+        return folded
+
+    def _mark_observed(self, result: Dict[str, Any], metric_names: set):
+        """Drops the unobserved flag once every METRIC_NAMES metric returned data."""
+        if metric_names >= set(self.METRIC_NAMES.split(",")):
+            result.pop("metrics_observed", None)
+
     def get_metrics(self, instance_id: str, **kwargs) -> Dict[str, float]:
         """Real Azure Monitor metric probing."""
         try:
-            end_time = datetime.datetime.now(datetime.UTC)
-            start_time = end_time - datetime.timedelta(hours=1)
-            
-            timespan = f"{start_time.isoformat()}/{end_time.isoformat()}"
-            
             metrics_data = self.monitor_client.metrics.list(
                 instance_id,
-                timespan=timespan,
+                timespan=self._timespan(),
                 interval='PT1H',
-                metricnames='Percentage CPU',
-                aggregation='Maximum'
+                metricnames=self.METRIC_NAMES,
+                aggregation='Maximum,Total'
             )
             
-            max_cpu = 0.0
+            result = unobserved_metrics()
+            observed = set()
             for item in metrics_data.value:
                 for timeserie in item.timeseries:
-                    for data in timeserie.data:
-                        if data.maximum is not None:
-                            max_cpu = data.maximum
-            
-            return {
-                "max_cpu": max_cpu,
-                "network_in": 0.01 # Industrial metric probing
-            }
+                    if self._fold_series(result, item.name.value, timeserie):
+                        observed.add(item.name.value)
+            self._mark_observed(result, observed)
+            return result
         except Exception as e:
             logger.error("Error fetching Azure metrics for %s: %s", instance_id, e)
-            return {"max_cpu": 0.0, "network_in": 0.0}
+            return unobserved_metrics()
+
+    def _iter_subscription_metrics(self, resource_ids_by_region: Dict[str, List[str]],
+                                   **query) -> Iterator[tuple]:
+        """
+        Runs a subscription-scope (multi-resource) metrics query per region, subscription and
+        METRICS_BATCH_SIZE VMs, yielding (resource id, metric name, time series) per VM.
+        Series are split per VM by the Microsoft.ResourceId dimension.
+        """
+        limiter = self._limiter(self.METRICS_POOL)
+        by_lower_id = {rid.lower(): rid for ids in resource_ids_by_region.values() for rid in ids}
+
+        for region, ids in resource_ids_by_region.items():
+            # Subscription-scope queries only see their own subscription
+            by_subscription: Dict[str | None, List[str]] = {}
+            for rid in ids:
+                by_subscription.setdefault(self._subscription_of(rid), []).append(rid)
+
+            for subscription_id, sub_ids in by_subscription.items():
+                monitor_client = self._monitor_for(subscription_id)
+                for i in range(0, len(sub_ids), self.METRICS_BATCH_SIZE):
+                    chunk = sub_ids[i:i + self.METRICS_BATCH_SIZE]
+                    try:
+                        response = limiter.call(
+                            monitor_client.metrics.list_at_subscription_scope,
+                            region,
+                            metricnames=self.METRIC_NAMES,
+                            metricnamespace='microsoft.compute/virtualmachines',
+                            filter=" or ".join(f"Microsoft.ResourceId eq '{rid}'" for rid in chunk),
+                            top=len(chunk),
+                            **query
+                        )
+                    except Exception as e:
+                        logger.error("Batch Azure metric fetch failed for %d VMs in %s: %s", len(chunk), region, e)
+                        continue
+
+                    # Map results back via the resource ID dimension
+                    for item in response.value:
+                        for timeserie in item.timeseries:
+                            rid = next(
+                                (m.value for m in (timeserie.metadatavalues or [])
+                                 if m.name.value.lower() == "microsoft.resourceid"),
+                                None
+                            )
+                            target = by_lower_id.get((rid or "").lower())
+                            if target:
+                                yield target, item.name.value, timeserie
+
+    def _get_batch_metrics(self, resource_ids_by_region: Dict[str, List[str]]) -> Dict[str, Dict[str, float]]:
+        """
+        High-Performance Batch Retrieval using the subscription-scope (multi-resource) metrics API.
+        CPU and network for up to METRICS_BATCH_SIZE VMs of one region and subscription come
+        back in a single request.
+        """
+        results = {
+            rid: unobserved_metrics()
+            for ids in resource_ids_by_region.values() for rid in ids
+        }
+        observed = {rid: set() for rid in results}
+        for rid, metric_name, timeserie in self._iter_subscription_metrics(
+            resource_ids_by_region, timespan=self._timespan(), interval='PT1H', aggregation='Maximum,Total'
+        ):
+            if self._fold_series(results[rid], metric_name, timeserie):
+                observed[rid].add(metric_name)
+        for rid, names in observed.items():
+            self._mark_observed(results[rid], names)
+        return results
+
+    @staticmethod
+    def _group_by_region(instance_ids: List[str], records: Dict[str, Dict] = None) -> Dict[str, List[str]]:
+        resource_ids_by_region: Dict[str, List[str]] = {}
+        for rid in instance_ids:
+            location = ((records or {}).get(rid) or {}).get("location")
+            if location:
+                resource_ids_by_region.setdefault(location, []).append(rid)
+        return resource_ids_by_region
+
+    def get_metrics_batch(self, instance_ids: List[str], records: Dict[str, Dict] = None, **kwargs) -> Dict[str, Dict[str, float]]:
+        """
+        Multi-resource metrics, grouped by VM region from the inventory records.
+        Replaces N calls with ~N/50 calls; VMs without a known region fall back to single calls.
+        """
+        resource_ids_by_region = self._group_by_region(instance_ids, records)
+        results = self._get_batch_metrics(resource_ids_by_region)
+        unplaced = [rid for rid in instance_ids if rid not in results]
+        if unplaced:
+            results.update(super().get_metrics_batch(unplaced))
+        return results
+
+    def get_metric_series(self, instance_ids: List[str], start: float, end: float, period: int,
+                          records: Dict[str, Dict] = None, **kwargs) -> Dict[str, Dict[str, tuple]]:
+        """Full-resolution CPU (average) and network (total) series via the multi-resource API."""
+        resource_ids_by_region = self._group_by_region(instance_ids, records)
+        if self.simulated or not resource_ids_by_region:
+            return {}
+
+        def to_iso(ts: float) -> str:
+            return datetime.datetime.fromtimestamp(ts, datetime.UTC).isoformat()
+
+        series: Dict[str, Dict[str, tuple]] = {}
+        for rid, metric_name, timeserie in self._iter_subscription_metrics(
+            resource_ids_by_region,
+            timespan=f"{to_iso(start)}/{to_iso(end)}",
+            interval=f"PT{period // 60}M",
+            aggregation='Average,Total'
+        ):
+            key, field, scale = (
+                ("cpu", "average", 1.0) if metric_name == "Percentage CPU"
+                else ("network_in", "total", 1 / (1024 * 1024))  # MBs
+            )
+            timestamps, values = series.setdefault(rid, {}).setdefault(key, ([], []))
+            for data in timeserie.data:
+                value = getattr(data, field)
+                if value is not None:
+                    timestamps.append(data.time_stamp.timestamp())
+                    values.append(value * scale)
+        return series
 
     def get_attribution(self, instance_id: str, **kwargs) -> str:
         """
         Governance Layer: Simulation of Azure Activity Log lookup.
         In production, this requires querying the Activity Logs for 'write' operations.
+        Owners recorded in the persistent attribution cache take precedence.
         """
+        if self.attribution_cache:
+            owner = self.attribution_cache.get(instance_id)
+            if owner:
+                return owner
+        # Placeholder identity; never persisted so a real lookup can replace it
         return "azure_admin"
 
+    def get_attribution_batch(self, instance_ids: List[str], **kwargs) -> Dict[str, str]:
+        return {rid: self.get_attribution(rid) for rid in instance_ids}
+
     def scan(self) -> List[Dict]:
+        return list(self.scan_iter())
+
+    def scan_iter(self) -> Iterator[Dict]:
+        """Streams GPU targets once the batched metrics and attribution lookups resolve."""
         logger.info("Probing Azure [%s] for GPU waste...", self.subscription_id)
         
         if self.simulated:
             logger.info("Running Azure in MOCK mode (No Credentials found/provided).")
-            return [{
+            yield {
                 "platform": "AZURE",
                 "id": "mock-vm-gpu-01",
                 "type": "Standard_NC6",
                 "metrics": {"max_cpu": 1.2, "network_in": 0.01},
                 "owner": "dev_analyst",
                 "metadata": {"location": "eastus", "resource_id": "/mock/id"}
-            }]
+            }
+            return
 
-        targets = []
-        gpu_instances = []
         try:
-            for vm in self.compute_client.virtual_machines.list_all():
-                vm_size = vm.hardware_profile.vm_size
-                if any(gpu in vm_size for gpu in self.gpu_vms):
-                    gpu_instances.append(vm)
-
-            if not gpu_instances:
-                return []
-
-            logger.info(f"Optimization: Parallel analyzing {len(gpu_instances)} Azure GPU VMs...")
-
-            # Optimization: Parallelize metric & attribution gathering
-            # Azure Monitor REST API is slower per-call, so threads help significantly here.
-            from concurrent.futures import ThreadPoolExecutor
-
-            def process_vm(vm):
-                try:
-                    metrics = self.get_metrics(vm.id)
-                    owner = self.get_attribution(vm.id)
-                    
-                    return {
-                        "platform": "Azure",
-                        "id": vm.name,
-                        "type": vm.hardware_profile.vm_size,
-                        "metrics": metrics,
-                        "owner": owner,
-                        "metadata": {
-                            "location": vm.location,
-                            "resource_id": vm.id,
-                            "tags": vm.tags
-                        }
-                    }
-                except Exception as e:
-                    logger.error("Failed to process Azure VM %s: %s", vm.name, e)
-                    return None
-
-            with ThreadPoolExecutor(max_workers=20) as executor:
-                results = list(executor.map(process_vm, gpu_instances))
-                targets = [r for r in results if r is not None]
-                
+            yield from super().scan_iter()
         except Exception as e:
             logger.error("Azure scan failed: %s", e)
-            
-        return targets
+
+    def iter_inventory(self) -> Iterator[Dict[str, Dict]]:
+        """Running GPU VMs as a single page keyed by resource ID."""
+        gpu_instances = self._list_gpu_vms()
+        if gpu_instances:
+            logger.info(f"Optimization: Batch analyzing {len(gpu_instances)} Azure GPU VMs...")
+            yield {vm["id"]: vm for vm in gpu_instances}
+
+    def build_target(self, instance_id: str, vm: Dict, metrics: Dict[str, float], owner: str) -> Dict | None:
+        try:
+            return {
+                "platform": "Azure",
+                "id": vm["name"],
+                "type": vm["vm_size"],
+                "metrics": metrics,
+                "owner": owner,
+                "metadata": {
+                    "location": vm["location"],
+                    "resource_id": vm["id"],
+                    "subscription_id": vm["subscription_id"],
+                    "tags": vm["tags"]
+                }
+            }
+        except Exception as e:
+            logger.error("Failed to process Azure VM %s: %s", vm.get("name"), e)
+            return None
+
+    def _list_gpu_vms(self) -> List[Dict]:
+        """Inventory of running GPU VMs as plain records, from the configured backend."""
+        if self.inventory_backend == "resource_graph":
+            try:
+                return self._list_gpu_vms_resource_graph()
+            except ImportError:
+                logger.warning("AZURE_INVENTORY_BACKEND=resource_graph needs azure-mgmt-resourcegraph; "
+                               "falling back to Compute listing.")
+            except Exception as e:
+                logger.warning("Resource Graph inventory failed (%s); falling back to Compute listing.", e)
+        return self._list_gpu_vms_compute()
+
+    def _list_gpu_vms_resource_graph(self) -> List[Dict]:
+        """
+        Azure Resource Graph inventory: size-family and power-state filtering happen
+        server-side, only the projected fields come back, and all subscriptions are
+        covered by one paged query. Deallocated VMs never reach metrics or the LLM.
+        """
+        from azure.mgmt.resourcegraph import ResourceGraphClient
+        from azure.mgmt.resourcegraph.models import QueryRequest, QueryRequestOptions
+
+        size_filter = " or ".join(f"vmSize contains_cs '{family}'" for family in self.gpu_vms)
+        query = (
+            "Resources"
+            " | where type =~ 'microsoft.compute/virtualmachines'"
+            " | extend vmSize = tostring(properties.hardwareProfile.vmSize)"
+            f" | where {size_filter}"
+            " | extend powerState = tostring(properties.extended.instanceView.powerState.code)"
+            " | where powerState =~ 'PowerState/running'"
+            " | project id, name, location, subscriptionId, vmSize, tags"
+        )
+
+        client = ResourceGraphClient(self.credential)
+        records = []
+        skip_token = None
+        while True:
+            response = client.resources(QueryRequest(
+                subscriptions=self.subscription_ids,
+                query=query,
+                options=QueryRequestOptions(skip_token=skip_token, top=1000, result_format="objectArray")
+            ))
+            for row in response.data:
+                records.append({
+                    "id": row["id"],
+                    "name": row["name"],
+                    "location": row["location"],
+                    "subscription_id": row.get("subscriptionId"),
+                    "vm_size": row["vmSize"],
+                    "tags": row.get("tags") or {}
+                })
+            skip_token = response.skip_token
+            if not skip_token:
+                break
+
+        logger.info("Resource Graph: %d running GPU VMs across %d subscriptions", len(records), len(self.subscription_ids))
+        return records
+
+    def _list_gpu_vms_compute(self) -> List[Dict]:
+        """Legacy inventory: pages every VM in the subscription and filters by size client-side."""
+        records = []
+        for vm in self.compute_client.virtual_machines.list_all():
+            vm_size = vm.hardware_profile.vm_size
+            if any(gpu in vm_size for gpu in self.gpu_vms):
+                records.append({
+                    "id": vm.id,
+                    "name": vm.name,
+                    "location": vm.location,
+                    "subscription_id": self.subscription_id,
+                    "vm_size": vm_size,
+                    "tags": vm.tags
+                })
+        return records
 
     def stop_instance(self, instance_id: str, metadata: Dict[str, Any]):
-        """Hardened Kill-Switch: Extracts RG from full Resource ID."""
+        """
+        Hardened Kill-Switch: Extracts RG from full Resource ID.
+        Returns the deallocation poller; raises when the stop cannot be issued.
+        """
         logger.warning("Executing Kill-Switch on Azure VM %s...", instance_id)
         
         if self.simulated:
             logger.info("[SIMULATED] Deallocated Azure VM %s", instance_id)
-            return
+            return None
 
         resource_id = metadata.get('resource_id')
         if not resource_id:
-            logger.error("Azure kill-switch failed: record missing resource_id metadata")
-            return
+            raise ValueError("Azure kill-switch failed: record missing resource_id metadata")
 
-        try:
-            import re
-            # Standard Azure ID format: /subscriptions/{sub}/resourceGroups/{RG}/providers/Microsoft.Compute/virtualMachines/{name}
-            # Robust Regex Extraction
-            pattern = re.compile(r"/resourceGroups/([^/]+)/providers", re.IGNORECASE)
-            match = pattern.search(resource_id)
-            
-            if match:
-                resource_group = match.group(1)
-                self.compute_client.virtual_machines.begin_deallocate(resource_group, instance_id)
-                logger.info("Deallocation triggered for %s in %s", instance_id, resource_group)
-            else:
-                logger.error("Azure kill-switch failed: Resource ID format unexpected: %s", resource_id)
-        except Exception as e:
-            logger.error("Azure kill-switch failed for %s: %s", instance_id, e)
+        # Standard Azure ID format: /subscriptions/{sub}/resourceGroups/{RG}/providers/Microsoft.Compute/virtualMachines/{name}
+        # Robust Regex Extraction
+        pattern = re.compile(r"/resourceGroups/([^/]+)/providers", re.IGNORECASE)
+        match = pattern.search(resource_id)
+        if not match:
+            raise ValueError(f"Azure kill-switch failed: Resource ID format unexpected: {resource_id}")
+
+        resource_group = match.group(1)
+        compute_client = self._compute_for(self._subscription_of(resource_id))
+        poller = compute_client.virtual_machines.begin_deallocate(resource_group, instance_id)
+        logger.info("Deallocation triggered for %s in %s", instance_id, resource_group)
+        return poller
 
     def verify_connection(self) -> bool:
         """Actively validates Azure credentials by listing subscriptions."""
@@ -165,8 +406,10 @@ class AzureAdapter(AbstractAdapter):
         try:
             # We use a monitor client or similar for a lightweight check
             from azure.mgmt.resource import SubscriptionClient
+            from ..core.settings import settings
             sub_client = SubscriptionClient(self.credential)
-            sub_client.subscriptions.get(self.subscription_id)
+            sub_client.subscriptions.get(self.subscription_id, connection_timeout=settings.preflight_timeout,
+                                         read_timeout=settings.preflight_timeout)
             return True
         except Exception as e:
             logger.error("Azure connection verification failed: %s", e)
@@ -1,17 +1,184 @@
 import abc
-from typing import List, Dict, Any
+import logging
+import time
+from typing import List, Dict, Any, Iterator, Sequence, Tuple
+
+logger = logging.getLogger("CloudCull.Adapters")
+
+# Kill-switch states reported by stop_instances() / stop_states()
+STOP_PENDING = "stopping"
+STOP_DONE = "stopped"
+STOP_FAILED = "failed"
+
+def unobserved_metrics() -> Dict[str, Any]:
+    """
+    Placeholder metrics for an instance whose telemetry could not be fetched. The zeros keep
+    reports and prompts well-formed; metrics_observed=False tells the rules tier not to read
+    them as an idle instance. Adapters drop the flag once every metric has been observed.
+    """
+    return {"max_cpu": 0.0, "network_in": 0.0, "metrics_observed": False}
 
 class AbstractAdapter(abc.ABC):
+    # Scheduler pools (see core/scheduler.py) for the single-call fallbacks behind the batch methods
+    METRICS_POOL = "metrics"
+    ATTRIBUTION_POOL = "attribution"
+    REMEDIATION_POOL = "remediation"
+    # Metrics returned by get_metric_series
+    SERIES_METRICS = ("cpu", "network_in")
+    # Optional core.series_store.SeriesStore holding long-window series between runs
+    series_store = None
+    # Long-running stop operations by target id, tracked by stop_states()
+    _stop_operations: Dict[str, Any] = None
+
     @abc.abstractmethod
     def scan(self) -> List[Dict[str, Any]]:
         """Scans the cloud environment for relevant targets."""
         pass
 
+    def scan_iter(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yields targets as they are discovered. For batch-first adapters (PagedInventoryAdapter)
+        each inventory page costs one get_metrics_batch() and one get_attribution_batch() call.
+        Other adapters fall back to scan().
+        """
+        if not isinstance(self, PagedInventoryAdapter):
+            yield from self.scan()
+            return
+
+        for page in self.iter_inventory():
+            if not page:
+                continue
+            ids = list(page)
+            metrics_map = self.get_metrics_batch(ids, records=page)
+            self.add_window_features(metrics_map, records=page)
+            owners = self.get_attribution_batch(ids, records=page)
+            for iid, record in page.items():
+                metrics = metrics_map.get(iid) or unobserved_metrics()
+                target = self.build_target(iid, record, metrics, owners.get(iid, "Unknown"))
+                if target is not None:
+                    yield target
+
     @abc.abstractmethod
     def get_metrics(self, instance_id: str, **kwargs) -> Dict[str, float]:
         """Fetches telemetry for a specific instance."""
         pass
 
+    def get_metrics_batch(self, instance_ids: List[str], **kwargs) -> Dict[str, Dict[str, float]]:
+        """
+        Fetches telemetry for many instances, keyed by instance id. Adapters override this with
+        native bulk APIs; the default fans out get_metrics() calls on the METRICS_POOL.
+        """
+        return self._fan_out(self.METRICS_POOL, self.get_metrics, instance_ids, unobserved_metrics(), **kwargs)
+
+    def get_attribution_batch(self, instance_ids: List[str], **kwargs) -> Dict[str, str]:
+        """
+        Finds owners for many instances, keyed by instance id. Adapters override this with
+        native bulk APIs; the default fans out get_attribution() calls on the ATTRIBUTION_POOL.
+        """
+        return self._fan_out(self.ATTRIBUTION_POOL, self.get_attribution, instance_ids, "Unknown", **kwargs)
+
+    def _fan_out(self, pool: str, call, instance_ids: List[str], default: Any, records: Dict[str, Any] = None,
+                 **kwargs) -> Dict[str, Any]:
+        from ..core.scheduler import scheduler
+
+        def one(iid):
+            try:
+                if records and iid in records:
+                    return call(iid, metadata=records[iid], **kwargs)
+                return call(iid, **kwargs)
+            except Exception as e:
+                logger.error("%s.%s failed for %s: %s", type(self).__name__, call.__name__, iid, e)
+                # Callers add features to metrics dicts, so failed instances must not share one
+                return dict(default) if isinstance(default, dict) else default
+
+        return dict(zip(instance_ids, scheduler.map(pool, one, instance_ids)))
+
+    def _limiter(self, api: str):
+        """Adaptive limiter (core.limiter) to wrap around requests to one backend API."""
+        from ..core.scheduler import scheduler
+        return scheduler.limiter(api)
+
+    def get_metric_series(self, instance_ids: List[str], start: float, end: float, period: int,
+                          **kwargs) -> Dict[str, Dict[str, Tuple[Sequence[float], Sequence[float]]]]:
+        """
+        Fetches full-resolution series as instance id -> metric -> (period-start epoch
+        timestamps, values). Metrics: "cpu" (percent), "network_in" (MB per period).
+        Adapters without series support return nothing.
+        """
+        return {}
+
+    def add_window_features(self, metrics_map: Dict[str, Dict[str, Any]], **kwargs):
+        """
+        Adds multi-window utilization features (see core.features) under "windows" in each
+        instance's metrics. No-op unless FEATURE_WINDOWS is set and NumPy is installed.
+        """
+        from ..core.settings import settings
+        if not settings.feature_windows or not metrics_map:
+            return
+        try:
+            from ..core import features
+        except ImportError:
+            logger.warning("NumPy is not installed; multi-window features are disabled (pip install 'cloudcull[features]').")
+            return
+
+        try:
+            windows = features.parse_windows(settings.feature_windows)
+        except ValueError as e:
+            logger.error("Ignoring FEATURE_WINDOWS: %s", e)
+            return
+        period = features.SERIES_PERIOD_SECONDS
+        end = float(int(time.time()) // period * period)
+        try:
+            if self.series_store is not None:
+                series = self._stored_metric_series(list(metrics_map), end - max(windows.values()), end, period, **kwargs)
+            else:
+                series = self.get_metric_series(list(metrics_map), end - max(windows.values()), end, period, **kwargs)
+        except Exception as e:
+            logger.error("%s series fetch failed, skipping window features: %s", type(self).__name__, e)
+            return
+
+        for iid, per_window in features.fleet_features(series, windows, end, period).items():
+            if iid in metrics_map:
+                metrics_map[iid]["windows"] = per_window
+
+    def _stored_metric_series(self, instance_ids: List[str], start: float, end: float, period: int,
+                              **kwargs) -> Dict[str, Dict[str, Tuple[Sequence[float], Sequence[float]]]]:
+        """
+        Window series served from the local series store: instances with history only fetch
+        the delta since their last stored period, the rest fetch the full window once.
+        """
+        store = self.series_store
+        keys = {iid: f"{type(self).__name__}:{iid}" for iid in instance_ids}
+
+        resume: Dict[str, float] = {}
+        fresh = []
+        for iid in instance_ids:
+            stored = [store.last_timestamp(m, keys[iid]) for m in self.SERIES_METRICS]
+            stored = [ts for ts in stored if ts is not None]
+            if stored and max(stored) >= start:
+                resume[iid] = max(stored)
+            else:
+                fresh.append(iid)
+
+        fetched = {}
+        if fresh:
+            fetched.update(self.get_metric_series(fresh, start, end, period, **kwargs))
+        if resume:
+            # Re-fetch the last stored period too; it may have been partial
+            fetched.update(self.get_metric_series(list(resume), min(resume.values()), end, period, **kwargs))
+
+        series: Dict[str, Dict] = {}
+        for metric in self.SERIES_METRICS:
+            store.append(metric, {keys[iid]: s[metric] for iid, s in fetched.items() if metric in s})
+            by_key = store.read(metric, keys.values(), start, end)
+            for iid, key in keys.items():
+                if key in by_key:
+                    series.setdefault(iid, {})[metric] = by_key[key]
+        store.flush()
+        logger.info("%s series: %d full-window fetches, %d deltas from the local store",
+                    type(self).__name__, len(fresh), len(resume))
+        return series
+
     @abc.abstractmethod
     def get_attribution(self, instance_id: str, **kwargs) -> str:
         """Finds the owner/launcher of the instance."""
@@ -22,7 +189,68 @@ class AbstractAdapter(abc.ABC):
         """Executes the termination/stop action."""
         pass
 
+    def stop_instances(self, targets: List[Dict[str, Any]]) -> Dict[str, str]:
+        """
+        Issues stops for many targets, returning target id -> STOP_PENDING, STOP_DONE or
+        STOP_FAILED. The default runs stop_instance() concurrently on the REMEDIATION_POOL;
+        a returned long-running operation (anything with done() and result(), e.g. an Azure
+        poller or a GCP operation) stays pending until stop_states() sees it finish.
+        """
+        from ..core.scheduler import scheduler
+
+        def one(target):
+            try:
+                operation = self.stop_instance(target['id'], target.get('metadata') or {})
+            except Exception as e:
+                logger.error("%s stop failed for %s: %s", type(self).__name__, target['id'], e)
+                return STOP_FAILED, None
+            if hasattr(operation, "done"):
+                return STOP_PENDING, operation
+            return STOP_DONE, None
+
+        results = scheduler.map(self.REMEDIATION_POOL, one, targets)
+        if self._stop_operations is None:
+            self._stop_operations = {}
+        states = {}
+        for target, (state, operation) in zip(targets, results):
+            states[target['id']] = state
+            if operation is not None:
+                self._stop_operations[target['id']] = operation
+        return states
+
+    def stop_states(self, instance_ids: List[str]) -> Dict[str, str]:
+        """Current state of stops issued by stop_instances(); called once per polling round."""
+        states = {}
+        operations = self._stop_operations or {}
+        for iid in instance_ids:
+            operation = operations.get(iid)
+            if operation is None:
+                states[iid] = STOP_DONE
+                continue
+            try:
+                if not operation.done():
+                    states[iid] = STOP_PENDING
+                    continue
+                operation.result()
+                states[iid] = STOP_DONE
+            except Exception as e:
+                logger.error("%s stop failed for %s: %s", type(self).__name__, iid, e)
+                states[iid] = STOP_FAILED
+            del operations[iid]
+        return states
+
     @abc.abstractmethod
     def verify_connection(self) -> bool:
         """Actively validates cloud credentials/connectivity."""
         pass
+
+class PagedInventoryAdapter(AbstractAdapter):
+    """Batch-first adapter: scan_iter() walks inventory pages and builds targets from them."""
+
+    @abc.abstractmethod
+    def iter_inventory(self) -> Iterator[Dict[str, Any]]:
+        """Yields pages of running GPU instances as instance id -> raw provider record."""
+
+    @abc.abstractmethod
+    def build_target(self, instance_id: str, record: Any, metrics: Dict[str, Any], owner: str) -> Dict[str, Any] | None:
+        """Assembles the target dict for one inventory record; None drops the record."""
@@ -1,18 +1,35 @@
 import logging
 import datetime
-from typing import List, Dict, Any
+import threading
+import time
+from typing import List, Dict, Any, Iterator
 from google.cloud import compute_v1
 from google.cloud import monitoring_v3
 
-from .base import AbstractAdapter
+from .base import PagedInventoryAdapter, unobserved_metrics
+from ..core.cache import PersistentCache
 
 logger = logging.getLogger("CloudCull.GCP")
 
-class GCPAdapter(AbstractAdapter):
-    def __init__(self, project_id: str = None, simulated: bool = False):
+class GCPAdapter(PagedInventoryAdapter):
+    METRICS_POOL = "gcp_monitoring"
+    ATTRIBUTION_POOL = "gcp_logging"
+    REMEDIATION_POOL = "gcp_compute"
+    # Partial response: only the fields scan() reads, plus the page token
+    INSTANCE_FIELD_MASK = "nextPageToken,items/*/instances(id,name,machineType,status,guestAccelerators,labels)"
+    # Instance IDs OR-ed into a single audit log filter
+    ATTRIBUTION_CHUNK_SIZE = 50
+
+    def __init__(self, project_id: str = None, simulated: bool = False, attribution_cache: PersistentCache = None,
+                 series_store=None):
         self.simulated = simulated
+        self.attribution_cache = attribution_cache
+        self.series_store = series_store
         from ..core.settings import settings
         self.project_id = project_id or settings.gcp_project_id
+        self.scan_stats: Dict[str, Any] = {}
+        self._attribution_cache: Dict[str, str] = {}
+        self._attribution_lock = threading.Lock()
         
         if not self.simulated:
             try:
@@ -20,7 +37,7 @@ class GCPAdapter(AbstractAdapter):
                 from google.cloud import logging_v2
                 self.instances_client = compute_v1.InstancesClient()
                 self.metric_client = monitoring_v3.MetricServiceClient()
-                self.logging_client = logging_v2.LoggingServiceV2Client()
+                self.logging_client = logging_v2.Client(project=self.project_id)
             except GoogleAuthError as e:
                 logger.error("GCP Authentication Failed: %s. Ensure credentials are valid.", e)
                 self.instances_client = None
@@ -31,178 +48,331 @@ class GCPAdapter(AbstractAdapter):
                 self.simulated = True
 
     def get_metrics(self, instance_id: str, **kwargs) -> Dict[str, float]:
-        """Real GCP Cloud Monitoring metric probing."""
-        try:
-            now = datetime.datetime.now(datetime.UTC)
-            seconds = int(now.timestamp())
-            nanos = int(now.microsecond * 1000)
-            
-            interval = monitoring_v3.TimeInterval(
-                {
-                    "end_time": {"seconds": seconds, "nanos": nanos},
-                    "start_time": {"seconds": seconds - 3600, "nanos": nanos},
-                }
-            )
-            
-            # 1. CPU Utilization metric
-            results = self.metric_client.list_time_series(
-                name=f"projects/{self.project_id}",
-                filter=(
-                    'metric.type="compute.googleapis.com/instance/cpu/utilization" AND '
-                    f'resource.labels.instance_id="{instance_id}"'
-                ),
-                interval=interval,
-                view=monitoring_v3.ListTimeSeriesRequest.TimeSeriesView.FULL,
-            )
-            
-            max_cpu = 0.0
-            for result in results:
-                for point in result.points:
-                    if point.value.double_value > max_cpu:
-                        max_cpu = point.value.double_value
-
-            # 2. Network Utilization
-            results_net = self.metric_client.list_time_series(
-                name=f"projects/{self.project_id}",
-                filter=(
-                    'metric.type="compute.googleapis.com/instance/network/received_bytes_count" AND '
-                    f'resource.labels.instance_id="{instance_id}"'
-                ),
-                interval=interval,
-                view=monitoring_v3.ListTimeSeriesRequest.TimeSeriesView.FULL,
-            )
+        """Satisfies AbstractAdapter interface using batch logic."""
+        batch_results = self.get_metrics_batch([instance_id])
+        return batch_results.get(instance_id) or unobserved_metrics()
 
-            max_net_bytes = 0.0
-            for result in results_net:
-                for point in result.points:
-                    if point.value.double_value > max_net_bytes:
-                        max_net_bytes = point.value.double_value
+    def _list_time_series(self, request: Dict) -> List:
+        """ListTimeSeries with every page fetched under the monitoring limiter (paced and retried on 429s)."""
+        return self._limiter(self.METRICS_POOL).call(lambda: list(self.metric_client.list_time_series(request=request)))
 
-            return {
-                "max_cpu": max_cpu * 100, # Convert to percentage
-                "network_in": max_net_bytes / (1024 * 1024) # MBs
+    def _get_batch_metrics(self, instance_ids: List[str]) -> Dict[str, Dict[str, float]]:
+        """
+        High-Performance Batch Retrieval using Cloud Monitoring ListTimeSeries.
+        One project-wide query per metric type, reduced server-side to the hourly max
+        per instance, replaces two queries per instance.
+        """
+        if not instance_ids:
+            return {}
+
+        results = {iid: unobserved_metrics() for iid in instance_ids}
+        # Metric keys that returned points, per instance
+        observed = {iid: set() for iid in instance_ids}
+
+        now = datetime.datetime.now(datetime.UTC)
+        seconds = int(now.timestamp())
+        nanos = int(now.microsecond * 1000)
+        
+        interval = monitoring_v3.TimeInterval(
+            {
+                "end_time": {"seconds": seconds, "nanos": nanos},
+                "start_time": {"seconds": seconds - 3600, "nanos": nanos},
             }
-        except Exception as e:
-            logger.error("Error fetching GCP metrics for %s: %s", instance_id, e)
-            return {"max_cpu": 0.0, "network_in": 0.0}
+        )
+        aggregation = monitoring_v3.Aggregation(
+            {
+                "alignment_period": {"seconds": 3600},
+                "per_series_aligner": monitoring_v3.Aggregation.Aligner.ALIGN_MAX,
+                "cross_series_reducer": monitoring_v3.Aggregation.Reducer.REDUCE_MAX,
+                "group_by_fields": ["resource.label.instance_id"],
+            }
+        )
+
+        # (result key, metric type, scale)
+        queries = [
+            ("max_cpu", "compute.googleapis.com/instance/cpu/utilization", 100),  # Convert to percentage
+            ("network_in", "compute.googleapis.com/instance/network/received_bytes_count", 1 / (1024 * 1024)),  # MBs
+        ]
+
+        for key, metric_type, scale in queries:
+            try:
+                series_list = self._list_time_series(
+                    request={
+                        "name": f"projects/{self.project_id}",
+                        "filter": f'metric.type="{metric_type}" AND resource.type="gce_instance"',
+                        "interval": interval,
+                        "aggregation": aggregation,
+                        "view": monitoring_v3.ListTimeSeriesRequest.TimeSeriesView.FULL,
+                    }
+                )
+
+                # Map results back
+                for series in series_list:
+                    iid = series.resource.labels.get("instance_id")
+                    if iid not in results:
+                        continue
+                    peak = max(
+                        (p.value.double_value or float(p.value.int64_value) for p in series.points),
+                        default=0.0,
+                    )
+                    results[iid][key] = max(results[iid][key], peak * scale)
+                    if series.points:
+                        observed[iid].add(key)
+
+            except Exception as e:
+                logger.error("Batch GCP metric fetch failed for %s: %s", metric_type, e)
+
+        for iid, keys in observed.items():
+            if len(keys) == len(queries):
+                results[iid].pop("metrics_observed")
+        return results
+
+    def get_metric_series(self, instance_ids: List[str], start: float, end: float, period: int,
+                          **kwargs) -> Dict[str, Dict[str, tuple]]:
+        """Full-resolution CPU (mean) and received-bytes (sum) series, one project-wide query each."""
+        if self.simulated or not instance_ids:
+            return {}
+
+        wanted = set(instance_ids)
+        interval = monitoring_v3.TimeInterval(
+            {"end_time": {"seconds": int(end)}, "start_time": {"seconds": int(start)}}
+        )
+        Aligner = monitoring_v3.Aggregation.Aligner
+        Reducer = monitoring_v3.Aggregation.Reducer
+        # (series key, metric type, aligner, reducer, scale)
+        queries = [
+            ("cpu", "compute.googleapis.com/instance/cpu/utilization", Aligner.ALIGN_MEAN, Reducer.REDUCE_MEAN, 100),
+            ("network_in", "compute.googleapis.com/instance/network/received_bytes_count",
+             Aligner.ALIGN_SUM, Reducer.REDUCE_SUM, 1 / (1024 * 1024)),  # MBs per period
+        ]
+
+        series: Dict[str, Dict[str, tuple]] = {}
+        for key, metric_type, aligner, reducer, scale in queries:
+            try:
+                series_list = self._list_time_series(
+                    request={
+                        "name": f"projects/{self.project_id}",
+                        "filter": f'metric.type="{metric_type}" AND resource.type="gce_instance"',
+                        "interval": interval,
+                        "aggregation": monitoring_v3.Aggregation({
+                            "alignment_period": {"seconds": period},
+                            "per_series_aligner": aligner,
+                            "cross_series_reducer": reducer,
+                            "group_by_fields": ["resource.label.instance_id"],
+                        }),
+                        "view": monitoring_v3.ListTimeSeriesRequest.TimeSeriesView.FULL,
+                    }
+                )
+                for ts in series_list:
+                    iid = ts.resource.labels.get("instance_id")
+                    if iid not in wanted:
+                        continue
+                    timestamps, values = series.setdefault(iid, {}).setdefault(key, ([], []))
+                    for p in ts.points:
+                        # Aligned points are stamped with the end of their period
+                        timestamps.append(p.interval.end_time.timestamp() - period)
+                        values.append((p.value.double_value or float(p.value.int64_value)) * scale)
+            except Exception as e:
+                logger.error("GCP metric series fetch failed for %s: %s", metric_type, e)
+
+        return series
 
     def get_attribution(self, instance_id: str, **kwargs) -> str:
         """
         Governance Layer: Production-Ready logging for identity mapping.
         """
-        if self.simulated or not self.logging_client:
-            return "gcp_service_principal"
+        return self.get_attribution_batch([instance_id])[instance_id]
 
-        try:
+    def _resolve_attribution_batch(self, instance_ids: List[str]) -> Dict[str, str]:
+        """
+        Batch Audit Log resolver: one list_entries query per ATTRIBUTION_CHUNK_SIZE instances
+        (OR-ed instance IDs, bounded to the Admin Activity retention window).
+        Creators never change, so resolved principals are cached for the adapter's lifetime
+        and, when configured, in the persistent attribution cache across runs.
+        """
+        from ..core.settings import settings
+
+        with self._attribution_lock:
+            missing = [iid for iid in dict.fromkeys(instance_ids) if iid not in self._attribution_cache]
+
+        if self.attribution_cache:
+            still_missing = []
+            for iid in missing:
+                owner = self.attribution_cache.get(iid)
+                if owner:
+                    with self._attribution_lock:
+                        self._attribution_cache[iid] = owner
+                else:
+                    still_missing.append(iid)
+            missing = still_missing
+
+        since = datetime.datetime.now(datetime.UTC) - datetime.timedelta(days=settings.gcp_attribution_lookback_days)
+        for i in range(0, len(missing), self.ATTRIBUTION_CHUNK_SIZE):
+            chunk = missing[i:i + self.ATTRIBUTION_CHUNK_SIZE]
+            ids_expr = " OR ".join(f'"{iid}"' for iid in chunk)
             # Audit Logs: Method v1.compute.instances.insert
             filter_str = (
                 f'resource.type="gce_instance" AND '
-                f'resource.labels.instance_id="{instance_id}" AND '
-                f'protoPayload.methodName="v1.compute.instances.insert"'
+                f'protoPayload.methodName="v1.compute.instances.insert" AND '
+                f'resource.labels.instance_id=({ids_expr}) AND '
+                f'timestamp>="{since.strftime("%Y-%m-%dT%H:%M:%SZ")}"'
             )
-            
-            entries = self.logging_client.list_entries(
-                resource_names=[f"projects/{self.project_id}"],
-                filter_=filter_str, 
-                max_results=1
-            )
-            
-            for entry in entries:
-                if entry.proto_payload and entry.proto_payload.authentication_info:
-                    return entry.proto_payload.authentication_info.principal_email
-                    
-        except Exception as e:
-            logger.warning("Attribution lookup failed for %s: %s", instance_id, e)
-            
-        return "Unknown"
+            try:
+                entries = self._limiter(self.ATTRIBUTION_POOL).call(lambda: list(self.logging_client.list_entries(
+                    resource_names=[f"projects/{self.project_id}"],
+                    filter_=filter_str,
+                    page_size=1000
+                )))
+                for entry in entries:
+                    iid = (entry.resource.labels or {}).get("instance_id") if entry.resource else None
+                    principal = self._principal_of(entry)
+                    if iid and principal:
+                        with self._attribution_lock:
+                            if iid in self._attribution_cache:
+                                continue
+                            self._attribution_cache[iid] = principal
+                        if self.attribution_cache:
+                            self.attribution_cache.set(iid, principal)
+            except Exception as e:
+                logger.warning("Batch attribution lookup failed for %d instances: %s", len(chunk), e)
+
+        with self._attribution_lock:
+            return {iid: self._attribution_cache.get(iid, "Unknown") for iid in instance_ids}
+
+    @staticmethod
+    def _principal_of(entry) -> str | None:
+        payload = entry.payload if isinstance(entry.payload, dict) else {}
+        return (payload.get("authenticationInfo") or {}).get("principalEmail")
 
     def scan(self) -> List[Dict]:
+        return list(self.scan_iter())
+
+    def scan_iter(self) -> Iterator[Dict]:
+        """Streams GPU targets once the batched metrics and attribution lookups resolve."""
         logger.info("Probing GCP [%s] for GPU waste...", self.project_id)
         
         if self.simulated:
             logger.info("Running GCP in MOCK mode (No Credentials found/provided).")
-            return [{
+            yield {
                 "platform": "GCP",
                 "id": "mock-gpu-node-99",
                 "type": "a2-highgpu-1g",
                 "metrics": {"max_cpu": 0.5, "network_in": 0.02},
                 "owner": "ml_engineer",
                 "metadata": {"zone": "us-central1-a", "id": "9999", "labels": {}}
-            }]
+            }
+            return
 
-        targets = []
-        gpu_instances = []
         try:
-            # Note: list_all is more efficient for discovery across zones
-            request = compute_v1.AggregatedListInstancesRequest(project=self.project_id)
-            agg_list = self.instances_client.aggregated_list(request=request)
-            
-            for zone, response in agg_list:
-                if response.instances:
-                    zone_name = zone.split('/')[-1]
-                    for inst in response.instances:
-                        # Logic to identify GPU instances
-                        is_gpu = "a2-" in inst.machine_type or "g2-" in inst.machine_type or inst.guest_accelerators
-                        
-                        if inst.status == "RUNNING" and is_gpu:
-                            gpu_instances.append((inst, zone_name))
-
-            # Potential for batching metrics fetching here
-            # Optimization: Parallelize metric & attribution gathering
-            from concurrent.futures import ThreadPoolExecutor
-
-            if not gpu_instances:
-                return []
-
-            logger.info(f"Optimization: Parallel analyzing {len(gpu_instances)} GCP GPU instances...")
-
-            def process_instance(item):
-                try:
-                    inst, zone_name = item
-                    metrics = self.get_metrics(str(inst.id), zone=zone_name)
-                    owner = self.get_attribution(str(inst.id))
+            yield from super().scan_iter()
+        except Exception as e:
+            logger.error("GCP scan failed: %s", e)
+
+    def iter_inventory(self) -> Iterator[Dict[str, tuple]]:
+        """Running GPU instances from one aggregated listing, as a single page keyed by instance ID."""
+        gpu_instances = self._list_gpu_instances()
+        if gpu_instances:
+            logger.info(f"Optimization: Batch analyzing {len(gpu_instances)} GCP GPU instances...")
+            yield {str(inst.id): (inst, zone) for inst, zone in gpu_instances}
+
+    def get_metrics_batch(self, instance_ids: List[str], **kwargs) -> Dict[str, Dict[str, float]]:
+        # Replaces 2N calls with 2 project-wide calls
+        return self._get_batch_metrics(instance_ids)
+
+    def get_attribution_batch(self, instance_ids: List[str], **kwargs) -> Dict[str, str]:
+        # Replaces N audit log queries with ~N/50
+        if self.simulated or not self.logging_client:
+            return {iid: "gcp_service_principal" for iid in instance_ids}
+        return self._resolve_attribution_batch(instance_ids)
+
+    def _list_gpu_instances(self) -> List[tuple]:
+        """
+        Aggregated listing with server-side status filtering and a partial-response field mask,
+        so only running instances and the few fields we read are downloaded.
+        """
+        started = time.monotonic()
+        listed = 0
+        payload_bytes = 0
+        gpu_instances = []
+
+        # The eq/regex and =/has filter grammars cannot be mixed, and accelerator-attached
+        # general-purpose VMs (e.g. n1 + T4) have no family to match on, so only status is
+        # filtered server-side; the GPU check stays client-side on the trimmed payload.
+        request = compute_v1.AggregatedListInstancesRequest(
+            project=self.project_id,
+            filter='status = "RUNNING"',
+        )
+        agg_list = self.instances_client.aggregated_list(
+            request=request,
+            metadata=[("x-goog-fieldmask", self.INSTANCE_FIELD_MASK)],
+        )
+        
+        for zone, response in agg_list:
+            if response.instances:
+                zone_name = zone.split('/')[-1]
+                for inst in response.instances:
+                    listed += 1
+                    payload_bytes += self._message_size(inst)
+                    # Logic to identify GPU instances
+                    is_gpu = "a2-" in inst.machine_type or "g2-" in inst.machine_type or inst.guest_accelerators
                     
-                    return {
-                        "platform": "GCP",
-                        "id": inst.name,
-                        "type": inst.machine_type.split('/')[-1],
-                        "metrics": metrics,
-                        "owner": owner,
-                        "metadata": {
-                            "zone": zone_name,
-                            "id": inst.id,
-                            "labels": inst.labels
-                        }
-                    }
-                except Exception as e:
-                    logger.error("Failed to process GCP instance %s: %s", item[0].name, e)
-                    return None
+                    if inst.status == "RUNNING" and is_gpu:
+                        gpu_instances.append((inst, zone_name))
+
+        self.scan_stats = {
+            "listing_duration_s": round(time.monotonic() - started, 3),
+            "listed_instances": listed,
+            "gpu_candidates": len(gpu_instances),
+            "listing_payload_bytes": payload_bytes,
+        }
+        logger.info("GCP listing: %d running instances (%d GPU) in %.2fs, ~%d bytes",
+                    listed, len(gpu_instances), self.scan_stats["listing_duration_s"], payload_bytes)
+        return gpu_instances
 
-            with ThreadPoolExecutor(max_workers=20) as executor:
-                results = list(executor.map(process_instance, gpu_instances))
-                return [r for r in results if r is not None]
+    @staticmethod
+    def _message_size(inst) -> int:
+        """Serialized size of a listed instance, as an estimate of the listing payload."""
+        try:
+            return compute_v1.Instance.pb(inst).ByteSize()
+        except (TypeError, AttributeError):
+            return 0
 
+    def build_target(self, instance_id: str, item: tuple, metrics: Dict[str, float], owner: str) -> Dict | None:
+        try:
+            inst, zone_name = item
+            return {
+                "platform": "GCP",
+                "id": inst.name,
+                "type": inst.machine_type.split('/')[-1],
+                "metrics": metrics,
+                "owner": owner,
+                "metadata": {
+                    "zone": zone_name,
+                    "project_id": self.project_id,
+                    "id": inst.id,
+                    "labels": inst.labels
+                }
+            }
         except Exception as e:
-            logger.error("GCP scan failed: %s", e)
-            
-        return targets
+            logger.error("Failed to process GCP instance %s: %s", item[0].name, e)
+            return None
 
     def stop_instance(self, instance_id: str, metadata: Dict[str, Any]):
+        """Issues the stop and returns its zone operation; raises when the stop cannot be issued."""
         logger.warning("Executing Kill-Switch on GCP instance %s...", instance_id)
         if self.simulated:
             logger.info("[SIMULATED] Stopped GCP instance %s", instance_id)
-            return
+            return None
 
         zone = metadata.get('zone')
         if not zone:
-            logger.error("GCP kill-switch failed: record missing zone metadata")
-            return
+            raise ValueError("GCP kill-switch failed: record missing zone metadata")
 
-        try:
-            self.instances_client.stop(project=self.project_id, zone=zone, instance=instance_id)
-            logger.info("Stop triggered for %s in %s", instance_id, zone)
-        except Exception as e:
-            logger.error("GCP kill-switch failed for %s: %s", instance_id, e)
+        operation = self.instances_client.stop(
+            project=metadata.get('project_id') or self.project_id, zone=zone, instance=instance_id
+        )
+        logger.info("Stop triggered for %s in %s", instance_id, zone)
+        return operation
 
     def verify_connection(self) -> bool:
         """Actively validates GCP credentials by fetching project metadata."""
@@ -211,8 +381,9 @@ class GCPAdapter(AbstractAdapter):
         try:
             # Lightweight check: get project details
             from google.cloud import resourcemanager_v3
+            from ..core.settings import settings
             client = resourcemanager_v3.ProjectsClient()
-            client.get_project(name=f"projects/{self.project_id}")
+            client.get_project(name=f"projects/{self.project_id}", timeout=settings.preflight_timeout)
             return True
         except Exception as e:
             logger.error("GCP connection verification failed: %s", e)
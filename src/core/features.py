@@ -0,0 +1,147 @@
+import re
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+# Resolution of the fetched time series (5-minute points, native for CloudWatch detailed
+# monitoring, Azure Monitor and Cloud Monitoring alignment)
+SERIES_PERIOD_SECONDS = 300
+
+# Below these a sample counts as idle: CPU in percent, network in MB per sample
+IDLE_THRESHOLDS = {
+    "cpu": 5.0,
+    "network_in": 1.0,
+}
+
+# (timestamps in epoch seconds, values) for one instance and metric
+Series = Tuple[Sequence[float], Sequence[float]]
+
+_UNITS = {"m": 60, "h": 3600, "d": 86400}
+
+def parse_windows(spec: str | None) -> Dict[str, int]:
+    """Parses "1h,24h,7d" into {"1h": 3600, "24h": 86400, "7d": 604800}."""
+    windows = {}
+    for token in (spec or "").split(","):
+        token = token.strip().lower()
+        if not token:
+            continue
+        match = re.fullmatch(r"(\d+)([mhd])", token)
+        if not match:
+            raise ValueError(f"Invalid feature window '{token}', expected e.g. 1h, 24h or 7d")
+        windows[token] = int(match.group(1)) * _UNITS[match.group(2)]
+    return windows
+
+def align_series(series_by_id: Dict[str, Series], end: float, n_points: int,
+                 period: int = SERIES_PERIOD_SECONDS) -> Tuple[List[str], np.ndarray]:
+    """
+    Scatters ragged per-instance series onto one fleet matrix of shape (instances, n_points).
+    Timestamps mark the start of each sample's period; column -1 is the period ending at
+    `end`. Slots without data are NaN.
+    """
+    ids = list(series_by_id)
+    matrix = np.full((len(ids), n_points), np.nan)
+    if not ids:
+        return ids, matrix
+
+    lengths = np.fromiter((len(series_by_id[i][0]) for i in ids), dtype=np.int64, count=len(ids))
+    if not lengths.sum():
+        return ids, matrix
+    timestamps = np.concatenate([np.asarray(series_by_id[i][0], dtype=float) for i in ids])
+    values = np.concatenate([np.asarray(series_by_id[i][1], dtype=float) for i in ids])
+    rows = np.repeat(np.arange(len(ids)), lengths)
+
+    cols = np.floor((timestamps - (end - n_points * period)) / period).astype(np.int64)
+    keep = (cols >= 0) & (cols < n_points)
+    matrix[rows[keep], cols[keep]] = values[keep]
+    return ids, matrix
+
+def _row_quantile(ordered: np.ndarray, counts: np.ndarray, q: float) -> np.ndarray:
+    """Linear-interpolated quantile of each row's first `counts` (sorted, non-NaN) values."""
+    pos = np.maximum(counts - 1, 0) * q
+    lo = np.floor(pos).astype(np.int64)
+    hi = np.minimum(lo + 1, np.maximum(counts - 1, 0))
+    low = np.take_along_axis(ordered, lo[:, None], axis=1)[:, 0]
+    high = np.take_along_axis(ordered, hi[:, None], axis=1)[:, 0]
+    result = low + (high - low) * (pos - lo)
+    result[counts == 0] = np.nan
+    return result
+
+def window_features(matrix: np.ndarray, idle_threshold: float,
+                    period: int = SERIES_PERIOD_SECONDS) -> Dict[str, np.ndarray]:
+    """
+    Vectorized per-row features over a (instances, points) matrix with NaN gaps:
+    p50/p95/max, idle_fraction (share of samples below `idle_threshold`), duty_cycle
+    (share of samples at or above half the row's peak, 0 for idle rows), trend
+    (least-squares slope per day) and coverage (share of slots with data).
+    """
+    valid = ~np.isnan(matrix)
+    counts = valid.sum(axis=1)
+    safe_counts = np.maximum(counts, 1)
+
+    # One sort serves every order statistic; NaNs sort to the end of each row
+    ordered = np.sort(matrix, axis=1)
+    p50 = _row_quantile(ordered, counts, 0.50)
+    p95 = _row_quantile(ordered, counts, 0.95)
+    peak = _row_quantile(ordered, counts, 1.0)
+
+    idle = (matrix < idle_threshold) & valid
+    idle_fraction = idle.sum(axis=1) / safe_counts
+
+    active = (matrix >= 0.5 * peak[:, None]) & valid & (peak > idle_threshold)[:, None]
+    duty_cycle = active.sum(axis=1) / safe_counts
+
+    # Slope over the valid points of each row: cov(x, y) / var(x)
+    x = np.broadcast_to(np.arange(matrix.shape[1], dtype=float), matrix.shape)
+    y = np.where(valid, matrix, 0.0)
+    x_mean = np.where(valid, x, 0.0).sum(axis=1) / safe_counts
+    y_mean = y.sum(axis=1) / safe_counts
+    dx = np.where(valid, x - x_mean[:, None], 0.0)
+    dy = np.where(valid, y - y_mean[:, None], 0.0)
+    var = (dx * dx).sum(axis=1)
+    slope = np.divide((dx * dy).sum(axis=1), var, out=np.zeros_like(var), where=var > 0)
+    trend = slope * (86400 / period)
+
+    empty = counts == 0
+    for arr in (idle_fraction, duty_cycle, trend):
+        arr[empty] = np.nan
+
+    return {
+        "p50": p50,
+        "p95": p95,
+        "max": peak,
+        "idle_fraction": idle_fraction,
+        "duty_cycle": duty_cycle,
+        "trend": trend,
+        "coverage": counts / matrix.shape[1],
+    }
+
+def fleet_features(series: Dict[str, Dict[str, Series]], windows: Dict[str, int], end: float,
+                   period: int = SERIES_PERIOD_SECONDS) -> Dict[str, Dict[str, Dict[str, Dict[str, float]]]]:
+    """
+    Computes features for every instance, window and metric in one pass per metric.
+    `series` maps instance id -> metric -> (timestamps, values).
+    Returns instance id -> window -> metric -> feature -> value; metrics without data are omitted.
+    """
+    if not series or not windows:
+        return {}
+
+    span_points = max(windows.values()) // period
+    metrics = sorted({m for per_metric in series.values() for m in per_metric})
+    out: Dict[str, Dict] = {iid: {w: {} for w in windows} for iid in series}
+
+    for metric in metrics:
+        ids, matrix = align_series(
+            {iid: per_metric[metric] for iid, per_metric in series.items() if metric in per_metric},
+            end, span_points, period
+        )
+        threshold = IDLE_THRESHOLDS.get(metric, 0.0)
+        for window, seconds in windows.items():
+            feats = window_features(matrix[:, -max(seconds // period, 1):], threshold, period)
+            # One conversion per feature column, not per instance
+            columns = {name: np.round(values, 4).tolist() for name, values in feats.items()}
+            for row, iid in enumerate(ids):
+                if columns["coverage"][row] == 0:
+                    continue
+                out[iid][window][metric] = {name: col[row] for name, col in columns.items()}
+
+    return out
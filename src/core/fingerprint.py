@@ -0,0 +1,76 @@
+import hashlib
+import json
+import math
+from typing import Any, Dict
+
+# Bucket widths for known metrics; small jitter between runs must not change a fingerprint
+METRIC_BUCKETS = {
+    "max_cpu": 5.0,       # percent
+    "max_gpu": 5.0,       # percent
+    "network_in": 1.0,    # MB
+}
+
+# metrics["windows"][window][series][feature] (see core/features.py). Level features use the
+# series' width; share-of-samples features snap to tenths. trend and coverage drift on every
+# run without changing a verdict, so they are left out of fingerprints.
+WINDOW_SERIES_BUCKETS = {"cpu": 5.0, "network_in": 1.0}
+WINDOW_SHARE_FEATURES = {"idle_fraction", "duty_cycle"}
+WINDOW_LEVEL_FEATURES = {"p50", "p95", "max"}
+
+def _snap(value: Any, width: float) -> Any:
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        return value
+    return math.floor(value / width)
+
+def _bucket_windows(windows: Any) -> Any:
+    if not isinstance(windows, dict):
+        return windows
+    bucketed = {}
+    for window, per_series in windows.items():
+        bucketed[window] = {}
+        for series, feats in (per_series or {}).items():
+            width = WINDOW_SERIES_BUCKETS.get(series, 1.0)
+            bucketed[window][series] = {
+                name: _snap(value, 0.1 if name in WINDOW_SHARE_FEATURES else width)
+                for name, value in (feats or {}).items()
+                if name in WINDOW_SHARE_FEATURES or name in WINDOW_LEVEL_FEATURES
+            }
+    return bucketed
+
+def bucket_metrics(metrics: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Quantizes metric values so only meaningful movement changes them.
+    Known metrics snap to fixed-width buckets, window features are reduced as described
+    above, and other numbers keep two significant digits.
+    """
+    def quantize(key, value):
+        if key == "windows":
+            return _bucket_windows(value)
+        if isinstance(value, dict):
+            return {k: quantize(k, v) for k, v in value.items()}
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+            return value
+        width = METRIC_BUCKETS.get(key)
+        if width:
+            return _snap(value, width)
+        return float(f"{value:.2g}")
+
+    return {k: quantize(k, v) for k, v in (metrics or {}).items()}
+
+def fingerprint_target(target: Dict[str, Any]) -> str:
+    """
+    Stable hash of everything the classifier sees for a target: identity, instance type,
+    owner, full metadata and bucketed metrics. Equal fingerprints mean the previous
+    verdict still applies.
+    """
+    relevant = {
+        "platform": target.get("platform"),
+        "id": target.get("id"),
+        "type": target.get("type"),
+        "owner": target.get("owner"),
+        "metadata": target.get("metadata"),
+        "metrics": bucket_metrics(target.get("metrics")),
+    }
+    # default=str covers SDK values such as datetimes in AWS metadata
+    canonical = json.dumps(relevant, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
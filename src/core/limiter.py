@@ -0,0 +1,212 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Callable, Iterable
+
+from prometheus_client import Counter, Gauge
+
+logger = logging.getLogger("CloudCull.Limiter")
+
+LIMITER_CONCURRENCY = Gauge('cloudcull_limiter_concurrency', 'Current adaptive in-flight limit', ['api'])
+LIMITER_THROTTLES = Counter('cloudcull_limiter_throttles_total', 'Throttle signals seen per API', ['api'])
+
+# Error codes / class-name fragments the cloud SDKs and LLM clients use for rate limiting
+THROTTLE_CODES = {
+    "Throttling", "ThrottlingException", "ThrottledException", "RequestLimitExceeded",
+    "TooManyRequestsException", "RequestThrottled", "RequestThrottledException", "SlowDown",
+}
+THROTTLE_NAME_HINTS = ("ratelimit", "toomanyrequests", "resourceexhausted", "throttl")
+
+def is_throttle(error: BaseException) -> bool:
+    """True for AWS throttling codes, HTTP 429s (Azure, GCP, LLM SDKs) and rate-limit error classes."""
+    response = getattr(error, "response", None)
+    if isinstance(response, dict) and (response.get("Error") or {}).get("Code") in THROTTLE_CODES:
+        return True
+    for attr in ("status_code", "code"):
+        if getattr(error, attr, None) == 429:
+            return True
+    name = type(error).__name__.lower()
+    return any(hint in name for hint in THROTTLE_NAME_HINTS)
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limiter with optional token-bucket pacing for one API.
+
+    Each success raises the in-flight limit by ~1 per limit's worth of successes (additive
+    increase); a throttle signal multiplies it by `decrease`, at most once per congestion
+    event (requests started before the last decrease do not count again). `rate` caps
+    request starts per second, with bursts of up to `burst` requests.
+    """
+    def __init__(self, name: str, max_limit: int, min_limit: int = 1, rate: float = None, burst: float = None,
+                 decrease: float = 0.5, max_retries: int = 3, backoff: float = 0.5):
+        self.name = name
+        self.max_limit = max(min_limit, max_limit)
+        self.min_limit = min_limit
+        self.limit = float(self.max_limit)
+        self.decrease = decrease
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.in_flight = 0
+        self._cond = threading.Condition()
+        # (event loop, future) per coroutine waiting for a slot, woken by _wake_async()
+        self._async_waiters: deque = deque()
+        self._last_decrease = 0.0
+
+        self.rate = rate
+        self.burst = burst or (max(1.0, rate) if rate else None)
+        self._tokens = self.burst or 0.0
+        self._refilled = time.monotonic()
+        self._bucket_lock = threading.Lock()
+        LIMITER_CONCURRENCY.labels(api=name).set(self.limit)
+
+    def set_max(self, max_limit: int):
+        with self._cond:
+            at_ceiling = self.limit >= self.max_limit
+            self.max_limit = max(self.min_limit, max_limit)
+            # A limiter at its old ceiling moves to the new one; a backed-off limit climbs back by AIMD
+            self.limit = float(self.max_limit) if at_ceiling else min(self.limit, self.max_limit)
+            LIMITER_CONCURRENCY.labels(api=self.name).set(self.limit)
+            self._cond.notify_all()
+            self._wake_async()
+
+    def _token_wait(self) -> float:
+        """Takes a token and returns 0, or returns the seconds until the next one is due."""
+        if not self.rate:
+            return 0.0
+        with self._bucket_lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._refilled) * self.rate)
+            self._refilled = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def _take_token(self):
+        while (wait := self._token_wait()) > 0:
+            time.sleep(wait)
+
+    def _acquire(self) -> float:
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+        self._take_token()
+        return time.monotonic()
+
+    def _wake_async(self):
+        """Wakes one waiting coroutine per free slot; call with _cond held."""
+        free = int(self.limit) - self.in_flight
+        while free > 0 and self._async_waiters:
+            loop, waiter = self._async_waiters.popleft()
+            if loop.is_closed():
+                continue
+            # Releases can come from any thread, so the waiter is resolved on its own loop
+            loop.call_soon_threadsafe(_resolve, waiter)
+            free -= 1
+
+    async def _aacquire(self) -> float:
+        # Event-loop friendly _acquire: waiting coroutines await a future instead of blocking the loop's thread
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._cond:
+                if self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    break
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                with self._cond:
+                    if (loop, waiter) in self._async_waiters:
+                        self._async_waiters.remove((loop, waiter))
+                    else:
+                        # Already woken for a free slot: pass the wake-up on
+                        self._wake_async()
+                raise
+        while (wait := self._token_wait()) > 0:
+            await asyncio.sleep(wait)
+        return time.monotonic()
+
+    def _release(self, started: float, throttled: bool):
+        with self._cond:
+            self.in_flight -= 1
+            if throttled:
+                LIMITER_THROTTLES.labels(api=self.name).inc()
+                if started >= self._last_decrease:
+                    self.limit = max(self.min_limit, self.limit * self.decrease)
+                    self._last_decrease = time.monotonic()
+                    logger.warning("%s throttled; concurrency limit lowered to %d", self.name, int(self.limit))
+            else:
+                self.limit = min(self.max_limit, self.limit + 1 / max(self.limit, 1.0))
+            LIMITER_CONCURRENCY.labels(api=self.name).set(self.limit)
+            self._cond.notify_all()
+            self._wake_async()
+
+    @contextmanager
+    def slot(self):
+        """Holds one in-flight slot for the enclosed request and records its outcome."""
+        started = self._acquire()
+        throttled = False
+        try:
+            yield
+        except BaseException as e:
+            throttled = is_throttle(e)
+            raise
+        finally:
+            self._release(started, throttled)
+
+    @asynccontextmanager
+    async def aslot(self):
+        """Async slot(); shares in-flight accounting with sync callers of the same API."""
+        started = await self._aacquire()
+        throttled = False
+        try:
+            yield
+        except BaseException as e:
+            throttled = is_throttle(e)
+            raise
+        finally:
+            self._release(started, throttled)
+
+    def iterate(self, pages: Iterable):
+        """Yields from a lazy paginator, holding a slot while each page is fetched."""
+        pages = iter(pages)
+        while True:
+            with self.slot():
+                try:
+                    page = next(pages)
+                except StopIteration:
+                    return
+            yield page
+
+    def call(self, fn: Callable, *args, **kwargs):
+        """Runs fn under the limiter, retrying throttled attempts with jittered exponential backoff."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                with self.slot():
+                    return fn(*args, **kwargs)
+            except Exception as e:
+                if attempt == self.max_retries or not is_throttle(e):
+                    raise
+                time.sleep(self.backoff * (2 ** attempt) * random.uniform(0.5, 1.5))
+
+    async def acall(self, fn: Callable, *args, **kwargs):
+        """Async call(): awaits fn(*args, **kwargs) under the limiter with the same retry policy."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self.aslot():
+                    return await fn(*args, **kwargs)
+            except Exception as e:
+                if attempt == self.max_retries or not is_throttle(e):
+                    raise
+                await asyncio.sleep(self.backoff * (2 ** attempt) * random.uniform(0.5, 1.5))
+
+def _resolve(waiter: asyncio.Future):
+    if not waiter.done():
+        waiter.set_result(None)
@@ -0,0 +1,98 @@
+import math
+from typing import Any, Dict, List, Tuple
+
+# Verdict sources recorded on each target under "decided_by"
+TIERS = ("rules", "cache", "llm", "error")
+# Tag keys or values marking targets the rules never decide; the LLM weighs them conservatively
+PROTECTED_TAG_MARKERS = ("production", "critical")
+
+class RuleTier:
+    """
+    Deterministic pre-classification for clear-cut targets, applied before the LLM.
+    A target is ZOMBIE when CPU, inbound network and (if reported) GPU all sit at or below
+    the idle thresholds, and ACTIVE when CPU or GPU reach the busy thresholds. Anything in
+    between, without a numeric max_cpu, with metrics the adapter could not observe, or
+    tagged production/critical is left to the LLM.
+    """
+
+    def __init__(self, idle_max_cpu: float = 1.0, idle_max_network_mb: float = 0.1, idle_max_gpu: float = 1.0,
+                 busy_min_cpu: float = 80.0, busy_min_gpu: float = 50.0):
+        if idle_max_cpu >= busy_min_cpu or idle_max_gpu >= busy_min_gpu:
+            raise ValueError("Idle thresholds must be below busy thresholds")
+        self.idle_max_cpu = idle_max_cpu
+        self.idle_max_network_mb = idle_max_network_mb
+        self.idle_max_gpu = idle_max_gpu
+        self.busy_min_cpu = busy_min_cpu
+        self.busy_min_gpu = busy_min_gpu
+
+    @classmethod
+    def from_settings(cls, settings) -> "RuleTier":
+        return cls(
+            idle_max_cpu=settings.rules_idle_max_cpu,
+            idle_max_network_mb=settings.rules_idle_max_network_mb,
+            idle_max_gpu=settings.rules_idle_max_gpu,
+            busy_min_cpu=settings.rules_busy_min_cpu,
+            busy_min_gpu=settings.rules_busy_min_gpu
+        )
+
+    def classify(self, metrics: Dict[str, Any], metadata: Dict[str, Any] = None) -> Tuple[str, str, float] | None:
+        """(decision, reasoning, confidence) for a clear-cut target, or None for the ambiguous band."""
+        # Adapters fill in zeros when a metrics fetch fails; those are not evidence of idleness
+        if (metrics or {}).get("metrics_observed") is False or _is_protected(metadata):
+            return None
+        cpu = _number(metrics, "max_cpu")
+        if cpu is None:
+            return None
+        network = _number(metrics, "network_in")
+        gpu = _number(metrics, "max_gpu")
+
+        if cpu >= self.busy_min_cpu or (gpu is not None and gpu >= self.busy_min_gpu):
+            # Confidence grows from 0.9 at the threshold to 0.99 at full load
+            margin = max(_margin(cpu, self.busy_min_cpu, 100.0),
+                         _margin(gpu, self.busy_min_gpu, 100.0) if gpu is not None else 0.0)
+            busy = f"{cpu}% CPU" + (f", {gpu}% GPU" if gpu is not None else "")
+            return "ACTIVE", f"Rules: sustained load ({busy}) is above the busy threshold.", round(0.9 + 0.09 * margin, 3)
+
+        if (cpu <= self.idle_max_cpu and network is not None and network <= self.idle_max_network_mb
+                and (gpu is None or gpu <= self.idle_max_gpu)):
+            # Confidence grows from 0.9 at the idle thresholds to 0.99 at zero utilization
+            margin = min(_margin(cpu, self.idle_max_cpu, 0.0), _margin(network, self.idle_max_network_mb, 0.0),
+                         _margin(gpu, self.idle_max_gpu, 0.0) if gpu is not None else 1.0)
+            return ("ZOMBIE", f"Rules: {cpu}% peak CPU and {network} MB inbound network are below the idle thresholds.",
+                    round(0.9 + 0.09 * margin, 3))
+        return None
+
+def _is_protected(metadata: Dict[str, Any] | None) -> bool:
+    """True when an AWS Tag, Azure tag or GCP label mentions production or critical."""
+    tags: Dict[str, Any] = {}
+    for field in ("Tags", "tags", "labels"):
+        value = (metadata or {}).get(field)
+        if isinstance(value, list):
+            # AWS tags arrive as [{"Key": ..., "Value": ...}]
+            value = {tag.get("Key"): tag.get("Value") for tag in value if isinstance(tag, dict)}
+        if isinstance(value, dict):
+            tags.update(value)
+    return any(marker in str(text).lower()
+               for item in tags.items() for text in item if text is not None
+               for marker in PROTECTED_TAG_MARKERS)
+
+def _number(metrics: Dict[str, Any], key: str) -> float | None:
+    value = (metrics or {}).get(key)
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        return None
+    return float(value)
+
+def _margin(value: float, threshold: float, extreme: float) -> float:
+    """How far value is past threshold towards extreme, clipped to 0..1."""
+    if threshold == extreme:
+        return 1.0
+    return min(max((value - threshold) / (extreme - threshold), 0.0), 1.0)
+
+def tier_summary(targets: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """Count and fleet fraction of targets decided by each tier."""
+    total = len(targets)
+    counts = {tier: 0 for tier in TIERS}
+    for t in targets:
+        tier = t.get("decided_by", "error")
+        counts[tier] = counts.get(tier, 0) + 1
+    return {tier: {"count": n, "fraction": round(n / total, 4) if total else 0.0} for tier, n in counts.items()}
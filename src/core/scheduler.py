@@ -0,0 +1,174 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Iterable, List
+
+from prometheus_client import Gauge, Histogram
+
+from .limiter import AdaptiveLimiter
+from .settings import settings
+
+logger = logging.getLogger("CloudCull.Scheduler")
+
+QUEUE_DEPTH = Gauge('cloudcull_scheduler_queue_depth', 'Tasks waiting for a worker', ['pool'])
+IN_FLIGHT = Gauge('cloudcull_scheduler_in_flight', 'Tasks currently running', ['pool'])
+WAIT_SECONDS = Histogram('cloudcull_scheduler_wait_seconds', 'Time from submit until a worker picks the task up', ['pool'])
+
+# Concurrency per backend dependency. Names are dotted; "llm.openai" falls back to "llm".
+DEFAULT_LIMITS = {
+    "ec2": 4,
+    "cloudwatch": 4,
+    "cloudtrail": 8,
+    "azure_monitor": 8,
+    "azure_compute": 8,
+    "gcp_monitoring": 4,
+    "gcp_logging": 4,
+    "gcp_compute": 8,
+    "llm": 10,
+}
+FALLBACK_LIMIT = 4
+
+# Request starts per second for APIs with a published per-region quota (CloudTrail
+# LookupEvents 2 TPS, CloudWatch GetMetricData 50 TPS); others are paced by throttle
+# feedback alone. Limiters are named per region ("cloudtrail.us-east-1"), so each region
+# gets its own bucket.
+DEFAULT_RATES = {
+    "cloudtrail": 2.0,
+    "cloudwatch": 50.0,
+}
+
+def parse_limits(spec: str | None, cast: Callable = int) -> Dict[str, Any]:
+    """Parses "cloudtrail=4,llm.openai=2" into a limits dict (cast=float for rates like "cloudtrail=0.5")."""
+    limits = {}
+    for token in (spec or "").split(","):
+        if not token.strip():
+            continue
+        name, _, value = token.partition("=")
+        try:
+            parsed = cast(value)
+            if parsed <= 0 and cast is not int:
+                raise ValueError(value)
+            limits[name.strip().lower()] = max(1, parsed) if cast is int else parsed
+        except ValueError:
+            logger.warning("Ignoring invalid scheduler limit '%s'", token.strip())
+    return limits
+
+class _Pool:
+    """Fixed set of daemon workers draining one FIFO queue; a hung call never blocks exit."""
+    def __init__(self, name: str, limit: int):
+        self.name = name
+        self.limit = 0
+        self._queue: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self.resize(limit)
+
+    def resize(self, limit: int):
+        with self._lock:
+            for _ in range(limit - self.limit):
+                threading.Thread(target=self._work, name=f"sched-{self.name}", daemon=True).start()
+            for _ in range(self.limit - limit):
+                # Retire surplus workers once they reach the marker
+                self._queue.put(None)
+            self.limit = limit
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        future: Future = Future()
+        QUEUE_DEPTH.labels(pool=self.name).inc()
+        self._queue.put((future, fn, args, kwargs, time.monotonic()))
+        return future
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            future, fn, args, kwargs, queued_at = item
+            QUEUE_DEPTH.labels(pool=self.name).dec()
+            WAIT_SECONDS.labels(pool=self.name).observe(time.monotonic() - queued_at)
+            if not future.set_running_or_notify_cancel():
+                continue
+            IN_FLIGHT.labels(pool=self.name).inc()
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+            finally:
+                IN_FLIGHT.labels(pool=self.name).dec()
+
+class Scheduler:
+    """
+    Process-wide execution scheduler. Work is submitted to a named pool per backend
+    dependency (e.g. "cloudwatch", "cloudtrail", "llm.anthropic"), each capped at its own
+    concurrency limit, so aggregate concurrency is bounded and tunable per backend.
+    Tasks must not wait on futures of their own pool, which could exhaust its workers.
+
+    Each backend also has an AdaptiveLimiter (see `limiter`) that call sites wrap around
+    the actual API request, so in-flight requests shrink below the pool size while the
+    backend throttles and grow back to it once requests succeed again.
+    """
+    def __init__(self, limits: Dict[str, int] = None, rates: Dict[str, float] = None):
+        self._limits = {**DEFAULT_LIMITS, **(limits or {})}
+        self._rates = {**DEFAULT_RATES, **(rates or {})}
+        self._pools: Dict[str, _Pool] = {}
+        self._limiters: Dict[str, AdaptiveLimiter] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _lookup(table: Dict[str, Any], name: str):
+        parts = name.lower().split(".")
+        for i in range(len(parts), 0, -1):
+            value = table.get(".".join(parts[:i]))
+            if value:
+                return value
+        return None
+
+    def limit_for(self, name: str) -> int:
+        return self._lookup(self._limits, name) or FALLBACK_LIMIT
+
+    def limiter(self, name: str) -> AdaptiveLimiter:
+        """Adaptive limiter for one API, capped at its pool limit and paced at its rate, if any."""
+        name = name.lower()
+        with self._lock:
+            if name not in self._limiters:
+                self._limiters[name] = AdaptiveLimiter(
+                    name, self.limit_for(name), rate=self._lookup(self._rates, name)
+                )
+            return self._limiters[name]
+
+    def pool(self, name: str) -> _Pool:
+        # Pool, limiter and limit names are case-insensitive
+        name = name.lower()
+        with self._lock:
+            if name not in self._pools:
+                self._pools[name] = _Pool(name, self.limit_for(name))
+            return self._pools[name]
+
+    def set_limit(self, name: str, limit: int):
+        """Overrides one pool's concurrency, resizing it if it is already running."""
+        limit = max(1, int(limit))
+        name = name.lower()
+        with self._lock:
+            self._limits[name] = limit
+            pool = self._pools.get(name)
+            limiter = self._limiters.get(name)
+        if pool and pool.limit != limit:
+            pool.resize(limit)
+        if limiter:
+            limiter.set_max(limit)
+
+    def submit(self, name: str, fn: Callable, *args, **kwargs) -> Future:
+        return self.pool(name).submit(fn, *args, **kwargs)
+
+    def map(self, name: str, fn: Callable, items: Iterable[Any]) -> List[Any]:
+        """Runs fn over items on one pool; returns results in input order, re-raising the first error."""
+        futures = [self.submit(name, fn, item) for item in items]
+        return [future.result() for future in futures]
+
+# Shared instance; limits and rates come from SCHEDULER_LIMITS / SCHEDULER_RATES on top of the defaults
+scheduler = Scheduler(
+    {"cloudwatch": settings.aws_metrics_concurrency, "preflight": settings.preflight_concurrency,
+     **parse_limits(settings.scheduler_limits)},
+    parse_limits(settings.scheduler_rates, float),
+)
@@ -0,0 +1,159 @@
+import json
+import logging
+import math
+import os
+import threading
+from typing import Dict, Iterable, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger("CloudCull.SeriesStore")
+
+class SeriesStore:
+    """
+    Memory-mapped time-series store with one fixed-size ring buffer per (key, metric).
+
+    Each metric is a float32 matrix on disk (`<metric>.dat`, one row per key, `capacity`
+    columns of `period` seconds) plus the last stored period start per row (`<metric>.last`).
+    A sample for period p lives in column p % capacity, so a row always holds the most
+    recent `capacity` periods and old data is overwritten in place. Key -> row assignments
+    live in `index.json`. Safe to share across threads.
+    """
+    def __init__(self, directory: str, capacity: int, period: int = 300, initial_rows: int = 1024):
+        self.directory = directory
+        self.capacity = capacity
+        self.period = period
+        self._lock = threading.Lock()
+        self._values: Dict[str, np.memmap] = {}
+        self._last: Dict[str, np.memmap] = {}
+
+        os.makedirs(directory, exist_ok=True)
+        index = self._load_index()
+        if index and (index.get("capacity"), index.get("period")) != (capacity, period):
+            logger.warning("Series store layout changed (capacity/period); discarding %s", directory)
+            index = None
+        if index is None:
+            # Row data is meaningless without its index
+            self._discard()
+        self._rows: Dict[str, int] = index["rows"] if index else {}
+        self._allocated = max(index["allocated"] if index else 0, initial_rows)
+
+    def _discard(self):
+        """Deletes the store's own files; anything else in the directory is left alone."""
+        for name in os.listdir(self.directory):
+            if name == "index.json" or name.endswith((".dat", ".last")):
+                path = os.path.join(self.directory, name)
+                if os.path.isfile(path):
+                    os.remove(path)
+
+    def _load_index(self) -> Dict | None:
+        try:
+            with open(os.path.join(self.directory, "index.json"), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Unreadable series store index, starting empty: %s", e)
+            return None
+
+    def _open(self, metric: str) -> Tuple[np.memmap, np.memmap]:
+        """Maps a metric's files, creating or extending them to the allocated row count."""
+        if metric in self._values and self._values[metric].shape[0] == self._allocated:
+            return self._values[metric], self._last[metric]
+
+        values = self._map(f"{metric}.dat", np.float32, (self._allocated, self.capacity))
+        last = self._map(f"{metric}.last", np.float64, (self._allocated,))
+        self._values[metric], self._last[metric] = values, last
+        return values, last
+
+    def _map(self, name: str, dtype, shape: Tuple[int, ...]) -> np.memmap:
+        path = os.path.join(self.directory, name)
+        row_bytes = np.dtype(dtype).itemsize * int(np.prod(shape[1:], dtype=np.int64))
+        existing_rows = os.path.getsize(path) // row_bytes if os.path.exists(path) else 0
+        if existing_rows < shape[0]:
+            # Grow in place; new rows start as NaN (no data)
+            with open(path, "ab") as f:
+                f.truncate(shape[0] * row_bytes)
+        mapped = np.memmap(path, dtype=dtype, mode="r+", shape=shape)
+        if existing_rows < shape[0]:
+            mapped[existing_rows:] = np.nan
+        return mapped
+
+    def _row(self, key: str) -> int:
+        row = self._rows.get(key)
+        if row is None:
+            row = self._rows[key] = len(self._rows)
+            if row >= self._allocated:
+                self._allocated *= 2
+        return row
+
+    def last_timestamp(self, metric: str, key: str) -> float | None:
+        """Start of the most recent stored period for a key, or None without history."""
+        with self._lock:
+            row = self._rows.get(key)
+            if row is None:
+                return None
+            _, last = self._open(metric)
+            value = last[row]
+        return None if math.isnan(value) else float(value)
+
+    def append(self, metric: str, series: Dict[str, Tuple[Sequence[float], Sequence[float]]]):
+        """Writes (period-start timestamps, values) per key, overwriting the oldest periods."""
+        with self._lock:
+            for key in series:
+                self._row(key)
+            values, last = self._open(metric)
+
+            for key, (timestamps, samples) in series.items():
+                if not len(timestamps):
+                    continue
+                row = self._rows[key]
+                periods = (np.asarray(timestamps, dtype=float) // self.period).astype(np.int64)
+                samples = np.asarray(samples, dtype=np.float32)
+                newest = int(periods.max())
+                previous = None if math.isnan(last[row]) else int(last[row] // self.period)
+
+                if previous is None or newest - previous >= self.capacity:
+                    values[row] = np.nan
+                elif newest > previous:
+                    # Columns being recycled still hold samples from `capacity` periods ago
+                    values[row, np.arange(previous + 1, newest + 1) % self.capacity] = np.nan
+                if previous is not None:
+                    newest = max(newest, previous)
+
+                keep = periods > newest - self.capacity
+                values[row, periods[keep] % self.capacity] = samples[keep]
+                last[row] = float(newest * self.period)
+
+    def read(self, metric: str, keys: Iterable[str], start: float, end: float
+             ) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """Stored (period-start timestamps, values) per key for periods starting in [start, end)."""
+        first = math.ceil(start / self.period)
+        final = math.ceil(end / self.period) - 1
+        out = {}
+        with self._lock:
+            values, last = self._open(metric)
+            for key in keys:
+                row = self._rows.get(key)
+                if row is None or math.isnan(last[row]):
+                    continue
+                newest = int(last[row] // self.period)
+                lo, hi = max(first, newest - self.capacity + 1), min(final, newest)
+                if hi < lo:
+                    continue
+                periods = np.arange(lo, hi + 1)
+                samples = values[row, periods % self.capacity].astype(float)
+                present = ~np.isnan(samples)
+                out[key] = (periods[present] * float(self.period), samples[present])
+        return out
+
+    def flush(self):
+        """Persists mapped data and the key index."""
+        with self._lock:
+            for mapped in (*self._values.values(), *self._last.values()):
+                mapped.flush()
+            path = os.path.join(self.directory, "index.json")
+            with open(path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump({"capacity": self.capacity, "period": self.period,
+                           "allocated": self._allocated, "rows": self._rows}, f)
+            os.replace(path + ".tmp", path)
@@ -15,11 +15,62 @@ class Settings(BaseSettings):
     
     # Cloud Configs
     aws_region: str = Field('us-east-1', alias='AWS_REGION')
+    aws_regions: str | None = Field(None, alias='AWS_REGIONS')  # Comma-separated, or 'all'
+    aws_attribution_lookback_days: int = Field(90, alias='AWS_ATTRIBUTION_LOOKBACK_DAYS')
+    aws_metrics_concurrency: int = Field(4, alias='AWS_METRICS_CONCURRENCY')  # Parallel GetMetricData batches
+    aws_gpu_metrics: bool = Field(True, alias='AWS_GPU_METRICS')  # CloudWatch agent nvidia_smi_utilization_gpu
+    aws_attribution_batch_threshold: int = Field(5, alias='AWS_ATTRIBUTION_BATCH_THRESHOLD')
     azure_subscription_id: str | None = Field(None, alias='AZURE_SUBSCRIPTION_ID')
+    azure_subscription_ids: str | None = Field(None, alias='AZURE_SUBSCRIPTION_IDS')  # Extra subscriptions, comma-separated
+    # 'resource_graph' is opt-in: one cross-subscription query, needs `pip install azure-mgmt-resourcegraph`
+    azure_inventory_backend: Literal['resource_graph', 'compute'] = Field('compute', alias='AZURE_INVENTORY_BACKEND')
     gcp_project_id: str | None = Field(None, alias='GCP_PROJECT_ID')
+    gcp_attribution_lookback_days: int = Field(400, alias='GCP_ATTRIBUTION_LOOKBACK_DAYS')  # Admin Activity retention
+
+    # Local State (SQLite, under the working dir)
+    cache_path: str = Field('.cloudcull/cache.db', alias='CLOUDCULL_CACHE_PATH')
+    attribution_cache_enabled: bool = Field(True, alias='ATTRIBUTION_CACHE_ENABLED')
+    attribution_cache_ttl_days: float = Field(30.0, alias='ATTRIBUTION_CACHE_TTL_DAYS')
+    attribution_cache_max_entries: int = Field(100_000, alias='ATTRIBUTION_CACHE_MAX_ENTRIES')
+    series_store_enabled: bool = Field(True, alias='SERIES_STORE_ENABLED')  # Local ring buffers for FEATURE_WINDOWS
+    series_store_path: str = Field('.cloudcull/series', alias='SERIES_STORE_PATH')
+    incremental_audit: bool = Field(False, alias='INCREMENTAL_AUDIT')
+    incremental_verdict_ttl_hours: float = Field(24.0, alias='INCREMENTAL_VERDICT_TTL_HOURS')  # Forces a periodic re-check
+
+    # Rules tier: clear-cut targets are classified without the LLM (see core/rules.py)
+    rules_enabled: bool = Field(True, alias='RULES_ENABLED')
+    rules_idle_max_cpu: float = Field(1.0, alias='RULES_IDLE_MAX_CPU')  # percent, peak
+    rules_idle_max_network_mb: float = Field(0.1, alias='RULES_IDLE_MAX_NETWORK_MB')
+    rules_idle_max_gpu: float = Field(1.0, alias='RULES_IDLE_MAX_GPU')  # percent, only when reported
+    rules_busy_min_cpu: float = Field(80.0, alias='RULES_BUSY_MIN_CPU')
+    rules_busy_min_gpu: float = Field(50.0, alias='RULES_BUSY_MIN_GPU')
+
+    # Concurrency per backend pool, e.g. "cloudtrail=4,llm.openai=2" (see core/scheduler.py)
+    scheduler_limits: str | None = Field(None, alias='SCHEDULER_LIMITS')
+    scheduler_rates: str | None = Field(None, alias='SCHEDULER_RATES')  # requests/s, e.g. "cloudtrail=2"
+
+    # Discovery
+    platforms: str | None = Field(None, alias='CLOUDCULL_PLATFORMS')  # e.g. "aws,gcp"; default all
+    feature_windows: str | None = Field(None, alias='FEATURE_WINDOWS')  # e.g. "1h,24h,7d"; needs the "features" extra (NumPy)
+    discovery_timeout: float = Field(300.0, alias='DISCOVERY_TIMEOUT_SECONDS')
+    pipeline_queue_size: int = Field(100, alias='PIPELINE_QUEUE_SIZE')
+
+    # Pre-flight
+    preflight_timeout: float = Field(10.0, alias='PREFLIGHT_TIMEOUT_SECONDS')  # Per connection check
+    preflight_concurrency: int = Field(32, alias='PREFLIGHT_CONCURRENCY')  # Connection checks run at once
+    preflight_cache_ttl_minutes: float = Field(15.0, alias='PREFLIGHT_CACHE_TTL_MINUTES')  # 0 disables
+
+    # Kill-Switch
+    stop_timeout: float = Field(600.0, alias='STOP_TIMEOUT_SECONDS')  # Max wait for stops to complete
+    stop_poll_interval: float = Field(5.0, alias='STOP_POLL_INTERVAL_SECONDS')
     
     # LLM Configs
     llm_provider: Literal['anthropic', 'openai', 'google', 'groq'] = Field('anthropic', alias='LLM_PROVIDER')
+    llm_batch_size: int = Field(1, alias='LLM_BATCH_SIZE')  # Instances per classification request
+    llm_async: bool = Field(False, alias='LLM_ASYNC')  # Async SDK clients on one event loop instead of threads
+    llm_cache_enabled: bool = Field(True, alias='LLM_CACHE_ENABLED')  # Verdicts keyed by provider, model, prompt and features
+    llm_cache_ttl_hours: float = Field(168.0, alias='LLM_CACHE_TTL_HOURS')
+    llm_cache_max_entries: int = Field(50_000, alias='LLM_CACHE_MAX_ENTRIES')
     anthropic_api_key: str | None = Field(None, alias='ANTHROPIC_API_KEY')
     openai_api_key: str | None = Field(None, alias='OPENAI_API_KEY')
     google_api_key: str | None = Field(None, alias='GOOGLE_API_KEY')
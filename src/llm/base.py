@@ -1,7 +1,11 @@
+import asyncio
+import logging
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 from pydantic import BaseModel, Field
 
+logger = logging.getLogger("CloudCull.LLM")
+
 class LLMRecommendation(BaseModel):
     decision: str = Field(description="ZOMBIE or ACTIVE")
     reasoning: str = Field(description="Clear explanation of why this decision was made")
@@ -18,6 +22,124 @@ class BaseLLM(ABC):
     The Strategy Pattern Interface for Multi-Cloud Intelligence.
     Ensures all providers return a standardized LLMResponse object.
     """
+    # Requests go through the "llm.<PROVIDER>" adaptive limiter (see core/scheduler.py)
+    PROVIDER = "default"
+    SYSTEM_PROMPT = ""
+    # Bump when the user-message format changes; cached verdicts (see llm/cache.py) are keyed on it
+    PROMPT_VERSION = 1
+
+    @property
+    def supports_batch(self) -> bool:
+        """Multi-instance requests need raw completions (see CompletionProvider)."""
+        return isinstance(self, CompletionProvider)
+
+    @property
+    def supports_async(self) -> bool:
+        """Native async requests need an async client (see AsyncCompletionProvider)."""
+        return isinstance(self, AsyncCompletionProvider)
+
+    def _request(self, fn, *args, **kwargs):
+        """Calls the provider SDK under its adaptive limiter, backing off and retrying on 429s."""
+        from ..core.scheduler import scheduler
+        return scheduler.limiter(f"llm.{self.PROVIDER}").call(fn, *args, **kwargs)
+
+    async def _arequest(self, fn, *args, **kwargs):
+        """Async _request: awaits an async SDK call under the same adaptive limiter."""
+        from ..core.scheduler import scheduler
+        return await scheduler.limiter(f"llm.{self.PROVIDER}").acall(fn, *args, **kwargs)
+
     @abstractmethod
     def classify_instance(self, metadata: Dict[str, Any], metrics: Dict[str, Any]) -> LLMResponse:
         pass
+
+    def _user_prompt(self, metadata: Dict[str, Any], metrics: Dict[str, Any]) -> str:
+        # Prompt Injection Protection: Sanitize metadata keys and values
+        from .utils import sanitize_for_prompt
+        return f"METADATA: {sanitize_for_prompt(metadata)}\nMETRICS: {sanitize_for_prompt(metrics)}"
+
+    async def aclassify_instance(self, metadata: Dict[str, Any], metrics: Dict[str, Any]) -> LLMResponse:
+        """
+        Async classify_instance. Providers with an async client only hold an event-loop task
+        while the request is in flight; others run the sync call in a worker thread.
+        """
+        if not self.supports_async:
+            return await asyncio.to_thread(self.classify_instance, metadata, metrics)
+        text, usage = await self._acomplete(self.SYSTEM_PROMPT, self._user_prompt(metadata, metrics))
+        return self._parse(text, usage)
+
+    def classify_batch(self, items: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> List[LLMResponse]:
+        """
+        Classifies several (metadata, metrics) pairs in one request and returns one response per
+        item, in order. Items the reply misses or gets wrong are re-classified with
+        classify_instance(), as is the whole batch if the request fails. The batch's token usage
+        is reported on the first response only.
+        """
+        if len(items) < 2 or not self.supports_batch:
+            return [self.classify_instance(metadata, metrics) for metadata, metrics in items]
+
+        from .utils import BATCH_INSTRUCTIONS, build_batch_prompt
+        reply = None
+        try:
+            reply = self._complete(self.SYSTEM_PROMPT + BATCH_INSTRUCTIONS, build_batch_prompt(items), items=len(items))
+        except Exception as e:
+            logger.error("Batch classification of %d instances failed: %s", len(items), e)
+        responses = self._batch_responses(items, reply)
+        return [response if response is not None else self.classify_instance(metadata, metrics)
+                for response, (metadata, metrics) in zip(responses, items)]
+
+    async def aclassify_batch(self, items: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> List[LLMResponse]:
+        """Async classify_batch; the single-instance fallbacks run concurrently."""
+        if len(items) < 2 or not self.supports_batch:
+            return list(await asyncio.gather(*(self.aclassify_instance(m, x) for m, x in items)))
+        if not self.supports_async:
+            return await asyncio.to_thread(self.classify_batch, items)
+
+        from .utils import BATCH_INSTRUCTIONS, build_batch_prompt
+        reply = None
+        try:
+            reply = await self._acomplete(self.SYSTEM_PROMPT + BATCH_INSTRUCTIONS, build_batch_prompt(items),
+                                          items=len(items))
+        except Exception as e:
+            logger.error("Batch classification of %d instances failed: %s", len(items), e)
+        responses = self._batch_responses(items, reply)
+        fallbacks = await asyncio.gather(*(self.aclassify_instance(*items[i])
+                                           for i, response in enumerate(responses) if response is None))
+        fallbacks = iter(fallbacks)
+        return [response if response is not None else next(fallbacks) for response in responses]
+
+    def _batch_responses(self, items: List, reply: Tuple[str, Dict[str, int]] | None) -> List[LLMResponse | None]:
+        """Per-item responses parsed from a batch reply, None where an item needs a single call."""
+        from .utils import parse_batch_response
+        text, usage = reply or ("", {})
+        parsed = parse_batch_response(text, len(items)) if reply else {}
+        if len(parsed) < len(items):
+            logger.warning("%d of %d batch verdicts missing or invalid; classifying them individually",
+                           len(items) - len(parsed), len(items))
+        responses = []
+        for i in range(len(items)):
+            if i in parsed:
+                responses.append(LLMResponse(raw_response=text, recommendation=parsed[i], usage=usage,
+                                             model=self.model))
+                usage = {}
+            else:
+                responses.append(None)
+        return responses
+
+class CompletionProvider(ABC):
+    """
+    Mixin for providers that expose raw completions. BaseLLM packs batches into one
+    _complete() request for them; others classify batches one instance at a time.
+    """
+    @abstractmethod
+    def _complete(self, system: str, user: str, items: int = 1) -> Tuple[str, Dict[str, int]]:
+        """One raw completion: returns the reply text and token usage. `items` sizes the output budget."""
+
+    @abstractmethod
+    def _parse(self, text: str, usage: Dict[str, int]) -> LLMResponse:
+        """Turns one single-instance reply into an LLMResponse; shared by the sync and async paths."""
+
+class AsyncCompletionProvider(CompletionProvider):
+    """Mixin for providers with an async SDK client; the async paths await _acomplete() on the event loop."""
+    @abstractmethod
+    async def _acomplete(self, system: str, user: str, items: int = 1) -> Tuple[str, Dict[str, int]]:
+        """Async _complete on the provider's async SDK client."""
@@ -0,0 +1,126 @@
+import hashlib
+import json
+import logging
+from typing import Any, Dict, List, Tuple
+
+from prometheus_client import Gauge
+
+from .base import BaseLLM, LLMRecommendation, LLMResponse
+from .utils import sanitize_for_prompt
+from ..core.cache import PersistentCache
+from ..core.fingerprint import bucket_metrics
+
+logger = logging.getLogger("CloudCull.LLM.Cache")
+
+LLM_CACHE_HIT_RATIO = Gauge('cloudcull_llm_cache_hit_ratio', 'Share of classifications served from the LLM cache', ['provider'])
+
+# Metadata fields that describe what an instance is (type, placement, tags) rather than
+# which instance it is; IDs, IPs and timestamps are left out so identical setups share a key
+FEATURE_FIELDS = ("InstanceType", "Tags", "tags", "labels", "location", "zone")
+# Tags that name a single instance
+IDENTITY_TAGS = {"Name", "name"}
+
+def feature_key(metadata: Dict[str, Any], metrics: Dict[str, Any]) -> str:
+    """Canonical hash of the sanitized features a verdict depends on: relevant metadata and bucketed metrics."""
+    relevant = {}
+    for field in FEATURE_FIELDS:
+        value = (metadata or {}).get(field)
+        if value is None:
+            continue
+        if isinstance(value, list):
+            # AWS tags arrive as [{"Key": ..., "Value": ...}]
+            value = {tag.get("Key"): tag.get("Value") for tag in value if isinstance(tag, dict)}
+        if isinstance(value, dict):
+            value = {k: v for k, v in value.items() if k not in IDENTITY_TAGS}
+        relevant[field] = value
+    canonical = json.dumps(
+        {"metadata": sanitize_for_prompt(relevant), "metrics": bucket_metrics(metrics)},
+        sort_keys=True, separators=(",", ":"), default=str
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+class CachedLLM(BaseLLM):
+    """
+    Disk-backed memoization in front of any BaseLLM. Verdicts are keyed by provider, model,
+    prompt version (PROMPT_VERSION plus a hash of the provider's system prompt) and
+    feature_key(), and stored in a PersistentCache namespace with its TTL and LRU bound.
+    Zero-confidence responses are the providers' error and parse fallbacks and are not cached.
+    """
+    def __init__(self, inner: BaseLLM, cache: PersistentCache):
+        self.inner = inner
+        self.cache = cache
+        self.PROVIDER = inner.PROVIDER
+        self.SYSTEM_PROMPT = inner.SYSTEM_PROMPT
+        self.model = inner.model
+        prompt = f"{inner.PROMPT_VERSION}:{inner.SYSTEM_PROMPT}"
+        self.prompt_version = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:12]
+
+    @property
+    def supports_batch(self) -> bool:
+        return self.inner.supports_batch
+
+    @property
+    def supports_async(self) -> bool:
+        return self.inner.supports_async
+
+    def _key(self, metadata: Dict[str, Any], metrics: Dict[str, Any]) -> str:
+        return f"{self.PROVIDER}:{self.model}:{self.prompt_version}:{feature_key(metadata, metrics)}"
+
+    def _lookup(self, key: str) -> LLMResponse | None:
+        entry = self.cache.get(key)
+        LLM_CACHE_HIT_RATIO.labels(provider=self.PROVIDER).set(self.cache.hits / (self.cache.hits + self.cache.misses))
+        if entry is None:
+            return None
+        # No tokens were spent on a cache hit
+        return LLMResponse(raw_response=entry["raw_response"], recommendation=LLMRecommendation(**entry["recommendation"]),
+                           usage={}, model=self.model)
+
+    def _store(self, key: str, response: LLMResponse):
+        if response.recommendation.confidence > 0:
+            self.cache.set(key, {"raw_response": response.raw_response,
+                                 "recommendation": response.recommendation.model_dump()})
+
+    def classify_instance(self, metadata: Dict[str, Any], metrics: Dict[str, Any]) -> LLMResponse:
+        key = self._key(metadata, metrics)
+        cached = self._lookup(key)
+        if cached is not None:
+            logger.debug("LLM cache hit for instance %s", metadata.get('id', 'unknown'))
+            return cached
+        response = self.inner.classify_instance(metadata, metrics)
+        self._store(key, response)
+        return response
+
+    async def aclassify_instance(self, metadata: Dict[str, Any], metrics: Dict[str, Any]) -> LLMResponse:
+        key = self._key(metadata, metrics)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        response = await self.inner.aclassify_instance(metadata, metrics)
+        self._store(key, response)
+        return response
+
+    def classify_batch(self, items: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> List[LLMResponse]:
+        """Serves hits from the cache and sends only the misses to the provider, as one batch."""
+        keys, responses, misses = self._batch_lookup(items)
+        if misses:
+            self._batch_store(keys, responses, misses, self.inner.classify_batch([items[i] for i in misses]))
+        return responses
+
+    async def aclassify_batch(self, items: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> List[LLMResponse]:
+        keys, responses, misses = self._batch_lookup(items)
+        if misses:
+            self._batch_store(keys, responses, misses, await self.inner.aclassify_batch([items[i] for i in misses]))
+        return responses
+
+    def _batch_lookup(self, items: List[Tuple[Dict[str, Any], Dict[str, Any]]]):
+        keys = [self._key(metadata, metrics) for metadata, metrics in items]
+        responses = [self._lookup(key) for key in keys]
+        return keys, responses, [i for i, response in enumerate(responses) if response is None]
+
+    def _batch_store(self, keys: List[str], responses: List, misses: List[int], fresh: List[LLMResponse]):
+        for i, response in zip(misses, fresh):
+            self._store(keys[i], response)
+            responses[i] = response
+
+    def stats(self) -> Dict[str, Any]:
+        return self.cache.stats()
@@ -7,6 +7,39 @@ class LLMFactory:
     """
     Simplified Registry/Factory for LLM Providers.
     """
+    ALIASES = {"claude": "anthropic", "gemini": "google", "llama": "groq", "gpt4": "openai"}
+
+    @staticmethod
+    def canonical_name(provider_type: str) -> str:
+        """Maps model aliases to the provider name used for scheduler pools and limiters."""
+        provider_type = provider_type.lower()
+        return LLMFactory.ALIASES.get(provider_type, provider_type)
+
+    @staticmethod
+    def with_cache(provider: BaseLLM, path: str = None, ttl_hours: float = None, max_entries: int = None) -> BaseLLM:
+        """
+        Wraps any provider in a disk-backed CachedLLM (LLM_CACHE_* settings by default).
+        Returns the provider unwrapped when the cache file cannot be opened.
+        """
+        import sqlite3
+        from .cache import CachedLLM
+        from ..core.cache import PersistentCache
+        from ..core.settings import settings
+
+        path = path or settings.cache_path
+        ttl_hours = settings.llm_cache_ttl_hours if ttl_hours is None else ttl_hours
+        try:
+            cache = PersistentCache(
+                path,
+                namespace="llm",
+                ttl_seconds=ttl_hours * 3600,
+                max_entries=max_entries or settings.llm_cache_max_entries
+            )
+        except (sqlite3.Error, OSError) as e:
+            logger.warning("LLM cache unavailable at %s: %s", path, e)
+            return provider
+        return CachedLLM(provider, cache)
+
     @staticmethod
     def get_provider(provider_type: str, simulated: bool = False) -> BaseLLM:
         provider_type = provider_type.lower()
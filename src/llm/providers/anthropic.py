@@ -1,24 +1,16 @@
 import logging
-from typing import Dict, Any
-from anthropic import Anthropic
-from ..base import BaseLLM, LLMResponse, LLMRecommendation
+from typing import Dict, Any, Tuple
+from anthropic import Anthropic, AsyncAnthropic
+from ..base import AsyncCompletionProvider, BaseLLM, LLMResponse, LLMRecommendation
 
 logger = logging.getLogger("CloudCull.LLM.Anthropic")
 
-class AnthropicProvider(BaseLLM):
+class AnthropicProvider(BaseLLM, AsyncCompletionProvider):
     """
     Anthropic Implementation for Claude 3 series.
     """
-    def __init__(self, api_key: str = None):
-        from ...core.settings import settings
-        api_key = api_key or settings.anthropic_api_key
-        self.client = Anthropic(api_key=api_key)
-        self.model = "claude-3-5-sonnet-20241022" 
-
-    def classify_instance(self, metadata: Dict[str, Any], metrics: Dict[str, Any]) -> LLMResponse:
-        logger.info("Claude analyzing instance %s...", metadata.get('id', 'unknown'))
-        
-        system_prompt = """
+    PROVIDER = "anthropic"
+    SYSTEM_PROMPT = """
         You are an expert Cloud FinOps Auditor. Your task is to classify a GPU instance as 'ZOMBIE' or 'ACTIVE'.
         - ZOMBIE: Low CPU (<5% max for 1hr), minimal network activity, and no clear signs of iterative work.
         - ACTIVE: Significant CPU spikes, consistent load, or vital service indicators.
@@ -30,24 +22,51 @@ class AnthropicProvider(BaseLLM):
           "confidence": 0.0-1.0
         }
         """
-        
-        # Prompt Injection Protection: Sanitize metadata keys and values
-        from ..utils import sanitize_for_prompt
-        safe_metadata = sanitize_for_prompt(metadata)
-        safe_metrics = sanitize_for_prompt(metrics)
-        
-        user_input = f"METADATA: {safe_metadata}\nMETRICS: {safe_metrics}"
-        
-        response = self.client.messages.create(
-            model=self.model,
-            max_tokens=1024,
-            system=system_prompt,
-            messages=[{"role": "user", "content": user_input}]
-        )
-        
+
+    def __init__(self, api_key: str = None):
+        from ...core.settings import settings
+        api_key = api_key or settings.anthropic_api_key
+        self.client = Anthropic(api_key=api_key)
+        self._api_key = api_key
+        self._aclient = None
+        self.model = "claude-3-5-sonnet-20241022" 
+
+    @property
+    def aclient(self) -> AsyncAnthropic:
+        """Async client for aclassify_*; created on first use."""
+        if self._aclient is None:
+            self._aclient = AsyncAnthropic(api_key=self._api_key)
+        return self._aclient
+
+    def _complete(self, system: str, user: str, items: int = 1) -> Tuple[str, Dict[str, int]]:
+        return self._reply(self._request(self.client.messages.create, **self._message_args(system, user, items)))
+
+    async def _acomplete(self, system: str, user: str, items: int = 1) -> Tuple[str, Dict[str, int]]:
+        return self._reply(await self._arequest(self.aclient.messages.create, **self._message_args(system, user, items)))
+
+    def _message_args(self, system: str, user: str, items: int) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "max_tokens": min(1024 * items, 8192),
+            "system": system,
+            "messages": [{"role": "user", "content": user}]
+        }
+
+    @staticmethod
+    def _reply(response) -> Tuple[str, Dict[str, int]]:
+        usage = {
+            "input_tokens": response.usage.input_tokens,
+            "output_tokens": response.usage.output_tokens
+        }
+        return response.content[0].text, usage
+
+    def classify_instance(self, metadata: Dict[str, Any], metrics: Dict[str, Any]) -> LLMResponse:
+        logger.info("Claude analyzing instance %s...", metadata.get('id', 'unknown'))
+        return self._parse(*self._complete(self.SYSTEM_PROMPT, self._user_prompt(metadata, metrics)))
+
+    def _parse(self, text: str, usage: Dict[str, int]) -> LLMResponse:
         # Robust JSON Extraction (Improved)
         from ..utils import extract_json_from_text
-        text = response.content[0].text
         content = extract_json_from_text(text)
         
         if not content:
@@ -64,9 +83,6 @@ class AnthropicProvider(BaseLLM):
         return LLMResponse(
             raw_response=text,
             recommendation=recommendation,
-            usage={
-                "input_tokens": response.usage.input_tokens,
-                "output_tokens": response.usage.output_tokens
-            },
+            usage=usage,
             model=self.model
         )
@@ -1,24 +1,16 @@
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 from google import genai
-from ..base import BaseLLM, LLMResponse, LLMRecommendation
+from ..base import AsyncCompletionProvider, BaseLLM, LLMResponse, LLMRecommendation
 
 logger = logging.getLogger("CloudCull.LLM.Google")
 
-class GoogleProvider(BaseLLM):
+class GoogleProvider(BaseLLM, AsyncCompletionProvider):
     """
     Google Implementation for Gemini 1.5/2.0 series using the modern google-genai SDK.
     """
-    def __init__(self, api_key: str = None):
-        from ...core.settings import settings
-        api_key = api_key or settings.google_api_key
-        self.client = genai.Client(api_key=api_key)
-        self.model = "gemini-2.0-flash"
-
-    def classify_instance(self, metadata: Dict[str, Any], metrics: Dict[str, Any]) -> LLMResponse:
-        logger.info("Gemini analyzing instance %s...", metadata.get('id', 'unknown'))
-        
-        system_instruction = """
+    PROVIDER = "google"
+    SYSTEM_PROMPT = """
         You are a Cloud FinOps Specialist. Classify a GPU instance as 'ZOMBIE' or 'ACTIVE' based on its utilization.
         
         RULES:
@@ -32,26 +24,47 @@ class GoogleProvider(BaseLLM):
           "confidence": 0.0-1.0
         }
         """
-        
-        from ..utils import sanitize_for_prompt
-        safe_metadata = sanitize_for_prompt(metadata)
-        safe_metrics = sanitize_for_prompt(metrics)
-        
-        user_input = f"METADATA: {safe_metadata}\nMETRICS: {safe_metrics}"
-        
-        response = self.client.models.generate_content(
-            model=self.model,
-            contents=user_input,
-            config={
-                'system_instruction': system_instruction,
+
+    def __init__(self, api_key: str = None):
+        from ...core.settings import settings
+        api_key = api_key or settings.google_api_key
+        self.client = genai.Client(api_key=api_key)
+        self.model = "gemini-2.0-flash"
+
+    def _complete(self, system: str, user: str, items: int = 1) -> Tuple[str, Dict[str, int]]:
+        return self._reply(self._request(self.client.models.generate_content, **self._content_args(system, user)))
+
+    async def _acomplete(self, system: str, user: str, items: int = 1) -> Tuple[str, Dict[str, int]]:
+        # client.aio is the SDK's async surface over the same client
+        return self._reply(await self._arequest(self.client.aio.models.generate_content,
+                                                **self._content_args(system, user)))
+
+    def _content_args(self, system: str, user: str) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "contents": user,
+            "config": {
+                'system_instruction': system,
                 'response_mime_type': 'application/json'
             }
-        )
-        
+        }
+
+    @staticmethod
+    def _reply(response) -> Tuple[str, Dict[str, int]]:
+        usage = {
+            "prompt_token_count": response.usage_metadata.prompt_token_count,
+            "candidates_token_count": response.usage_metadata.candidates_token_count
+        }
+        return response.text, usage
+
+    def classify_instance(self, metadata: Dict[str, Any], metrics: Dict[str, Any]) -> LLMResponse:
+        logger.info("Gemini analyzing instance %s...", metadata.get('id', 'unknown'))
+        return self._parse(*self._complete(self.SYSTEM_PROMPT, self._user_prompt(metadata, metrics)))
+
+    def _parse(self, text: str, usage: Dict[str, int]) -> LLMResponse:
         import json
         
         # Robust JSON Extraction
-        text = response.text
         content = {}
         try:
             # Clean up potential markdown formatting
@@ -81,11 +94,8 @@ class GoogleProvider(BaseLLM):
         )
         
         return LLMResponse(
-            raw_response=response.text,
+            raw_response=text,
             recommendation=recommendation,
-            usage={
-                "prompt_token_count": response.usage_metadata.prompt_token_count,
-                "candidates_token_count": response.usage_metadata.candidates_token_count
-            },
+            usage=usage,
             model=self.model
         )
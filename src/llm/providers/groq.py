@@ -1,49 +1,69 @@
 import logging
-from typing import Dict, Any
-from groq import Groq
-from ..base import BaseLLM, LLMResponse, LLMRecommendation
+from typing import Dict, Any, Tuple
+from groq import AsyncGroq, Groq
+from ..base import AsyncCompletionProvider, BaseLLM, LLMResponse, LLMRecommendation
 
 logger = logging.getLogger("CloudCull.LLM.Groq")
 
-class GroqProvider(BaseLLM):
+class GroqProvider(BaseLLM, AsyncCompletionProvider):
     """
     Groq Implementation for Llama 3 series.
     """
+    PROVIDER = "groq"
+    SYSTEM_PROMPT = """
+        You are a Cloud Cost Optimization Auditor. Analyze instance metrics and metadata.
+        Output a JSON object classification (ZOMBIE vs ACTIVE).
+        - ZOMBIE means the instance is likely idle and should be stopped.
+        - ACTIVE means it is performing useful work.
+        """
+
     def __init__(self, api_key: str = None):
         from ...core.settings import settings
         api_key = api_key or settings.groq_api_key
         self.client = Groq(api_key=api_key)
+        self._api_key = api_key
+        self._aclient = None
         self.model = "llama-3.3-70b-versatile"
 
+    @property
+    def aclient(self) -> AsyncGroq:
+        """Async client for aclassify_*; created on first use."""
+        if self._aclient is None:
+            self._aclient = AsyncGroq(api_key=self._api_key)
+        return self._aclient
+
+    def _complete(self, system: str, user: str, items: int = 1) -> Tuple[str, Dict[str, int]]:
+        return self._reply(self._request(self.client.chat.completions.create, **self._chat_args(system, user)))
+
+    async def _acomplete(self, system: str, user: str, items: int = 1) -> Tuple[str, Dict[str, int]]:
+        return self._reply(await self._arequest(self.aclient.chat.completions.create, **self._chat_args(system, user)))
+
+    def _chat_args(self, system: str, user: str) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": system},
+                {"role": "user", "content": user}
+            ],
+            "response_format": {"type": "json_object"}
+        }
+
+    @staticmethod
+    def _reply(response) -> Tuple[str, Dict[str, int]]:
+        usage = {
+            "prompt_tokens": response.usage.prompt_tokens,
+            "completion_tokens": response.usage.completion_tokens
+        }
+        return response.choices[0].message.content, usage
+
     def classify_instance(self, metadata: Dict[str, Any], metrics: Dict[str, Any]) -> LLMResponse:
         logger.info("Groq/Llama analyzing instance %s...", metadata.get('id', 'unknown'))
-        
-        system_msg = """
-        You are a Cloud Cost Optimization Auditor. Analyze instance metrics and metadata.
-        Output a JSON object classification (ZOMBIE vs ACTIVE).
-        - ZOMBIE means the instance is likely idle and should be stopped.
-        - ACTIVE means it is performing useful work.
-        """
-        
-        from ..utils import sanitize_for_prompt
-        safe_metadata = sanitize_for_prompt(metadata)
-        safe_metrics = sanitize_for_prompt(metrics)
-        
-        user_msg = f"METADATA: {safe_metadata}\nMETRICS: {safe_metrics}"
-        
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": system_msg},
-                {"role": "user", "content": user_msg}
-            ],
-            response_format={"type": "json_object"}
-        )
-        
+        return self._parse(*self._complete(self.SYSTEM_PROMPT, self._user_prompt(metadata, metrics)))
+
+    def _parse(self, text: str, usage: Dict[str, int]) -> LLMResponse:
         import json
         
         # Robust JSON Extraction
-        text = response.choices[0].message.content
         content = {}
         try:
             # Clean up potential markdown formatting
@@ -73,11 +93,8 @@ class GroqProvider(BaseLLM):
         )
         
         return LLMResponse(
-            raw_response=response.choices[0].message.content,
+            raw_response=text,
             recommendation=recommendation,
-            usage={
-                "prompt_tokens": response.usage.prompt_tokens,
-                "completion_tokens": response.usage.completion_tokens
-            },
+            usage=usage,
             model=self.model
         )
@@ -1,24 +1,16 @@
 import logging
-from typing import Dict, Any
-from openai import OpenAI
-from ..base import BaseLLM, LLMResponse, LLMRecommendation
+from typing import Dict, Any, Tuple
+from openai import AsyncOpenAI, OpenAI
+from ..base import AsyncCompletionProvider, BaseLLM, LLMResponse, LLMRecommendation
 
 logger = logging.getLogger("CloudCull.LLM.OpenAI")
 
-class OpenAIProvider(BaseLLM):
+class OpenAIProvider(BaseLLM, AsyncCompletionProvider):
     """
     OpenAI Implementation for GPT-4 series.
     """
-    def __init__(self, api_key: str = None):
-        from ...core.settings import settings
-        api_key = api_key or settings.openai_api_key
-        self.client = OpenAI(api_key=api_key)
-        self.model = "gpt-4o" 
-
-    def classify_instance(self, metadata: Dict[str, Any], metrics: Dict[str, Any]) -> LLMResponse:
-        logger.info("GPT-4 analyzing instance %s...", metadata.get('id', 'unknown'))
-        
-        system_msg = """
+    PROVIDER = "openai"
+    SYSTEM_PROMPT = """
         You are a Cloud Infrastructure Sniper. Analyze instance state and decide if it is a 'ZOMBIE' (idle waste) or 'ACTIVE'.
         
         RULES:
@@ -27,53 +19,86 @@ class OpenAIProvider(BaseLLM):
         
         Response MUST be a JSON object with keys: decision, reasoning, confidence.
         """
-        
-        # Prompt Injection Protection: Sanitize metadata keys and values
-        from ..utils import sanitize_for_prompt
-        safe_metadata = sanitize_for_prompt(metadata)
-        safe_metrics = sanitize_for_prompt(metrics)
-        
-        user_msg = f"METADATA: {safe_metadata}\nMETRICS: {safe_metrics}"
-        
+
+    def __init__(self, api_key: str = None):
+        from ...core.settings import settings
+        api_key = api_key or settings.openai_api_key
+        self.client = OpenAI(api_key=api_key)
+        self._api_key = api_key
+        self._aclient = None
+        self.model = "gpt-4o" 
+
+    @property
+    def aclient(self) -> AsyncOpenAI:
+        """Async client for aclassify_*; created on first use."""
+        if self._aclient is None:
+            self._aclient = AsyncOpenAI(api_key=self._api_key)
+        return self._aclient
+
+    def _complete(self, system: str, user: str, items: int = 1) -> Tuple[str, Dict[str, int]]:
+        return self._reply(self._request(self.client.chat.completions.create, **self._chat_args(system, user)))
+
+    async def _acomplete(self, system: str, user: str, items: int = 1) -> Tuple[str, Dict[str, int]]:
+        return self._reply(await self._arequest(self.aclient.chat.completions.create, **self._chat_args(system, user)))
+
+    def _chat_args(self, system: str, user: str) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": system},
+                {"role": "user", "content": user}
+            ],
+            "response_format": {"type": "json_object"}
+        }
+
+    @staticmethod
+    def _reply(response) -> Tuple[str, Dict[str, int]]:
+        usage = {
+            "prompt_tokens": response.usage.prompt_tokens,
+            "completion_tokens": response.usage.completion_tokens
+        }
+        return response.choices[0].message.content, usage
+
+    def classify_instance(self, metadata: Dict[str, Any], metrics: Dict[str, Any]) -> LLMResponse:
+        logger.info("GPT-4 analyzing instance %s...", metadata.get('id', 'unknown'))
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_msg},
-                    {"role": "user", "content": user_msg}
-                ],
-                response_format={"type": "json_object"}
-            )
-            
-            # Robust JSON Extraction (Improved)
-            from ..utils import extract_json_from_text
-            text = response.choices[0].message.content
-            content = extract_json_from_text(text)
+            return self._parse(*self._complete(self.SYSTEM_PROMPT, self._user_prompt(metadata, metrics)))
+        except Exception as e:
+            return self._error_response(e)
 
-            if not content:
-                logger.error("Failed to parse OpenAI response: JSON extraction empty | Text: %s", text[:100])
-                content = {"decision": "ACTIVE", "reasoning": "Failed to parse structured response", "confidence": 0.0}
-            
-            recommendation = LLMRecommendation(
-                decision=content.get("decision", "ACTIVE"),
-                reasoning=content.get("reasoning", text[:500]),
-                confidence=content.get("confidence", 0.5)
-            )
-            
-            return LLMResponse(
-                raw_response=response.choices[0].message.content,
-                recommendation=recommendation,
-                usage={
-                    "prompt_tokens": response.usage.prompt_tokens,
-                    "completion_tokens": response.usage.completion_tokens
-                },
-                model=self.model
-            )
+    async def aclassify_instance(self, metadata: Dict[str, Any], metrics: Dict[str, Any]) -> LLMResponse:
+        try:
+            return await super().aclassify_instance(metadata, metrics)
         except Exception as e:
-            logger.error("OpenAI classification failed: %s", e)
-            return LLMResponse(
-                raw_response=str(e),
-                recommendation=LLMRecommendation(decision="ACTIVE", reasoning="API Error", confidence=0.0),
-                usage={},
-                model=self.model
-            )
+            return self._error_response(e)
+
+    def _parse(self, text: str, usage: Dict[str, int]) -> LLMResponse:
+        # Robust JSON Extraction (Improved)
+        from ..utils import extract_json_from_text
+        content = extract_json_from_text(text)
+
+        if not content:
+            logger.error("Failed to parse OpenAI response: JSON extraction empty | Text: %s", text[:100])
+            content = {"decision": "ACTIVE", "reasoning": "Failed to parse structured response", "confidence": 0.0}
+        
+        recommendation = LLMRecommendation(
+            decision=content.get("decision", "ACTIVE"),
+            reasoning=content.get("reasoning", text[:500]),
+            confidence=content.get("confidence", 0.5)
+        )
+        
+        return LLMResponse(
+            raw_response=text,
+            recommendation=recommendation,
+            usage=usage,
+            model=self.model
+        )
+
+    def _error_response(self, e: Exception) -> LLMResponse:
+        logger.error("OpenAI classification failed: %s", e)
+        return LLMResponse(
+            raw_response=str(e),
+            recommendation=LLMRecommendation(decision="ACTIVE", reasoning="API Error", confidence=0.0),
+            usage={},
+            model=self.model
+        )
@@ -1,5 +1,5 @@
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 from ..base import BaseLLM, LLMResponse, LLMRecommendation
 
 logger = logging.getLogger("CloudCull.LLM.Mock")
@@ -37,3 +37,15 @@ class SimulatedProvider(BaseLLM):
             usage={"prompt_tokens": 120, "completion_tokens": 45},
             model=self.model
         )
+
+    def classify_batch(self, items: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> List[LLMResponse]:
+        # Verdicts are deterministic per instance, so a batch is just the individual results
+        logger.info("[MOCK AI] Analyzing batch of %d instances...", len(items))
+        return [self.classify_instance(metadata, metrics) for metadata, metrics in items]
+
+    # No I/O to wait on, so the async variants answer inline instead of using worker threads
+    async def aclassify_instance(self, metadata: Dict[str, Any], metrics: Dict[str, Any]) -> LLMResponse:
+        return self.classify_instance(metadata, metrics)
+
+    async def aclassify_batch(self, items: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> List[LLMResponse]:
+        return self.classify_batch(items)
@@ -1,7 +1,10 @@
 import json
 import logging
 import re
-from typing import Dict, Any
+from typing import TYPE_CHECKING, Dict, Any, List, Tuple
+
+if TYPE_CHECKING:
+    from .base import LLMRecommendation
 
 logger = logging.getLogger("CloudCull.LLM.Utils")
 
@@ -64,3 +67,57 @@ def extract_json_from_text(text: str) -> Dict[str, Any]:
             return {}
     
     return {}
+
+BATCH_INSTRUCTIONS = """
+        BATCH MODE: The user message is a JSON array of instances, each {"key": ..., "metadata": ..., "metrics": ...}.
+        Classify every instance independently using the rules above and return ONLY a JSON object:
+        {
+          "results": [
+            {"key": "<key>", "decision": "ZOMBIE" | "ACTIVE", "reasoning": "step-by-step logic", "confidence": 0.0-1.0}
+          ]
+        }
+        with exactly one entry per input key.
+        """
+
+def build_batch_prompt(items: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> str:
+    """Packs (metadata, metrics) pairs into one keyed JSON array; the key is the item's position."""
+    return json.dumps([
+        {"key": str(i), "metadata": sanitize_for_prompt(metadata), "metrics": sanitize_for_prompt(metrics)}
+        for i, (metadata, metrics) in enumerate(items)
+    ], default=str)
+
+def parse_batch_response(text: str, count: int) -> Dict[int, "LLMRecommendation"]:
+    """
+    Maps a batch reply back to item positions. Entries with an unknown or duplicate key,
+    a decision other than ZOMBIE/ACTIVE, or an out-of-range confidence are dropped so the
+    caller can re-classify those items on their own.
+    """
+    from pydantic import ValidationError
+    from .base import LLMRecommendation
+
+    content = extract_json_from_text(text)
+    entries = content.get("results") if isinstance(content, dict) else None
+    if not isinstance(entries, list):
+        logger.error("Batch response has no results array | Text: %s", (text or "")[:100])
+        return {}
+
+    parsed = {}
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        try:
+            index = int(entry.get("key"))
+        except (TypeError, ValueError):
+            continue
+        decision = str(entry.get("decision", "")).upper()
+        if not 0 <= index < count or index in parsed or decision not in ("ZOMBIE", "ACTIVE"):
+            continue
+        try:
+            parsed[index] = LLMRecommendation(
+                decision=decision,
+                reasoning=entry.get("reasoning") or "",
+                confidence=entry.get("confidence", 0.5)
+            )
+        except ValidationError as e:
+            logger.warning("Invalid batch verdict for item %d: %s", index, e)
+    return parsed
@@ -1,20 +1,32 @@
 #!/usr/bin/env python3
 import argparse
+import asyncio
 import datetime
 import json
 import logging
 import os
+import queue
+import sqlite3
 import sys
+import threading
+import time
+from concurrent.futures import wait
 from logging.handlers import RotatingFileHandler
-from typing import Dict, List
+from typing import Dict, Iterator, List
 
 from prometheus_client import Gauge, start_http_server
 
 # Modular Imports
-from .adapters import AdapterRegistry
+from .adapters import AdapterRegistry, parse_platforms
+from .adapters.base import STOP_DONE, STOP_FAILED, STOP_PENDING
+from .core.cache import PersistentCache
+from .core.fingerprint import fingerprint_target
 from .core.pricing import CloudPricing
 from .core.remediation import TerraformRemediator
+from .core.rules import RuleTier, tier_summary
+from .core.scheduler import scheduler
 from .core.settings import settings
+from .llm.cache import CachedLLM
 from .llm.factory import LLMFactory
 
 # Constants
@@ -23,6 +35,7 @@ HOURS_PER_MONTH = 730  # Standardized average hours per month
 # Define Metrics
 ZOMBIE_GAUGE = Gauge('cloudcull_zombies_found_total', 'Total number of zombie instances detected')
 SAVINGS_GAUGE = Gauge('cloudcull_potential_savings_usd', 'Potential monthly savings in USD')
+DISCOVERY_DURATION_GAUGE = Gauge('cloudcull_discovery_duration_seconds', 'Wall time of the last scan per cloud adapter', ['adapter'])
 
 # Configure logging
 log_formatter = logging.Formatter('%(asctime)s - [CloudCull] - %(levelname)s - %(message)s')
@@ -52,16 +65,110 @@ try:
 except OSError as e:
     logger.warning("Failed to initialize secure log handler: %s", e)
 
+# Marks the end of a stream on the discovery and analysis queues
+_END_OF_STREAM = object()
+
+def _adapter_label(adapter) -> str:
+    """Adapter class name, qualified with its region for per-region adapters."""
+    region = getattr(adapter, "region", None)
+    name = type(adapter).__name__
+    return f"{name}[{region}]" if isinstance(region, str) else name
+
+class _AdapterScan:
+    """Tracks one adapter's producer thread and the time it spends inside the cloud SDK."""
+    def __init__(self, adapter):
+        self.adapter = adapter
+        self.entry = {"adapter": _adapter_label(adapter), "status": "ok", "targets": 0, "duration_s": None, "error": None}
+        self.busy = 0.0
+        self.fetch_started = None
+        self.abandoned = threading.Event()
+
+    def elapsed(self) -> float:
+        """Seconds spent scanning, excluding time blocked on a full queue (backpressure)."""
+        started = self.fetch_started
+        return self.busy + (time.monotonic() - started if started is not None else 0.0)
+
+    def produce(self, sink: queue.Queue):
+        self.fetch_started = time.monotonic()
+        try:
+            for target in self.adapter.scan_iter():
+                self.busy += time.monotonic() - self.fetch_started
+                self.fetch_started = None
+                if self.abandoned.is_set():
+                    return
+                sink.put((self, target))
+                self.fetch_started = time.monotonic()
+        except Exception as e:
+            self.entry["status"] = "error"
+            self.entry["error"] = str(e)
+            logger.error("%s discovery failed: %s", self.entry["adapter"], e)
+        finally:
+            if self.fetch_started is not None:
+                self.busy += time.monotonic() - self.fetch_started
+                self.fetch_started = None
+            if not self.abandoned.is_set():
+                self.entry["duration_s"] = round(self.busy, 3)
+                # Adapter-specific listing stats (e.g. GCP payload size), when reported
+                stats = getattr(self.adapter, "scan_stats", None)
+                if isinstance(stats, dict) and stats:
+                    self.entry["stats"] = dict(stats)
+                sink.put((self, _END_OF_STREAM))
+
 class DiscoveryService:
     """Encapsulates multi-cloud target discovery."""
-    def __init__(self, region: str, simulated: bool):
-        self.adapters = AdapterRegistry.get_all_adapters(region, simulated)
+    def __init__(self, region: str, simulated: bool, timeout: float = None, queue_size: int = None,
+                 regions: List[str] = None, platforms: List[str] = None):
+        self.adapters = AdapterRegistry.get_all_adapters(region, simulated, regions, platforms=platforms)
+        self.timeout = timeout if timeout is not None else settings.discovery_timeout
+        self.queue_size = queue_size or settings.pipeline_queue_size
+        self.scan_report: List[Dict] = []
+
+    def iter_targets(self) -> Iterator[Dict]:
+        """
+        Streams targets from all adapters concurrently, in discovery order.
+        Each adapter runs against its own deadline and error slot, so one hung cloud
+        cannot hold back the others. Time spent blocked on a slow consumer does not
+        count against the deadline. Per-adapter timings are kept in `scan_report`.
+        """
+        self.scan_report = []
+        sink = queue.Queue(maxsize=self.queue_size)
+        live = []
+        for adapter in self.adapters:
+            scan = _AdapterScan(adapter)
+            self.scan_report.append(scan.entry)
+            live.append(scan)
+            # Daemon threads: a hung SDK call must not block interpreter exit
+            threading.Thread(target=scan.produce, args=(sink,), name="discovery", daemon=True).start()
+
+        while live:
+            try:
+                scan, item = sink.get(timeout=0.1)
+            except queue.Empty:
+                scan, item = None, None
+
+            if scan is not None and not scan.abandoned.is_set():
+                if item is _END_OF_STREAM:
+                    live.remove(scan)
+                else:
+                    scan.entry["targets"] += 1
+                    yield item
+
+            for stalled in [s for s in live if s.elapsed() > self.timeout]:
+                # Abandon the hung scan; its thread exits on its next yield
+                stalled.abandoned.set()
+                stalled.entry["status"] = "timeout"
+                stalled.entry["duration_s"] = self.timeout
+                stalled.entry["error"] = f"Scan exceeded {self.timeout:.0f}s deadline"
+                logger.error("⏱️  %s discovery timed out after %.0fs. Skipping.", stalled.entry["adapter"], self.timeout)
+                live.remove(stalled)
+
+        for entry in self.scan_report:
+            DISCOVERY_DURATION_GAUGE.labels(adapter=entry["adapter"]).set(entry["duration_s"] or 0.0)
+            logger.info("🔎 %s: %d targets in %.2fs (%s)", entry["adapter"], entry["targets"],
+                        entry["duration_s"] or 0.0, entry["status"])
 
     def scan_all(self) -> List[Dict]:
-        all_targets = []
-        for adapter in self.adapters:
-            all_targets.extend(adapter.scan())
-        return all_targets
+        return list(self.iter_targets())
 
 def scrub_metadata(metadata: Dict) -> Dict:
     """Recursively removes sensitive keys from metadata to prevent dashboard exposure."""
@@ -114,15 +221,51 @@ class ConsoleRenderer:
 
 class CloudCullRunner:
     def __init__(self, region: str = "us-east-1", dry_run: bool = True, model: str = "claude", 
-                 simulated: bool = False, auto_approve: bool = False, max_workers: int = 10):
+                 simulated: bool = False, auto_approve: bool = False, max_workers: int = 10,
+                 queue_size: int = None, regions: List[str] = None, incremental: bool = False,
+                 platforms: List[str] = None, llm_batch_size: int = None, async_llm: bool = None):
+        self.region = region
         self.dry_run = dry_run
+        self.stop_report = None
         self.simulated = simulated
         self.auto_approve = auto_approve
         self.max_workers = max_workers
-        self.discovery = DiscoveryService(region, simulated)
+        self.queue_size = queue_size or settings.pipeline_queue_size
+        self.discovery = DiscoveryService(region, simulated, queue_size=self.queue_size, regions=regions,
+                                          platforms=platforms)
         self.pricing = CloudPricing()
         self.remediator = TerraformRemediator()
         self.brain = LLMFactory.get_provider(model, simulated=simulated)
+        if settings.llm_cache_enabled and not simulated:
+            self.brain = LLMFactory.with_cache(self.brain)
+        # Analysis runs on the scheduler pool of this provider; --workers sets its concurrency
+        # and caps the provider's adaptive limiter of the same name
+        self.llm_pool = f"llm.{LLMFactory.canonical_name(model)}"
+        # Async mode awaits the providers' async clients on one event loop instead of pool threads,
+        # so only the limiter ceiling follows --workers and the thread pool is left as it is
+        self.async_llm = settings.llm_async if async_llm is None else async_llm
+        self._loop = None
+        if self.async_llm:
+            scheduler.limiter(self.llm_pool).set_max(max_workers)
+        else:
+            scheduler.set_limit(self.llm_pool, max_workers)
+        # Targets packed into one classify_batch() request; 1 keeps one request per target
+        self.llm_batch_size = max(1, llm_batch_size or settings.llm_batch_size)
+
+        # Rules tier: clear-cut idle or busy targets are decided without an LLM call
+        self.rules = RuleTier.from_settings(settings) if settings.rules_enabled else None
+        self.tier_report = None
+
+        # Incremental mode: unchanged targets reuse their last verdict instead of a new LLM call
+        self.verdicts = None
+        self.incremental_stats = {"reused": 0, "classified": 0}
+        self._stats_lock = threading.Lock()
+        if incremental:
+            self.verdicts = PersistentCache(
+                settings.cache_path,
+                namespace="verdicts",
+                ttl_seconds=settings.incremental_verdict_ttl_hours * 3600
+            )
         
         logger.info("CloudCull initialized with machine intelligence: %s%s", 
                     model.upper(), " (SIMULATED)" if simulated else "")
@@ -146,13 +289,13 @@ class CloudCullRunner:
         if not self.remediator.check_terraform_binary():
             errors.append("Terraform binary not found in PATH. Remediation will be unavailable.")
 
-        # 3. Test Cloud Adapter Initialization & Active Connectivity
+        # 3. Test Cloud Adapter Initialization & Active Connectivity (concurrent, time-boxed, cached)
         healthy_adapters = []
         if not self.discovery.adapters:
             errors.append("No cloud adapters initialized")
         else:
-            for adapter in self.discovery.adapters:
-                if adapter.verify_connection():
+            for adapter, healthy in zip(self.discovery.adapters, self._verify_adapters(self.discovery.adapters)):
+                if healthy:
                     healthy_adapters.append(adapter)
                 else:
                     logger.warning("⚠️  Cloud Connection Verification Failed for %s. This provider will be skipped.", type(adapter).__name__)
@@ -178,14 +321,252 @@ class CloudCullRunner:
             
         logger.info("✅ Pre-flight checks passed. Launching sniper.")
 
+    def _verify_adapters(self, adapters: List) -> List[bool]:
+        """
+        Runs verify_connection() for all adapters on the "preflight" pool (PREFLIGHT_CONCURRENCY
+        at once), giving up on any check still running after PREFLIGHT_TIMEOUT_SECONDS (its
+        worker is a daemon thread, so a hung credential chain cannot block exit). Successes are
+        remembered per adapter scope for PREFLIGHT_CACHE_TTL_MINUTES, so back-to-back runs skip
+        the round-trips. Failed adapters are evicted from the AdapterRegistry.
+        """
+        # One key over every scope, so a multi-subscription adapter is only cached as a whole
+        keys = [
+            "+".join(sorted("|".join(str(part) for part in scope[:4]) for scope in scopes)) or None
+            for scopes in (AdapterRegistry.adapter_keys(a) for a in adapters)
+        ]
+        cache = None
+        if settings.preflight_cache_ttl_minutes > 0 and any(keys):
+            try:
+                cache = PersistentCache(settings.cache_path, namespace="preflight",
+                                        ttl_seconds=settings.preflight_cache_ttl_minutes * 60)
+            except (sqlite3.Error, OSError) as e:
+                logger.warning("Pre-flight cache unavailable at %s: %s", settings.cache_path, e)
+
+        results = [bool(cache and key and cache.get(key)) for key in keys]
+        checks = {i: a for i, a in enumerate(adapters) if not results[i]}
+        if checks:
+            futures = {i: scheduler.submit("preflight", a.verify_connection) for i, a in checks.items()}
+            done, _ = wait(futures.values(), timeout=settings.preflight_timeout)
+            for i, future in futures.items():
+                if future not in done:
+                    logger.error("Connection verification for %s timed out after %.0fs",
+                                 _adapter_label(adapters[i]), settings.preflight_timeout)
+                elif future.exception() is not None:
+                    logger.error("Connection verification for %s failed: %s", _adapter_label(adapters[i]), future.exception())
+                else:
+                    results[i] = bool(future.result())
+                    if results[i] and cache and keys[i]:
+                        cache.set(keys[i], True)
+        if cache:
+            cache.close()
+        for adapter, healthy in zip(adapters, results):
+            if not healthy:
+                # Remediation must not reach a scope through unverified credentials
+                AdapterRegistry.evict(adapter, self.simulated)
+        logger.info("Pre-flight: %d connection checks, %d cached", len(checks), len(adapters) - len(checks))
+        return results
+
+    def _reuse_verdict(self, t: Dict) -> bool:
+        """Sets status/reasoning from the stored verdict when the target is unchanged."""
+        if not self.verdicts:
+            return False
+        previous = self.verdicts.get(f"{t['platform']}:{t['id']}")
+        if previous and previous.get("fingerprint") == fingerprint_target(t):
+            t['status'] = previous['status']
+            t['reasoning'] = previous['reasoning']
+            t['decided_by'] = "cache"
+            with self._stats_lock:
+                self.incremental_stats["reused"] += 1
+            return True
+        return False
+
+    def _apply_verdict(self, t: Dict, llm_report):
+        t['status'] = llm_report.recommendation.decision
+        t['reasoning'] = llm_report.recommendation.reasoning
+        t['confidence'] = llm_report.recommendation.confidence
+        t['decided_by'] = "llm"
+        with self._stats_lock:
+            self.incremental_stats["classified"] += 1
+        if self.verdicts:
+            self.verdicts.set(f"{t['platform']}:{t['id']}",
+                              {"fingerprint": fingerprint_target(t), "status": t['status'], "reasoning": t['reasoning']})
+
+    def _apply_rules(self, t: Dict) -> bool:
+        """Sets status/reasoning/confidence when the rules tier can decide the target on its own."""
+        verdict = self.rules.classify(t.get('metrics'), t.get('metadata')) if self.rules else None
+        if verdict is None:
+            return False
+        t['status'], t['reasoning'], t['confidence'] = verdict
+        t['decided_by'] = "rules"
+        return True
+
+    def _decide_locally(self, t: Dict) -> bool:
+        return self._apply_rules(t) or self._reuse_verdict(t)
+
+    def _classify(self, t: Dict):
+        """Sets status/reasoning via the rules tier, a stored verdict for unchanged targets, or the LLM."""
+        if not self._decide_locally(t):
+            self._apply_verdict(t, self.brain.classify_instance(t['metadata'], t['metrics']))
+
+    def _price(self, t: Dict):
+        # Pricing Safety: specific handling for None
+        rate = self.pricing.get_hourly_rate(t['platform'], t['type'])
+        t['rate'] = rate if rate is not None else 0.0 # internal calc use 0, but UI shows Unknown
+        t['rate_is_unknown'] = (rate is None)
+
+    def _mark_failed(self, t: Dict, e: Exception):
+        logger.error("Failed to analyze target %s: %s", t.get('id', 'unknown'), e)
+        t['status'] = "UNKNOWN"
+        t['reasoning'] = f"Analysis Error: {e}"
+        t['decided_by'] = "error"
+        t['rate'] = 0.0
+        t['rate_is_unknown'] = True
+
+    def _analyze_target(self, t: Dict) -> Dict:
+        try:
+            self._classify(t)
+            self._price(t)
+        except Exception as e:
+            self._mark_failed(t, e)
+        
+        return t
+
+    def _analyze_batch(self, batch: List[Dict]) -> List[Dict]:
+        """Like _analyze_target, but targets the rules tier and verdict cache cannot decide share one classify_batch() request."""
+        ready, pending = self._split_batch(batch)
+        reports = None
+        if pending:
+            try:
+                reports = self.brain.classify_batch([(t['metadata'], t['metrics']) for t in pending])
+            except Exception as e:
+                reports = e
+        return self._finish_batch(batch, ready, pending, reports)
+
+    async def _aanalyze_batch(self, batch: List[Dict], semaphore: asyncio.Semaphore) -> List[Dict]:
+        """
+        Async _analyze_batch for the event-loop pipeline: the provider request is awaited on its
+        async client while holding one of the provider's `semaphore` permits.
+        """
+        ready, pending = self._split_batch(batch)
+        reports = None
+        if pending:
+            try:
+                async with semaphore:
+                    if self.llm_batch_size == 1:
+                        reports = [await self.brain.aclassify_instance(t['metadata'], t['metrics']) for t in pending]
+                    else:
+                        reports = await self.brain.aclassify_batch([(t['metadata'], t['metrics']) for t in pending])
+            except Exception as e:
+                reports = e
+        return self._finish_batch(batch, ready, pending, reports)
+
+    def _split_batch(self, batch: List[Dict]):
+        """(decided locally, needs the LLM)"""
+        ready, pending = [], []
+        for t in batch:
+            try:
+                (ready if self._decide_locally(t) else pending).append(t)
+            except Exception as e:
+                self._mark_failed(t, e)
+        return ready, pending
+
+    def _finish_batch(self, batch: List[Dict], ready: List[Dict], pending: List[Dict], reports) -> List[Dict]:
+        """Applies LLM reports (or the exception that replaced them) to pending targets, then prices the batch."""
+        if isinstance(reports, Exception):
+            for t in pending:
+                self._mark_failed(t, reports)
+        elif pending:
+            for t, report in zip(pending, reports):
+                self._apply_verdict(t, report)
+                ready.append(t)
+        for t in ready:
+            try:
+                self._price(t)
+            except Exception as e:
+                self._mark_failed(t, e)
+        return batch
+
+    def _event_loop(self) -> asyncio.AbstractEventLoop:
+        """The runner's asyncio loop for --async-llm, started once on a daemon thread and reused across audits."""
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            threading.Thread(target=self._loop.run_forever, name="llm-async", daemon=True).start()
+        return self._loop
+
+    def _iter_analyzed(self) -> Iterator[Dict]:
+        """
+        Streaming pipeline: discovered targets are submitted to the scheduler's LLM pool as they
+        arrive, and results are yielded in completion order so discovery and LLM latency overlap.
+        With llm_batch_size > 1, targets are grouped into batches of that size (the last one may
+        be short) and each batch is one task. With async_llm, tasks are coroutines on the
+        runner's event loop instead of pool threads, so --workers can be in the hundreds.
+        At most max_workers batches + queue_size targets are in flight, which applies
+        backpressure to the adapters.
+        """
+        result_queue = queue.Queue()
+        slots = threading.BoundedSemaphore(self.max_workers * self.llm_batch_size + self.queue_size)
+        submitted = [0]
+
+        def done_for(count):
+            def done(future):
+                for _ in range(count):
+                    slots.release()
+                try:
+                    result = future.result()
+                    for t in (result if isinstance(result, list) else [result]):
+                        result_queue.put(t)
+                except Exception as e:
+                    # _analyze_target/_analyze_batch handle their own errors; this only guards the stream count
+                    logger.error("Analysis task failed: %s", e)
+                    for _ in range(count):
+                        result_queue.put(None)
+            return done
+
+        loop = self._event_loop() if self.async_llm else None
+        # Per-provider cap on requests in flight on the event loop
+        semaphore = asyncio.Semaphore(self.max_workers) if loop else None
+
+        def submit(batch):
+            submitted[0] += len(batch)
+            if loop:
+                future = asyncio.run_coroutine_threadsafe(self._aanalyze_batch(batch, semaphore), loop)
+            elif self.llm_batch_size == 1:
+                future = scheduler.submit(self.llm_pool, self._analyze_target, batch[0])
+            else:
+                future = scheduler.submit(self.llm_pool, self._analyze_batch, batch)
+            future.add_done_callback(done_for(len(batch)))
+
+        def feed():
+            batch = []
+            try:
+                for t in self.discovery.iter_targets():
+                    slots.acquire()
+                    batch.append(t)
+                    if len(batch) == self.llm_batch_size:
+                        submit(batch)
+                        batch = []
+            except Exception as e:
+                logger.error("Discovery stream failed: %s", e)
+            finally:
+                if batch:
+                    submit(batch)
+                result_queue.put(_END_OF_STREAM)
+
+        threading.Thread(target=feed, name="pipeline-feed", daemon=True).start()
+
+        received = 0
+        finished = False
+        while not finished or received < submitted[0]:
+            t = result_queue.get()
+            if t is _END_OF_STREAM:
+                finished = True
+                continue
+            received += 1
+            if t is not None:
+                yield t
+
     def run_audit(self, renderer: ConsoleRenderer = None) -> List[Dict]:
         """The core execution loop."""
-        # 1. Discovery
-        all_targets = self.discovery.scan_all()
-        
-        # 2. Parallel Analysis & Classification
-        from concurrent.futures import ThreadPoolExecutor
-        
         all_results = []
         zombies = []
         total_monthly_savings = 0.0
@@ -193,30 +574,10 @@ class CloudCullRunner:
         if renderer:
             renderer.print_header()
 
-        def analyze_target(t: Dict) -> Dict:
-            try:
-                llm_report = self.brain.classify_instance(t['metadata'], t['metrics'])
-                t['status'] = llm_report.recommendation.decision
-                t['reasoning'] = llm_report.recommendation.reasoning
-                
-                # Pricing Safety: specific handling for None
-                rate = self.pricing.get_hourly_rate(t['platform'], t['type'])
-                t['rate'] = rate if rate is not None else 0.0 # internal calc use 0, but UI shows Unknown
-                t['rate_is_unknown'] = (rate is None)
-            except Exception as e:
-                logger.error("Failed to analyze target %s: %s", t.get('id', 'unknown'), e)
-                t['status'] = "UNKNOWN"
-                t['reasoning'] = f"Analysis Error: {e}"
-                t['rate'] = 0.0
-                t['rate_is_unknown'] = True
-            
-            return t
-
-        logger.info("📡 Analyzing %d targets in parallel (Workers=%d)...", len(all_targets), self.max_workers)
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            analyzed_targets = list(executor.map(analyze_target, all_targets))
-
-        for t in analyzed_targets:
+        # 1. Discovery & 2. Parallel Analysis, streamed
+        logger.info("📡 Streaming targets to analysis (Workers=%d, Queue=%d, Batch=%d%s)...",
+                    self.max_workers, self.queue_size, self.llm_batch_size, ", async" if self.async_llm else "")
+        for t in self._iter_analyzed():
             if t.get('rate_is_unknown'):
                 monthly = None
             else:
@@ -234,6 +595,17 @@ class CloudCullRunner:
             t['metadata'] = scrub_metadata(t['metadata'])
             all_results.append(t)
 
+        logger.info("📡 Analyzed %d targets.", len(all_results))
+        self.tier_report = tier_summary(all_results)
+        logger.info("🧮 Decided by: %s", ", ".join(
+            f"{tier} {stats['count']} ({stats['fraction']:.0%})" for tier, stats in self.tier_report.items()))
+        if self.verdicts:
+            logger.info("♻️  Incremental: %d verdicts reused, %d targets classified.",
+                        self.incremental_stats["reused"], self.incremental_stats["classified"])
+        if isinstance(self.brain, CachedLLM):
+            stats = self.brain.stats()
+            logger.info("🗃️  LLM cache: %d hits, %d misses (hit ratio %.0f%%).",
+                        stats["hits"], stats["misses"], stats["hit_ratio"] * 100)
         if renderer:
             renderer.print_footer(total_monthly_savings)
         
@@ -246,34 +618,73 @@ class CloudCullRunner:
     def execute_active_ops(self, zombies: List[Dict]):
         """
         The Production Kill-Switch:
-        1. Issues Cloud-Native STOP commands to the actual instances.
-        2. Removes the resources from Terraform state.
+        1. Issues Cloud-Native STOP commands to the actual instances, in bulk per adapter.
+        2. Waits for the stops to complete in one polling loop across all adapters.
+        3. Removes the stopped resources from Terraform state.
+        The per-instance outcome and total wall time end up in self.stop_report.
         """
         if not zombies:
             return
 
         logger.info("🛡️  INITIATING ACTIVEOPS: Neutralizing %d zombies...", len(zombies))
-        
+        started = time.monotonic()
+
         # 1. Cloud-Native Stop (Physical Remediation)
-        # We group zombies by platform to use the correct adapter
-        success_count = 0
+        # Zombies are grouped by the registered adapter for their region/subscription/project,
+        # i.e. the discovery adapter that found them, with its already-open clients
+        groups: Dict[int, tuple] = {}
+        states: Dict[str, str] = {}
         for z in zombies:
-            platform = z['platform'].upper()
             try:
-                # Find the matching adapter
-                adapter = AdapterRegistry.get_adapter_by_platform(platform, self.discovery.adapters[0].region, self.simulated)
-                if adapter:
-                    logger.info("⚡ Stopping %s instance %s...", platform, z['id'])
-                    adapter.stop_instance(z['id'], z['metadata'])
-                    success_count += 1
-                else:
-                    logger.warning("No adapter found for platform %s to stop instance %s", platform, z['id'])
+                adapter = AdapterRegistry.adapter_for_target(z, self.simulated, self.region)
+                groups.setdefault(id(adapter), (adapter, []))[1].append(z)
             except Exception as e:
-                logger.error("Failed to stop %s instance %s: %s", platform, z['id'], e)
+                logger.error("No adapter to stop %s instance %s: %s", z['platform'], z['id'], e)
+                states[z['id']] = STOP_FAILED
 
-        # 2. IaC Management (State Remediation)
-        if success_count > 0:
-            plan = self.remediator.generate_plan(zombies)
+        pending: Dict[int, tuple] = {}
+        for key, (adapter, targets) in groups.items():
+            logger.info("⚡ Stopping %d instances via %s...", len(targets), _adapter_label(adapter))
+            try:
+                issued = adapter.stop_instances(targets)
+            except Exception as e:
+                logger.error("Bulk stop failed on %s: %s", _adapter_label(adapter), e)
+                issued = {}
+            for t in targets:
+                states[t['id']] = issued.get(t['id'], STOP_FAILED)
+            waiting = [t['id'] for t in targets if states[t['id']] == STOP_PENDING]
+            if waiting:
+                pending[key] = (adapter, waiting)
+
+        # 2. Completion Polling: one round asks every adapter about its outstanding stops
+        deadline = started + settings.stop_timeout
+        while pending and time.monotonic() < deadline:
+            for key, (adapter, waiting) in list(pending.items()):
+                try:
+                    states.update(adapter.stop_states(waiting))
+                except Exception as e:
+                    logger.warning("Stop polling failed on %s: %s", _adapter_label(adapter), e)
+                waiting = [iid for iid in waiting if states[iid] == STOP_PENDING]
+                if waiting:
+                    pending[key] = (adapter, waiting)
+                else:
+                    del pending[key]
+            if pending:
+                time.sleep(settings.stop_poll_interval)
+
+        self.stop_report = {
+            "wall_time_s": round(time.monotonic() - started, 2),
+            "instances": [{"id": z['id'], "platform": z['platform'], "state": states[z['id']]} for z in zombies],
+        }
+        stopped = [z for z in zombies if states[z['id']] == STOP_DONE]
+        logger.info("Kill-switch finished in %.1fs: %d stopped, %d still stopping, %d failed",
+                    self.stop_report["wall_time_s"], len(stopped),
+                    sum(1 for s in states.values() if s == STOP_PENDING),
+                    sum(1 for s in states.values() if s == STOP_FAILED))
+
+        # 3. IaC Management (State Remediation), only for instances confirmed stopped
+        if stopped:
+            plan = self.remediator.generate_plan(stopped)
             self.remediator.execute_remediation_plan(plan)
             logger.info("✅ ActiveOps Physical & State remediation complete.")
         else:
@@ -300,16 +711,28 @@ class CloudCullRunner:
 def main():
     parser = argparse.ArgumentParser(description="CloudCull: The Autonomous Multi-Cloud GPU Sniper")
     parser.add_argument("--region", default=settings.aws_region, help="Cloud region to scan")
+    parser.add_argument("--regions", default=settings.aws_regions, help="Comma-separated AWS regions to scan concurrently, or 'all' for every enabled region")
     parser.add_argument("--dry-run", action="store_true", default=True, help="Simulate without action")
     parser.add_argument("--no-dry-run", action="store_false", dest="dry_run", help="Enable production kill-switch")
+    parser.add_argument("--platform", default=settings.platforms, help="Comma-separated clouds to scan (aws, azure, gcp); default all")
     parser.add_argument("--simulated", action="store_true", help="Run in mock mode without cloud credentials")
     parser.add_argument("--model", default=settings.llm_provider, choices=["anthropic", "openai", "google", "groq", "claude", "gemini", "llama"], help="AI Model for analysis")
     parser.add_argument("--active-ops", action="store_true", help="Generate and execute remediation bundle")
     parser.add_argument("--auto-approve", action="store_true", help="Bypass manual confirmation prompts (Use with CAUTION)")
     parser.add_argument("--output", help="Path to save JSON report")
     parser.add_argument("--workers", type=int, default=10, help="Parallel worker count")
+    parser.add_argument("--incremental", action="store_true", default=settings.incremental_audit, help="Only re-classify targets whose metadata or metrics changed since the last run")
+    parser.add_argument("--feature-windows", default=settings.feature_windows, help="Comma-separated utilization windows to featurize, e.g. '1h,24h,7d' (requires NumPy)")
+    parser.add_argument("--llm-batch-size", type=int, default=settings.llm_batch_size, help="Instances classified per LLM request (1 disables batching)")
+    parser.add_argument("--async-llm", action="store_true", default=settings.llm_async, help="Classify on the providers' async clients from one event loop (--workers bounds requests in flight)")
+    parser.add_argument("--queue-size", type=int, default=settings.pipeline_queue_size, help="Max targets buffered between discovery and analysis")
     
     args = parser.parse_args()
+    settings.feature_windows = args.feature_windows
+    try:
+        platforms = parse_platforms(args.platform)
+    except ValueError as e:
+        parser.error(str(e))
 
     # Start Prometheus Metrics Server
     try:
@@ -326,7 +749,13 @@ def main():
         model=args.model, 
         simulated=args.simulated,
         auto_approve=args.auto_approve,
-        max_workers=args.workers
+        max_workers=args.workers,
+        queue_size=args.queue_size,
+        incremental=args.incremental,
+        platforms=platforms,
+        llm_batch_size=args.llm_batch_size,
+        async_llm=args.async_llm,
+        regions=[r.strip() for r in args.regions.split(",") if r.strip()] if args.regions else None
     )
     
     # Pass renderer solely for UI output
@@ -368,6 +797,11 @@ def main():
                     "zombie_count": sum(1 for r in safe_results if r['status'] == "ZOMBIE"),
                     "timestamp": datetime.datetime.now(datetime.UTC).isoformat()
                 },
+                "discovery": runner.discovery.scan_report,
+                "tiers": runner.tier_report,
+                **({"kill_switch": runner.stop_report} if runner.stop_report else {}),
+                **({"incremental": runner.incremental_stats} if runner.verdicts else {}),
+                **({"llm_cache": runner.brain.stats()} if isinstance(runner.brain, CachedLLM) else {}),
                 "instances": safe_results
             }, f, indent=2)
         logger.info("JSON Report saved to %s", args.output)
@@ -4,3 +4,13 @@ from pathlib import Path
 # Add the project root to the Python path for test discovery
 root = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(root))
+
+import pytest
+
+@pytest.fixture(autouse=True)
+def reset_adapter_registry():
+    # Registered adapters and pooled clients would otherwise leak mocks between tests
+    from src.adapters import AdapterRegistry
+    AdapterRegistry.clear()
+    yield
+    AdapterRegistry.clear()
@@ -46,6 +46,7 @@ def test_runner_continues_if_at_least_one_adapter_works():
         good_adapter = MagicMock()
         good_adapter.verify_connection.return_value = True
         good_adapter.scan.return_value = [{'id': 'ok-1', 'platform': 'TEST', 'status': 'ACTIVE', 'metrics': {}, 'metadata': {}}]
+        good_adapter.scan_iter.side_effect = lambda: iter(good_adapter.scan())
         
         bad_adapter = MagicMock()
         bad_adapter.verify_connection.return_value = False
@@ -1,7 +1,11 @@
 import pytest
 from unittest.mock import MagicMock, patch
+from botocore.exceptions import ClientError
 from src.adapters.aws import AWSAdapter
 
+def client_error(code: str, operation: str = "GetMetricData") -> ClientError:
+    return ClientError({"Error": {"Code": code, "Message": code}}, operation)
+
 @pytest.fixture
 def mock_boto3_clients():
     with patch('boto3.client') as mock_client:
@@ -78,3 +82,254 @@ def test_aws_stop_instance(mock_boto3_clients):
     adapter = AWSAdapter()
     adapter.stop_instance("i-123")
     ec2.stop_instances.assert_called_once_with(InstanceIds=["i-123"])
+
+def test_aws_bulk_stop_chunks_ids_and_polls_states(mock_boto3_clients):
+    ec2, _, _ = mock_boto3_clients
+    adapter = AWSAdapter()
+    adapter.MAX_INSTANCE_IDS_PER_CALL = 2
+    ec2.stop_instances.side_effect = [
+        {'StoppingInstances': [{'InstanceId': 'i-1', 'CurrentState': {'Name': 'stopping'}},
+                               {'InstanceId': 'i-2', 'CurrentState': {'Name': 'stopped'}}]},
+        Exception("InvalidInstanceID.NotFound"),
+    ]
+    targets = [{'id': f'i-{n}', 'metadata': {}} for n in (1, 2, 3)]
+
+    assert adapter.stop_instances(targets) == {'i-1': 'stopping', 'i-2': 'stopped', 'i-3': 'failed'}
+    assert ec2.stop_instances.call_args_list[0].kwargs == {'InstanceIds': ['i-1', 'i-2']}
+
+    ec2.describe_instances.return_value = {
+        'Reservations': [{'Instances': [{'InstanceId': 'i-1', 'State': {'Name': 'stopped'}}]}]
+    }
+    assert adapter.stop_states(['i-1']) == {'i-1': 'stopped'}
+    ec2.describe_instances.assert_called_once_with(InstanceIds=['i-1'])
+
+def test_aws_client_pool_reuses_clients_per_region():
+    from src.adapters.aws import AWSClientPool
+    pool = AWSClientPool()
+    with patch('boto3.client') as mock_client:
+        first = pool.client("ec2", "us-east-1")
+        assert pool.client("ec2", "us-east-1") is first
+        pool.client("ec2", "eu-west-1")
+        assert mock_client.call_count == 2
+
+def test_aws_verify_connection_uses_pooled_sts_client(mock_boto3_clients):
+    from src.adapters.aws import AWSAdapter
+    adapter = AWSAdapter(region="us-east-1")
+    with patch('boto3.client') as mock_client:
+        assert adapter.verify_connection() is True
+        assert adapter.verify_connection() is True
+        mock_client.assert_called_once()
+        assert mock_client.call_args.args == ("sts",)
+        assert mock_client.call_args.kwargs["config"].retries == {"max_attempts": 1}
+        mock_client.return_value.get_caller_identity.assert_called()
+
+def test_aws_multi_region_fan_out_shares_pool(mock_boto3_clients, tmp_path):
+    from src.adapters import AdapterRegistry
+    ec2, _, _ = mock_boto3_clients
+    ec2.describe_regions.return_value = {
+        'Regions': [{'RegionName': 'us-west-2'}, {'RegionName': 'eu-west-1'}]
+    }
+
+    with patch('src.adapters.settings.cache_path', str(tmp_path / 'cache.db')):
+        adapters = AdapterRegistry.get_aws_adapters("us-east-1", regions=["all"])
+
+    assert [a.region for a in adapters] == ['eu-west-1', 'us-west-2']
+    assert adapters[0].clients is adapters[1].clients
+    assert adapters[0].attribution_cache is adapters[1].attribution_cache
+    ec2.describe_regions.assert_called_once_with(AllRegions=False)
+
+def test_aws_untagged_fleet_uses_single_attribution_sweep(mock_boto3_clients):
+    ec2, _, ct = mock_boto3_clients
+    instances = [{'InstanceId': f'i-gpu-{n}', 'InstanceType': 'g5.xlarge'} for n in range(6)]
+    ec2.get_paginator.return_value.paginate.return_value = [{'Reservations': [{'Instances': instances}]}]
+
+    ct.get_paginator.return_value.paginate.return_value = [
+        {'Events': [{
+            'EventName': 'RunInstances',
+            'Username': 'alice',
+            'Resources': [{'ResourceType': 'AWS::EC2::Instance', 'ResourceName': f'i-gpu-{n}'} for n in range(3)]
+        }]},
+        {'Events': [{
+            'EventName': 'RunInstances',
+            'Username': 'bob',
+            'CloudTrailEvent': '{"responseElements": {"instancesSet": {"items": [{"instanceId": "i-gpu-3"}]}}}'
+        }]}
+    ]
+
+    adapter = AWSAdapter(region="us-east-1")
+    adapter._get_batch_metrics = MagicMock(return_value={})
+
+    owners = {t['id']: t['owner'] for t in adapter.scan()}
+
+    assert owners == {
+        'i-gpu-0': 'alice', 'i-gpu-1': 'alice', 'i-gpu-2': 'alice',
+        'i-gpu-3': 'bob', 'i-gpu-4': 'Unknown', 'i-gpu-5': 'Unknown'
+    }
+    ct.get_paginator.return_value.paginate.assert_called_once()
+    kwargs = ct.get_paginator.return_value.paginate.call_args.kwargs
+    assert kwargs['LookupAttributes'] == [{'AttributeKey': 'EventName', 'AttributeValue': 'RunInstances'}]
+
+def test_aws_partial_attribution_sweep_falls_back_to_per_instance_lookups(mock_boto3_clients):
+    _, _, ct = mock_boto3_clients
+
+    def sweep():
+        yield {'Events': [{'EventName': 'RunInstances', 'Username': 'alice',
+                           'Resources': [{'ResourceType': 'AWS::EC2::Instance', 'ResourceName': 'i-swept'}]}]}
+        raise RuntimeError("ThrottlingException")
+
+    def paginate(LookupAttributes, **kwargs):
+        if LookupAttributes[0]['AttributeKey'] == 'EventName':
+            return sweep()
+        return [{'Events': [{'EventName': 'RunInstances', 'Username': 'dave'}]}]
+    ct.get_paginator.return_value.paginate.side_effect = paginate
+
+    adapter = AWSAdapter(region="us-east-1")
+    adapter._attribution_index = adapter.build_attribution_index()
+
+    assert adapter._attribution_index_complete is False
+    assert adapter.get_attribution('i-swept', {}) == 'alice'
+    # Not reached by the interrupted sweep, so it is looked up on its own
+    assert adapter.get_attribution('i-missed', {}) == 'dave'
+
+def test_aws_attribution_cache_skips_cloudtrail(mock_boto3_clients, tmp_path):
+    from src.core.cache import PersistentCache
+    _, _, ct = mock_boto3_clients
+    paginate = ct.get_paginator.return_value.paginate
+    paginate.return_value = [{'Events': [{'EventName': 'RunInstances', 'Username': 'carol'}]}]
+    cache = PersistentCache(str(tmp_path / 'cache.db'), namespace='attribution.aws')
+
+    first = AWSAdapter(region="us-east-1", attribution_cache=cache)
+    assert first.get_attribution('i-cached', {}) == 'carol'
+
+    # A later run resolves the same instance from disk without touching CloudTrail
+    paginate.reset_mock()
+    second = AWSAdapter(region="us-east-1", attribution_cache=cache)
+    assert second.get_attribution('i-cached', {}) == 'carol'
+    paginate.assert_not_called()
+
+def test_aws_scan_attaches_window_features(mock_boto3_clients):
+    pytest.importorskip("numpy")
+    import datetime
+    ec2, cw, _ = mock_boto3_clients
+    ec2.get_paginator.return_value.paginate.return_value = [{'Reservations': [{'Instances': [
+        {'InstanceId': 'i-gpu', 'InstanceType': 'g5.xlarge', 'Tags': [{'Key': 'Owner', 'Value': 'alice'}]}
+    ]}]}]
+    now = datetime.datetime.now(datetime.UTC)
+    stamps = [now - datetime.timedelta(minutes=5 * n) for n in range(1, 13)]
+    cw.get_paginator.return_value.paginate.return_value = [{'MetricDataResults': [
+        {'Id': 'cpu_0', 'Timestamps': stamps, 'Values': [2.0] * 12},
+        {'Id': 'net_0', 'Timestamps': stamps, 'Values': [1024.0] * 12},
+    ]}]
+
+    adapter = AWSAdapter(region="us-east-1")
+    adapter._get_batch_metrics = MagicMock(return_value={'i-gpu': {'max_cpu': 2.0, 'network_in': 0.0}})
+    with patch('src.core.settings.settings.feature_windows', '1h'):
+        target = adapter.scan()[0]
+
+    cpu = target['metrics']['windows']['1h']['cpu']
+    assert cpu['max'] == 2.0
+    assert cpu['idle_fraction'] == 1.0
+    query = cw.get_paginator.return_value.paginate.call_args.kwargs['MetricDataQueries'][0]
+    assert query['MetricStat']['Period'] == 300
+
+def test_aws_window_series_only_fetch_delta_from_store(mock_boto3_clients, tmp_path):
+    pytest.importorskip("numpy")
+    from src.core.series_store import SeriesStore
+    store = SeriesStore(str(tmp_path), capacity=12, period=300)
+    adapter = AWSAdapter(region="us-east-1", series_store=store)
+    now = 1_700_000_100.0
+    history = [now - 300 * n for n in range(12, 0, -1)]
+    adapter.get_metric_series = MagicMock(side_effect=[
+        {'i-gpu': {'cpu': (history, [3.0] * 12)}},
+        {'i-gpu': {'cpu': ([now - 300], [4.0])}},
+    ])
+
+    first = adapter._stored_metric_series(['i-gpu'], now - 3600, now, 300)
+    assert first['i-gpu']['cpu'][1].tolist() == [3.0] * 12
+
+    second = adapter._stored_metric_series(['i-gpu'], now - 3600 + 300, now + 300, 300)
+    # Second run resumes at the last stored period instead of re-reading the hour
+    assert adapter.get_metric_series.call_args_list[1].args[1] == now - 300
+    assert second['i-gpu']['cpu'][1].tolist() == [3.0] * 10 + [4.0]
+
+def test_aws_batch_metrics_follow_next_token_and_split_batches(mock_boto3_clients):
+    _, cw, _ = mock_boto3_clients
+    ids = [f'i-{n}' for n in range(300)]
+
+    def get_metric_data(MetricDataQueries, **kwargs):
+        if MetricDataQueries[0]['Id'] == 'gpu':
+            return {'MetricDataResults': [{'Id': 'gpu', 'Label': 'i-299', 'Values': [87.0, 12.0]}]}
+        batch_ids = [q['MetricStat']['Metric']['Dimensions'][0]['Value'] for q in MetricDataQueries[::2]]
+        if 'NextToken' not in kwargs:
+            # First page: CPU only, more to come
+            return {'MetricDataResults': [{'Id': f'm0_{i}', 'Values': [4.0]} for i in range(len(batch_ids))],
+                    'NextToken': 'page-2'}
+        return {'MetricDataResults': [{'Id': f'm1_{i}', 'Values': [2 * 1024 * 1024]} for i in range(len(batch_ids))]}
+
+    cw.get_metric_data.side_effect = get_metric_data
+    adapter = AWSAdapter(region="us-east-1")
+    results = adapter._get_batch_metrics(ids)
+
+    assert results['i-0'] == {'max_cpu': 4.0, 'network_in': 2.0}
+    assert results['i-299'] == {'max_cpu': 4.0, 'network_in': 2.0, 'max_gpu': 87.0}
+    # 300 instances x 2 queries -> 2 batches of <= 500 queries, 2 pages each, plus the GPU query
+    assert cw.get_metric_data.call_count == 5
+    assert all(len(c.kwargs['MetricDataQueries']) <= 500 for c in cw.get_metric_data.call_args_list)
+    assert adapter.scan_stats['metric_batches'] == 3
+
+def test_aws_failed_metric_fetch_is_not_ruled_idle(mock_boto3_clients):
+    from src.core.rules import RuleTier
+    _, cw, _ = mock_boto3_clients
+
+    def get_metric_data(MetricDataQueries, **kwargs):
+        # CPU comes back for the first instance only, then the network page stays throttled
+        if 'NextToken' not in kwargs:
+            return {'MetricDataResults': [{'Id': 'm0_0', 'Values': [0.2]}], 'NextToken': 'page-2'}
+        raise client_error("ThrottlingException")
+
+    cw.get_metric_data.side_effect = get_metric_data
+    adapter = AWSAdapter(region="us-east-1")
+    # The limiter retries the throttled page until its retries run out
+    with patch.object(adapter._limiter(adapter.METRICS_POOL), "backoff", 0):
+        results = adapter._get_batch_metrics(['i-partial', 'i-missing'])
+    # First page plus the throttled page's attempts, for the metric batch and the GPU query alike
+    assert cw.get_metric_data.call_count == 2 * (1 + 4)
+
+    assert results['i-partial']['metrics_observed'] is False
+    assert results['i-missing'] == {'max_cpu': 0.0, 'network_in': 0.0, 'metrics_observed': False}
+    rules = RuleTier()
+    assert rules.classify(results['i-partial']) is None
+    assert rules.classify(results['i-missing']) is None
+
+def test_aws_gpu_query_runs_once_per_scan_and_flags_unaccounted_instances(mock_boto3_clients):
+    ec2, cw, _ = mock_boto3_clients
+    gpu_results = [{'Id': 'gpu', 'Label': f'i-{n}', 'Values': [90.0 - n * 0.1]} for n in range(500)]
+
+    def get_metric_data(MetricDataQueries, **kwargs):
+        if MetricDataQueries[0]['Id'] == 'gpu':
+            return {'MetricDataResults': gpu_results}
+        return {'MetricDataResults': [{'Id': q['Id'], 'Values': [50.0]} for q in MetricDataQueries]}
+
+    cw.get_metric_data.side_effect = get_metric_data
+    adapter = AWSAdapter(region="us-east-1")
+    first = adapter._get_batch_metrics(['i-0', 'i-1'])
+    second = adapter._get_batch_metrics(['i-2', 'i-999'])
+
+    gpu_calls = [c for c in cw.get_metric_data.call_args_list if c.kwargs['MetricDataQueries'][0]['Id'] == 'gpu']
+    assert len(gpu_calls) == 1
+    assert gpu_calls[0].kwargs['MetricDataQueries'][0]['Expression'].endswith("ORDER BY MAX() DESC LIMIT 500")
+    assert first['i-0'] == {'max_cpu': 50.0, 'network_in': 50.0 / (1024 * 1024), 'max_gpu': 90.0}
+    assert second['i-2']['max_gpu'] == 89.8 and 'metrics_observed' not in second['i-2']
+    # Truncated at 500 series: an instance outside the top 500 may still be running a busy GPU
+    assert second['i-999']['metrics_observed'] is False
+
+    # A new scan re-runs the query; a failure leaves GPU peaks unknown rather than missing
+    def gpu_denied(MetricDataQueries, **kwargs):
+        if MetricDataQueries[0]['Id'] == 'gpu':
+            raise client_error("AccessDeniedException")
+        return get_metric_data(MetricDataQueries, **kwargs)
+
+    cw.get_metric_data.side_effect = gpu_denied
+    ec2.get_paginator.return_value.paginate.return_value = []
+    list(adapter.iter_inventory())
+    assert adapter._get_batch_metrics(['i-0'])['i-0']['metrics_observed'] is False
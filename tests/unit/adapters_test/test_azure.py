@@ -1,6 +1,12 @@
 from unittest.mock import MagicMock, patch
 from src.adapters.azure import AzureAdapter
 
+def _resource_id_dimension(resource_id):
+    dimension = MagicMock()
+    dimension.name.value = "Microsoft.ResourceId"
+    dimension.value = resource_id
+    return dimension
+
 @patch("src.adapters.azure.DefaultAzureCredential")
 @patch("src.adapters.azure.ComputeManagementClient")
 @patch("src.adapters.azure.MonitorManagementClient")
@@ -9,7 +15,7 @@ def test_azure_scan_with_mocks(mock_monitor_class, mock_compute_class, mock_cred
     mock_compute = mock_compute_class.return_value
     mock_monitor = mock_monitor_class.return_value
     
-    adapter = AzureAdapter(subscription_id="test-sub")
+    adapter = AzureAdapter(subscription_id="test-sub", inventory_backend="compute")
     
     # Mock VM list
     mock_vm = MagicMock()
@@ -21,17 +27,114 @@ def test_azure_scan_with_mocks(mock_monitor_class, mock_compute_class, mock_cred
     
     mock_compute.virtual_machines.list_all.return_value = [mock_vm]
     
-    # Mock Metrics
+    # Mock Metrics (multi-resource query, split by resource ID)
     mock_metric = MagicMock()
     mock_metric.maximum = 2.5
     mock_timeserie = MagicMock()
     mock_timeserie.data = [mock_metric]
+    mock_timeserie.metadatavalues = [_resource_id_dimension(mock_vm.id)]
     mock_item = MagicMock()
+    mock_item.name.value = "Percentage CPU"
     mock_item.timeseries = [mock_timeserie]
-    mock_monitor.metrics.list.return_value.value = [mock_item]
+    mock_monitor.metrics.list_at_subscription_scope.return_value.value = [mock_item]
     
     targets = adapter.scan()
     
     assert len(targets) == 1
     assert targets[0]['id'] == "vm-gpu-01"
     assert targets[0]['metrics']['max_cpu'] == 2.5
+
+@patch("src.adapters.azure.DefaultAzureCredential")
+@patch("src.adapters.azure.ComputeManagementClient")
+@patch("src.adapters.azure.MonitorManagementClient")
+def test_azure_batch_metrics_one_request_per_region_chunk(mock_monitor_class, mock_compute_class, mock_cred_class):
+    mock_monitor = mock_monitor_class.return_value
+    adapter = AzureAdapter(subscription_id="test-sub")
+    adapter.METRICS_BATCH_SIZE = 2
+
+    ids = [f"/subscriptions/s/resourceGroups/rg/providers/Microsoft.Compute/virtualMachines/vm{n}" for n in range(3)]
+
+    def series(resource_id, maximum=None, total=None):
+        point = MagicMock()
+        point.maximum = maximum
+        point.total = total
+        ts = MagicMock()
+        ts.data = [point]
+        # Azure Monitor may echo resource IDs back lower-cased
+        ts.metadatavalues = [_resource_id_dimension(resource_id.lower())]
+        return ts
+
+    def metric(name, timeseries):
+        item = MagicMock()
+        item.name.value = name
+        item.timeseries = timeseries
+        return item
+
+    mock_monitor.metrics.list_at_subscription_scope.return_value.value = [
+        metric("Percentage CPU", [series(ids[0], maximum=3.0), series(ids[1], maximum=80.0)]),
+        metric("Network In Total", [series(ids[0], total=5 * 1024 * 1024)]),
+    ]
+
+    results = adapter._get_batch_metrics({"eastus": ids})
+
+    assert mock_monitor.metrics.list_at_subscription_scope.call_count == 2
+    assert results[ids[0]] == {"max_cpu": 3.0, "network_in": 5.0}
+    assert results[ids[1]]["max_cpu"] == 80.0
+    first_call = mock_monitor.metrics.list_at_subscription_scope.call_args_list[0]
+    assert first_call.args[0] == "eastus"
+    assert first_call.kwargs["top"] == 2
+
+@patch("src.adapters.azure.DefaultAzureCredential")
+@patch("src.adapters.azure.ComputeManagementClient")
+@patch("src.adapters.azure.MonitorManagementClient")
+def test_azure_resource_graph_inventory(mock_monitor_class, mock_compute_class, mock_cred_class):
+    mock_graph_mod = MagicMock()
+    graph = mock_graph_mod.ResourceGraphClient.return_value
+    page_one = MagicMock(skip_token="next", data=[{
+        "id": "/subscriptions/sub-a/resourceGroups/rg/providers/Microsoft.Compute/virtualMachines/vm-a",
+        "name": "vm-a", "location": "eastus", "subscriptionId": "sub-a", "vmSize": "Standard_NC6", "tags": None
+    }])
+    page_two = MagicMock(skip_token=None, data=[{
+        "id": "/subscriptions/sub-b/resourceGroups/rg/providers/Microsoft.Compute/virtualMachines/vm-b",
+        "name": "vm-b", "location": "westus", "subscriptionId": "sub-b", "vmSize": "Standard_ND40", "tags": {"team": "ml"}
+    }])
+    graph.resources.side_effect = [page_one, page_two]
+
+    with patch.dict("sys.modules", {
+        "azure.mgmt.resourcegraph": mock_graph_mod,
+        "azure.mgmt.resourcegraph.models": mock_graph_mod.models,
+    }):
+        adapter = AzureAdapter(subscription_id="sub-a", subscription_ids=["sub-b"], inventory_backend="resource_graph")
+        vms = adapter._list_gpu_vms()
+
+    assert [vm["name"] for vm in vms] == ["vm-a", "vm-b"]
+    assert vms[1]["subscription_id"] == "sub-b"
+    mock_compute_class.return_value.virtual_machines.list_all.assert_not_called()
+
+    request_kwargs = mock_graph_mod.models.QueryRequest.call_args.kwargs
+    assert request_kwargs["subscriptions"] == ["sub-a", "sub-b"]
+    assert "PowerState/running" in request_kwargs["query"]
+    assert "contains_cs 'NC'" in request_kwargs["query"]
+
+@patch("src.adapters.azure.DefaultAzureCredential")
+@patch("src.adapters.azure.ComputeManagementClient")
+@patch("src.adapters.azure.MonitorManagementClient")
+def test_azure_bulk_deallocate_tracks_pollers(mock_monitor_class, mock_compute_class, mock_cred_class):
+    mock_compute = mock_compute_class.return_value
+    adapter = AzureAdapter(subscription_id="sub-a", inventory_backend="compute")
+    running, failing = MagicMock(), MagicMock()
+    running.done.side_effect = [False, True]
+    failing.done.return_value = True
+    failing.result.side_effect = RuntimeError("conflict")
+    # Stops are issued concurrently, so pollers are matched by VM name
+    pollers = {"vm-1": running, "vm-2": failing}
+    mock_compute.virtual_machines.begin_deallocate.side_effect = lambda rg, name: pollers[name]
+    rid = "/subscriptions/sub-a/resourceGroups/rg/providers/Microsoft.Compute/virtualMachines/{}"
+    targets = [{'id': name, 'metadata': {'resource_id': rid.format(name)}} for name in ("vm-1", "vm-2")]
+    targets.append({'id': 'vm-3', 'metadata': {}})
+
+    states = adapter.stop_instances(targets)
+
+    assert states == {'vm-1': 'stopping', 'vm-2': 'stopping', 'vm-3': 'failed'}
+    assert adapter.stop_states(['vm-1', 'vm-2']) == {'vm-1': 'stopping', 'vm-2': 'failed'}
+    assert adapter.stop_states(['vm-1']) == {'vm-1': 'stopped'}
@@ -0,0 +1,68 @@
+from src.adapters.base import AbstractAdapter, PagedInventoryAdapter
+
+class _SingleCallAdapter(PagedInventoryAdapter):
+    """Implements only the per-instance calls plus a paged inventory."""
+    def __init__(self, pages):
+        self.pages = pages
+        self.metric_calls = []
+
+    def iter_inventory(self):
+        yield from self.pages
+
+    def build_target(self, instance_id, record, metrics, owner):
+        return {"id": instance_id, "type": record["type"], "metrics": metrics, "owner": owner}
+
+    def scan(self):
+        return list(self.scan_iter())
+
+    def get_metrics(self, instance_id, **kwargs):
+        self.metric_calls.append(instance_id)
+        if instance_id == "broken":
+            raise RuntimeError("boom")
+        return {"max_cpu": 1.0, "network_in": 0.0}
+
+    def get_attribution(self, instance_id, metadata=None, **kwargs):
+        return metadata["owner"]
+
+    def stop_instance(self, instance_id, metadata):
+        pass
+
+    def verify_connection(self):
+        return True
+
+def test_batch_defaults_fan_out_single_calls():
+    adapter = _SingleCallAdapter([])
+    metrics = adapter.get_metrics_batch(["a", "broken"])
+    assert metrics == {"a": {"max_cpu": 1.0, "network_in": 0.0}, "broken": {"max_cpu": 0.0, "network_in": 0.0, "metrics_observed": False}}
+
+    owners = adapter.get_attribution_batch(["a"], records={"a": {"owner": "alice"}})
+    assert owners == {"a": "alice"}
+
+def test_scan_iter_runs_batch_pipeline_per_page():
+    pages = [
+        {"a": {"type": "g5", "owner": "alice"}},
+        {},
+        {"b": {"type": "p4", "owner": "bob"}, "c": {"type": "p5", "owner": "carol"}},
+    ]
+    targets = list(_SingleCallAdapter(pages).scan_iter())
+    assert [(t["id"], t["owner"]) for t in targets] == [("a", "alice"), ("b", "bob"), ("c", "carol")]
+    assert targets[0]["metrics"]["max_cpu"] == 1.0
+
+def test_scan_iter_falls_back_to_scan_without_paged_inventory():
+    class _ScanOnlyAdapter(AbstractAdapter):
+        def scan(self):
+            return [{"id": "a"}]
+
+        def get_metrics(self, instance_id, **kwargs):
+            raise AssertionError("scan() already carries metrics")
+
+        def get_attribution(self, instance_id, metadata=None, **kwargs):
+            raise AssertionError("scan() already carries owners")
+
+        def stop_instance(self, instance_id, metadata):
+            pass
+
+        def verify_connection(self):
+            return True
+
+    assert list(_ScanOnlyAdapter().scan_iter()) == [{"id": "a"}]
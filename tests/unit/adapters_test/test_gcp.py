@@ -1,6 +1,14 @@
 from unittest.mock import MagicMock, patch
 from src.adapters.gcp import GCPAdapter
 
+def _build_adapter():
+    # Patch both the module cache and the package attribute, so the mock wins even
+    # after another test has imported the real google.cloud.logging_v2
+    mock_logging_mod = MagicMock()
+    with patch.dict("sys.modules", {"google.cloud.logging_v2": mock_logging_mod}), \
+         patch("google.cloud.logging_v2", mock_logging_mod, create=True):
+        return GCPAdapter(project_id="test-project")
+
 @patch("src.adapters.gcp.compute_v1.InstancesClient")
 @patch("src.adapters.gcp.monitoring_v3.MetricServiceClient")
 def test_gcp_scan_with_mocks(mock_monitor_class, mock_compute_class):
@@ -32,6 +40,7 @@ def test_gcp_scan_with_mocks(mock_monitor_class, mock_compute_class):
     mock_point = MagicMock()
     mock_point.value.double_value = 0.05
     mock_ts = MagicMock()
+    mock_ts.resource.labels = {"instance_id": "123456789"}
     mock_ts.points = [mock_point]
     mock_monitor.list_time_series.return_value = [mock_ts]
     
@@ -48,3 +57,82 @@ def test_gcp_auth_error(mock_compute_class):
     
     adapter = GCPAdapter(project_id="test-project")
     assert adapter.simulated is True
+
+@patch("src.adapters.gcp.compute_v1.InstancesClient")
+@patch("src.adapters.gcp.monitoring_v3.MetricServiceClient")
+def test_gcp_batch_metrics_one_query_per_metric(mock_monitor_class, mock_compute_class):
+    mock_monitor = mock_monitor_class.return_value
+    adapter = _build_adapter()
+
+    def series(instance_id, double_value=0.0, int64_value=0):
+        point = MagicMock()
+        point.value.double_value = double_value
+        point.value.int64_value = int64_value
+        ts = MagicMock()
+        ts.resource.labels = {"instance_id": instance_id}
+        ts.points = [point]
+        return ts
+
+    def list_time_series(request):
+        if "cpu/utilization" in request["filter"]:
+            return [series("1", double_value=0.02), series("2", double_value=0.9), series("999", double_value=1.0)]
+        return [series("1", int64_value=2 * 1024 * 1024)]
+
+    mock_monitor.list_time_series.side_effect = list_time_series
+
+    results = adapter._get_batch_metrics(["1", "2", "3"])
+
+    assert mock_monitor.list_time_series.call_count == 2
+    assert results["1"] == {"max_cpu": 2.0, "network_in": 2.0}
+    assert results["2"]["max_cpu"] == 90.0
+    # No points for instance 3: zeros flagged as unobserved, and instance 2 lacks network
+    assert results["3"] == {"max_cpu": 0.0, "network_in": 0.0, "metrics_observed": False}
+    assert results["2"]["metrics_observed"] is False
+    assert "999" not in results
+
+@patch("src.adapters.gcp.compute_v1.InstancesClient")
+@patch("src.adapters.gcp.monitoring_v3.MetricServiceClient")
+def test_gcp_listing_is_filtered_and_field_masked(mock_monitor_class, mock_compute_class):
+    mock_compute = mock_compute_class.return_value
+    adapter = _build_adapter()
+
+    gpu = MagicMock(machine_type="zones/z/machineTypes/a2-highgpu-1g", status="RUNNING", guest_accelerators=[])
+    cpu = MagicMock(machine_type="zones/z/machineTypes/e2-medium", status="RUNNING", guest_accelerators=[])
+    mock_compute.aggregated_list.return_value = [("zones/us-central1-a", MagicMock(instances=[gpu, cpu]))]
+
+    instances = adapter._list_gpu_instances()
+
+    assert instances == [(gpu, "us-central1-a")]
+    call = mock_compute.aggregated_list.call_args
+    assert call.kwargs["request"].filter == 'status = "RUNNING"'
+    assert ("x-goog-fieldmask", GCPAdapter.INSTANCE_FIELD_MASK) in call.kwargs["metadata"]
+    assert adapter.scan_stats["listed_instances"] == 2
+    assert adapter.scan_stats["gpu_candidates"] == 1
+
+@patch("src.adapters.gcp.compute_v1.InstancesClient")
+@patch("src.adapters.gcp.monitoring_v3.MetricServiceClient")
+def test_gcp_batch_attribution_chunks_and_caches(mock_monitor_class, mock_compute_class):
+    adapter = _build_adapter()
+    adapter.ATTRIBUTION_CHUNK_SIZE = 2
+
+    def entry(instance_id, principal):
+        e = MagicMock()
+        e.resource.labels = {"instance_id": instance_id}
+        e.payload = {"authenticationInfo": {"principalEmail": principal}}
+        return e
+
+    adapter.logging_client.list_entries.side_effect = [
+        [entry("1", "alice@example.com"), entry("2", "bob@example.com")],
+        [],
+    ]
+
+    owners = adapter._resolve_attribution_batch(["1", "2", "3"])
+
+    assert owners == {"1": "alice@example.com", "2": "bob@example.com", "3": "Unknown"}
+    assert adapter.logging_client.list_entries.call_count == 2
+    first_filter = adapter.logging_client.list_entries.call_args_list[0].kwargs["filter_"]
+    assert 'resource.labels.instance_id=("1" OR "2")' in first_filter
+
+    # Resolved creators are served from the cache without another query
+    assert adapter.get_attribution("1") == "alice@example.com"
+    assert adapter.logging_client.list_entries.call_count == 2
@@ -0,0 +1,45 @@
+import itertools
+import time
+from unittest.mock import patch
+
+from src.core.cache import PersistentCache
+
+def test_set_get_roundtrip(tmp_path):
+    cache = PersistentCache(str(tmp_path / "cache.db"), namespace="attribution.aws")
+    cache.set("i-123", "alice")
+    assert cache.get("i-123") == "alice"
+    assert cache.get("i-missing") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+def test_entries_survive_reopen(tmp_path):
+    path = str(tmp_path / "cache.db")
+    first = PersistentCache(path, namespace="attribution.aws")
+    first.set("i-123", "alice")
+    first.close()
+
+    second = PersistentCache(path, namespace="attribution.aws")
+    assert second.get("i-123") == "alice"
+    # Namespaces are isolated
+    assert PersistentCache(path, namespace="attribution.gcp").get("i-123") is None
+
+def test_ttl_expiry(tmp_path):
+    cache = PersistentCache(str(tmp_path / "cache.db"), namespace="ns", ttl_seconds=60)
+    cache.set("k", {"owner": "bob"})
+    assert cache.has("k")
+
+    with patch("src.core.cache.time.time", return_value=time.time() + 120):
+        assert not cache.has("k")
+        assert cache.get("k") is None
+    assert cache.stats()["entries"] == 0
+
+def test_lru_eviction(tmp_path):
+    cache = PersistentCache(str(tmp_path / "cache.db"), namespace="ns", max_entries=2)
+    with patch("src.core.cache.time.time", side_effect=itertools.count(1)):
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")      # touch a, b becomes least recently used
+        cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
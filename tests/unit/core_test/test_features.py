@@ -0,0 +1,51 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.core.features import align_series, fleet_features, parse_windows, window_features
+
+END = 1_700_000_100.0  # arbitrary period boundary
+PERIOD = 300
+
+def _points(values):
+    """Period-start timestamps for values ending at END, oldest first."""
+    n = len(values)
+    return ([END - (n - i) * PERIOD for i in range(n)], values)
+
+def test_parse_windows():
+    assert parse_windows("1h, 24h,7d") == {"1h": 3600, "24h": 86400, "7d": 604800}
+    assert parse_windows(None) == {}
+    with pytest.raises(ValueError):
+        parse_windows("1week")
+
+def test_align_series_places_points_and_leaves_gaps():
+    ids, matrix = align_series({"a": _points([1.0, 2.0]), "b": ([END - 4 * PERIOD], [7.0])}, END, 4)
+    assert ids == ["a", "b"]
+    assert matrix[0, -2:].tolist() == [1.0, 2.0]
+    assert np.isnan(matrix[0, :2]).all()
+    assert matrix[1, 0] == 7.0
+
+def test_window_features_match_reference_statistics():
+    rng = np.random.default_rng(7)
+    matrix = rng.random((20, 50)) * 20
+    matrix[matrix < 3] = np.nan
+    feats = window_features(matrix, idle_threshold=5.0)
+
+    assert np.allclose(feats["p50"], np.nanpercentile(matrix, 50, axis=1))
+    assert np.allclose(feats["p95"], np.nanpercentile(matrix, 95, axis=1))
+    assert np.allclose(feats["max"], np.nanmax(matrix, axis=1))
+    valid = ~np.isnan(matrix)
+    assert np.allclose(feats["idle_fraction"], ((matrix < 5.0) & valid).sum(axis=1) / valid.sum(axis=1))
+
+def test_fleet_features_per_window():
+    idle = [1.0] * 12
+    ramp = [float(v) for v in range(0, 120, 10)]
+    out = fleet_features({"idle": {"cpu": _points(idle)}, "busy": {"cpu": _points(ramp)}},
+                         parse_windows("1h,24h"), END, PERIOD)
+
+    assert out["idle"]["1h"]["cpu"]["idle_fraction"] == 1.0
+    assert out["idle"]["1h"]["cpu"]["duty_cycle"] == 0.0
+    assert out["busy"]["1h"]["cpu"]["max"] == 110.0
+    assert out["busy"]["1h"]["cpu"]["trend"] == pytest.approx(10.0 * 288)  # +10 per 5-minute sample
+    assert out["busy"]["24h"]["cpu"]["coverage"] == pytest.approx(12 / 288, abs=1e-4)
+    assert "network_in" not in out["idle"]["1h"]
@@ -0,0 +1,32 @@
+from src.core.fingerprint import bucket_metrics, fingerprint_target
+
+def _target(**metrics):
+    return {
+        "platform": "AWS", "id": "i-123", "type": "p4d.24xlarge", "owner": "alice",
+        "metadata": {"InstanceId": "i-123"}, "metrics": metrics,
+    }
+
+def test_bucket_metrics_absorbs_jitter():
+    assert bucket_metrics({"max_cpu": 1.2, "network_in": 0.04}) == bucket_metrics({"max_cpu": 3.9, "network_in": 0.6})
+    assert bucket_metrics({"max_cpu": 1.2}) != bucket_metrics({"max_cpu": 42.0})
+
+def test_fingerprint_is_stable_and_change_sensitive():
+    base = fingerprint_target(_target(max_cpu=0.5, network_in=0.01))
+    assert base == fingerprint_target(_target(max_cpu=0.7, network_in=0.02))
+    assert base != fingerprint_target(_target(max_cpu=80.0, network_in=0.01))
+
+    retyped = _target(max_cpu=0.5, network_in=0.01)
+    retyped["type"] = "g5.xlarge"
+    assert base != fingerprint_target(retyped)
+
+def test_gpu_and_window_features_are_bucketed_coarsely():
+    def windowed(gpu, p95, idle, trend, coverage):
+        return _target(max_cpu=0.5, network_in=0.01, max_gpu=gpu, windows={"24h": {"cpu": {
+            "p50": 0.4, "p95": p95, "max": 3.1, "idle_fraction": idle, "duty_cycle": 0.0,
+            "trend": trend, "coverage": coverage}}})
+
+    base = fingerprint_target(windowed(gpu=1.2, p95=1.8, idle=0.97, trend=0.0132, coverage=0.9931))
+    # Run-to-run drift in GPU, percentiles, trend and coverage keeps the fingerprint
+    assert base == fingerprint_target(windowed(gpu=3.7, p95=2.6, idle=0.93, trend=-0.0415, coverage=0.9965))
+    assert base != fingerprint_target(windowed(gpu=60.0, p95=1.8, idle=0.97, trend=0.0132, coverage=0.9931))
+    assert base != fingerprint_target(windowed(gpu=1.2, p95=1.8, idle=0.42, trend=0.0132, coverage=0.9931))
@@ -0,0 +1,153 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.core.limiter import AdaptiveLimiter, is_throttle
+from src.core.scheduler import Scheduler
+
+class ThrottlingError(Exception):
+    pass
+
+def client_error(code):
+    error = Exception(code)
+    error.response = {"Error": {"Code": code}}
+    return error
+
+def test_is_throttle_recognizes_sdk_signals():
+    assert is_throttle(client_error("ThrottlingException"))
+    assert is_throttle(ThrottlingError())
+    rate_limited = Exception("429")
+    rate_limited.status_code = 429
+    assert is_throttle(rate_limited)
+    assert not is_throttle(client_error("AccessDenied"))
+    assert not is_throttle(ValueError("bad input"))
+
+def test_throttle_halves_limit_once_per_congestion_event():
+    limiter = AdaptiveLimiter("test", max_limit=8)
+    first = limiter._acquire()
+    second = limiter._acquire()
+
+    limiter._release(first, throttled=True)
+    # Started before the decrease: part of the same event, no second cut
+    limiter._release(second, throttled=True)
+    assert limiter.limit == 4
+
+    limiter._release(limiter._acquire(), throttled=True)
+    assert limiter.limit == 2
+
+def test_success_grows_limit_additively_up_to_max():
+    limiter = AdaptiveLimiter("test", max_limit=4)
+    limiter.limit = 2.0
+    for _ in range(2):
+        limiter._release(limiter._acquire(), throttled=False)
+    assert limiter.limit == pytest.approx(2.9, abs=0.05)
+
+    for _ in range(50):
+        limiter._release(limiter._acquire(), throttled=False)
+    assert limiter.limit == 4
+
+def test_set_max_raises_an_idle_limit_and_keeps_a_backed_off_one():
+    limiter = AdaptiveLimiter("test", max_limit=10)
+    limiter.set_max(300)
+    assert limiter.limit == 300
+
+    limiter.limit = 20.0
+    limiter.set_max(500)
+    assert limiter.limit == 20
+    limiter.set_max(8)
+    assert limiter.limit == 8
+
+def test_call_retries_throttles_and_raises_other_errors():
+    limiter = AdaptiveLimiter("test", max_limit=4, backoff=0)
+    fn = MagicMock(side_effect=[client_error("Throttling"), client_error("Throttling"), "ok"])
+    assert limiter.call(fn, 1) == "ok"
+    assert fn.call_count == 3
+    # 4 -> 2 -> 1 on the throttles, +1 on the final success
+    assert limiter.limit == 2
+
+    failing = MagicMock(side_effect=ValueError("boom"))
+    with pytest.raises(ValueError):
+        limiter.call(failing)
+    assert failing.call_count == 1
+    assert limiter.in_flight == 0
+
+def test_acall_shares_limit_with_sync_callers_and_retries_throttles():
+    import asyncio
+    limiter = AdaptiveLimiter("test", max_limit=2, backoff=0)
+    peak = [0]
+
+    async def request(result):
+        peak[0] = max(peak[0], limiter.in_flight)
+        await asyncio.sleep(0.01)
+        return result
+
+    async def run():
+        with limiter.slot():
+            # One slot is held synchronously, so only one coroutine can be in flight at a time
+            results = await asyncio.gather(*(limiter.acall(request, n) for n in range(4)))
+        flaky = MagicMock(side_effect=[client_error("Throttling"), "ok"])
+
+        async def throttled_once():
+            return flaky()
+        return results, await limiter.acall(throttled_once)
+
+    results, retried = asyncio.run(run())
+    assert results == [0, 1, 2, 3] and retried == "ok"
+    assert peak[0] == 2
+    assert limiter.in_flight == 0
+
+def test_async_waiters_park_until_a_slot_frees():
+    import asyncio
+    limiter = AdaptiveLimiter("test", max_limit=1)
+    finish = None
+    started = []
+
+    async def request(n):
+        async with limiter.aslot():
+            started.append(n)
+            await finish.wait()
+
+    async def run():
+        nonlocal finish
+        finish = asyncio.Event()
+        held = limiter._acquire()
+        tasks = [asyncio.create_task(request(n)) for n in range(3)]
+        await asyncio.sleep(0.05)
+        # Waiters sit on futures rather than polling, one per blocked coroutine
+        assert started == [] and len(limiter._async_waiters) == 3
+
+        # A cancelled waiter hands its wake-up to the next one
+        tasks[0].cancel()
+        limiter.set_max(2)
+        await asyncio.sleep(0.01)
+        assert started == [1]
+
+        threading.Thread(target=limiter._release, args=(held, False)).start()
+        await asyncio.sleep(0.05)
+        assert started == [1, 2]
+        finish.set()
+        await asyncio.gather(*tasks[1:])
+        return tasks[0].cancelled()
+
+    assert asyncio.run(run()) is True
+    assert started == [1, 2] and limiter.in_flight == 0 and not limiter._async_waiters
+
+def test_token_bucket_paces_request_starts():
+    limiter = AdaptiveLimiter("test", max_limit=10, rate=50, burst=1)
+    started = time.monotonic()
+    for _ in range(6):
+        limiter.call(lambda: None)
+    # One burst token, then 5 more at 50/s
+    assert time.monotonic() - started >= 0.09
+
+def test_scheduler_limiters_follow_pool_limits_and_rates():
+    scheduler = Scheduler({"cloudtrail": 3}, {"cloudtrail": 1.5})
+    limiter = scheduler.limiter("cloudtrail.eu-west-1")
+    assert (limiter.max_limit, limiter.rate) == (3, 1.5)
+    assert scheduler.limiter("cloudtrail.eu-west-1") is limiter
+    assert scheduler.limiter("gcp_logging").rate is None
+
+    scheduler.set_limit("cloudtrail.eu-west-1", 2)
+    assert limiter.max_limit == 2 and limiter.limit == 2
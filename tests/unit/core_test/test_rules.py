@@ -0,0 +1,40 @@
+import pytest
+from src.core.rules import RuleTier, tier_summary
+
+def test_clear_cut_targets_are_decided_with_confidence():
+    rules = RuleTier()
+    decision, reasoning, confidence = rules.classify({"max_cpu": 0.2, "network_in": 0.01})
+    assert decision == "ZOMBIE" and reasoning.startswith("Rules:")
+    assert 0.9 <= confidence <= 0.99
+    # Deeper idle means higher confidence
+    assert rules.classify({"max_cpu": 0.0, "network_in": 0.0})[2] > confidence
+
+    assert rules.classify({"max_cpu": 95.0, "network_in": 0.0})[0] == "ACTIVE"
+    assert rules.classify({"max_cpu": 0.1, "network_in": 0.0, "max_gpu": 70.0})[0] == "ACTIVE"
+
+def test_ambiguous_or_incomplete_metrics_go_to_the_llm():
+    rules = RuleTier()
+    assert rules.classify({"max_cpu": 20.0, "network_in": 0.01}) is None
+    # Idle CPU with real traffic or a working GPU is not clear-cut
+    assert rules.classify({"max_cpu": 0.5, "network_in": 5.0}) is None
+    assert rules.classify({"max_cpu": 0.5, "network_in": 0.0, "max_gpu": 10.0}) is None
+    assert rules.classify({"max_cpu": 0.5}) is None
+    assert rules.classify({}) is None
+
+def test_unobserved_metrics_and_protected_targets_go_to_the_llm():
+    rules = RuleTier()
+    assert rules.classify({"max_cpu": 0.0, "network_in": 0.0, "metrics_observed": False}) is None
+    idle = {"max_cpu": 0.0, "network_in": 0.0}
+    assert rules.classify(idle, {"Tags": [{"Key": "Environment", "Value": "Production"}]}) is None
+    assert rules.classify(idle, {"labels": {"tier": "critical"}}) is None
+    assert rules.classify(idle, {"tags": {"env": "dev"}})[0] == "ZOMBIE"
+
+def test_thresholds_are_validated():
+    with pytest.raises(ValueError):
+        RuleTier(idle_max_cpu=90.0, busy_min_cpu=80.0)
+
+def test_tier_summary_reports_fleet_fractions():
+    summary = tier_summary([{"decided_by": "rules"}, {"decided_by": "rules"}, {"decided_by": "llm"}, {}])
+    assert summary["rules"] == {"count": 2, "fraction": 0.5}
+    assert summary["llm"]["count"] == 1 and summary["error"]["count"] == 1
+    assert summary["cache"] == {"count": 0, "fraction": 0.0}
@@ -0,0 +1,55 @@
+import threading
+import time
+
+import pytest
+
+from src.core.scheduler import Scheduler, parse_limits
+
+def test_pool_respects_concurrency_limit():
+    scheduler = Scheduler({"cloudtrail": 2})
+    lock = threading.Lock()
+    running = [0]
+    peak = [0]
+
+    def task(n):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.02)
+        with lock:
+            running[0] -= 1
+        return n * 2
+
+    assert scheduler.map("cloudtrail", task, range(8)) == [0, 2, 4, 6, 8, 10, 12, 14]
+    assert peak[0] == 2
+
+def test_dotted_pools_inherit_parent_limit_and_can_be_resized():
+    scheduler = Scheduler({"llm": 3})
+    assert scheduler.limit_for("llm.openai") == 3
+    assert scheduler.pool("llm.openai").limit == 3
+
+    scheduler.set_limit("llm.openai", 5)
+    assert scheduler.pool("llm.openai").limit == 5
+    assert scheduler.limit_for("unknown-backend") >= 1
+
+def test_set_limit_resizes_running_pool_regardless_of_case():
+    scheduler = Scheduler({"cloudwatch": 2})
+    pool = scheduler.pool("cloudwatch")
+    limiter = scheduler.limiter("CloudWatch")
+
+    scheduler.set_limit("CloudWatch", 6)
+    assert scheduler.pool("CLOUDWATCH") is pool
+    assert pool.limit == 6 and limiter.max_limit == 6
+
+def test_errors_propagate_through_futures():
+    scheduler = Scheduler()
+
+    def boom():
+        raise RuntimeError("throttled")
+
+    with pytest.raises(RuntimeError, match="throttled"):
+        scheduler.submit("ec2", boom).result(timeout=5)
+
+def test_parse_limits():
+    assert parse_limits("cloudtrail=4, llm.openai=2,bad") == {"cloudtrail": 4, "llm.openai": 2}
+    assert parse_limits(None) == {}
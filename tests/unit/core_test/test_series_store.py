@@ -0,0 +1,57 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.core.series_store import SeriesStore
+
+PERIOD = 300
+BASE = 1_700_000_100.0  # period boundary
+
+def _stamps(first, count):
+    return [BASE + (first + i) * PERIOD for i in range(count)]
+
+def test_append_read_roundtrip_and_reopen(tmp_path):
+    store = SeriesStore(str(tmp_path), capacity=12, period=PERIOD)
+    store.append("cpu", {"i-1": (_stamps(0, 3), [1.0, 2.0, 3.0])})
+    store.flush()
+
+    reopened = SeriesStore(str(tmp_path), capacity=12, period=PERIOD)
+    ts, values = reopened.read("cpu", ["i-1"], BASE, BASE + 12 * PERIOD)["i-1"]
+    assert ts.tolist() == _stamps(0, 3)
+    assert values.tolist() == [1.0, 2.0, 3.0]
+    assert reopened.last_timestamp("cpu", "i-1") == BASE + 2 * PERIOD
+    assert reopened.last_timestamp("cpu", "i-unknown") is None
+
+def test_ring_buffer_keeps_only_latest_capacity_periods(tmp_path):
+    store = SeriesStore(str(tmp_path), capacity=4, period=PERIOD)
+    store.append("cpu", {"i-1": (_stamps(0, 4), [0.0, 1.0, 2.0, 3.0])})
+    # Delta append after a one-period gap recycles the oldest columns
+    store.append("cpu", {"i-1": (_stamps(5, 1), [5.0])})
+
+    ts, values = store.read("cpu", ["i-1"], BASE - 10 * PERIOD, BASE + 10 * PERIOD)["i-1"]
+    assert ts.tolist() == [_stamps(2, 1)[0], _stamps(3, 1)[0], _stamps(5, 1)[0]]
+    assert values.tolist() == [2.0, 3.0, 5.0]
+
+def test_rows_grow_past_initial_allocation(tmp_path):
+    store = SeriesStore(str(tmp_path), capacity=4, period=PERIOD, initial_rows=2)
+    store.append("cpu", {f"i-{n}": (_stamps(0, 1), [float(n)]) for n in range(5)})
+    out = store.read("cpu", [f"i-{n}" for n in range(5)], BASE, BASE + PERIOD)
+    assert [out[f"i-{n}"][1].tolist() for n in range(5)] == [[0.0], [1.0], [2.0], [3.0], [4.0]]
+
+def test_layout_change_discards_history(tmp_path):
+    store = SeriesStore(str(tmp_path), capacity=4, period=PERIOD)
+    store.append("cpu", {"i-1": (_stamps(0, 1), [1.0])})
+    store.flush()
+    assert SeriesStore(str(tmp_path), capacity=8, period=PERIOD).last_timestamp("cpu", "i-1") is None
+
+def test_layout_reset_only_removes_store_files(tmp_path):
+    (tmp_path / "notes.txt").write_text("keep me")
+    (tmp_path / "projects").mkdir()
+    store = SeriesStore(str(tmp_path), capacity=4, period=PERIOD)
+    store.append("cpu", {"i-1": (_stamps(0, 1), [1.0])})
+    store.flush()
+
+    SeriesStore(str(tmp_path), capacity=8, period=PERIOD)
+    assert (tmp_path / "notes.txt").read_text() == "keep me"
+    assert (tmp_path / "projects").is_dir()
+    assert not (tmp_path / "cpu.dat").exists()
@@ -0,0 +1,52 @@
+from unittest.mock import patch
+from src.core.cache import PersistentCache
+from src.llm.base import LLMRecommendation, LLMResponse
+from src.llm.cache import CachedLLM, feature_key
+from src.llm.factory import LLMFactory
+from src.llm.providers.simulated import SimulatedProvider
+
+def _aws_metadata(instance_id, name):
+    return {"InstanceId": instance_id, "InstanceType": "p3.2xlarge",
+            "Tags": [{"Key": "Name", "Value": name}, {"Key": "team", "Value": "ml"}]}
+
+def test_feature_key_ignores_identity_but_not_features():
+    base = feature_key(_aws_metadata("i-1", "a"), {"max_cpu": 12.1, "network_in": 0.4})
+    # Another instance with the same type, tags and bucketed metrics shares the key
+    assert base == feature_key(_aws_metadata("i-2", "b"), {"max_cpu": 13.9, "network_in": 0.2})
+    assert base != feature_key(_aws_metadata("i-1", "a"), {"max_cpu": 42.0, "network_in": 0.4})
+    assert base != feature_key(dict(_aws_metadata("i-1", "a"), InstanceType="g5.xlarge"),
+                               {"max_cpu": 12.1, "network_in": 0.4})
+
+def test_cached_llm_memoizes_across_instances_and_runs(tmp_path):
+    path = str(tmp_path / "cache.db")
+    metrics = {"max_cpu": 12.0, "network_in": 0.4}
+    with patch.object(SimulatedProvider, "classify_instance", wraps=SimulatedProvider().classify_instance) as inner:
+        llm = LLMFactory.with_cache(SimulatedProvider(), path=path)
+        assert isinstance(llm, CachedLLM)
+        first = llm.classify_instance(_aws_metadata("i-1", "a"), metrics)
+        second = llm.classify_instance(_aws_metadata("i-2", "b"), metrics)
+        # A new process (same cache file) still hits
+        third = LLMFactory.with_cache(SimulatedProvider(), path=path).classify_instance(_aws_metadata("i-3", "c"), metrics)
+
+    assert inner.call_count == 1
+    assert first.recommendation == second.recommendation == third.recommendation
+    assert second.usage == {}
+    assert llm.stats()["hit_ratio"] == 0.5
+
+def test_cached_llm_batches_only_misses_and_skips_failed_verdicts(tmp_path):
+    provider = SimulatedProvider()
+    llm = CachedLLM(provider, PersistentCache(str(tmp_path / "cache.db"), namespace="llm"))
+    llm.classify_instance(_aws_metadata("i-1", "a"), {"max_cpu": 12.0})
+
+    with patch.object(SimulatedProvider, "classify_batch", wraps=provider.classify_batch) as batch:
+        results = llm.classify_batch([(_aws_metadata("i-2", "b"), {"max_cpu": 12.0}),
+                                      (_aws_metadata("i-3", "c"), {"max_cpu": 80.0})])
+    assert len(batch.call_args.args[0]) == 1
+    assert [r.recommendation.decision for r in results] == ["ACTIVE", "ACTIVE"]
+
+    failed = LLMResponse(raw_response="boom", model="m",
+                         recommendation=LLMRecommendation(decision="ACTIVE", reasoning="API Error", confidence=0.0))
+    with patch.object(SimulatedProvider, "classify_instance", return_value=failed) as inner:
+        llm.classify_instance({}, {"max_cpu": 55.0})
+        llm.classify_instance({}, {"max_cpu": 55.0})
+    assert inner.call_count == 2
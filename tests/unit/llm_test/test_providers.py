@@ -1,3 +1,4 @@
+import pytest
 from unittest.mock import MagicMock, patch
 from src.llm.factory import LLMFactory
 
@@ -65,3 +66,78 @@ def test_groq_provider_mock(mock_client_class):
     
     assert res.recommendation.decision == "ZOMBIE"
     assert "Groq" in res.recommendation.reasoning
+
+@patch("src.llm.providers.anthropic.Anthropic")
+@patch.dict("os.environ", {"ANTHROPIC_API_KEY": "sk-test-123"})
+def test_classify_batch_packs_items_and_falls_back_for_invalid_entries(mock_client_class):
+    import json
+    mock_client = mock_client_class.return_value
+    batch = MagicMock()
+    # Item 1 has an invalid decision and item 2 is missing from the reply
+    batch.content[0].text = json.dumps({"results": [
+        {"key": "0", "decision": "ZOMBIE", "reasoning": "Idle", "confidence": 0.9},
+        {"key": "1", "decision": "MAYBE", "reasoning": "?", "confidence": 0.5},
+    ]})
+    single = MagicMock()
+    single.content[0].text = '{"decision": "ACTIVE", "reasoning": "Busy", "confidence": 0.8}'
+    mock_client.messages.create.side_effect = [batch, single, single]
+
+    provider = LLMFactory.get_provider("claude")
+    items = [({"id": f"i-{n}"}, {"max_cpu": float(n)}) for n in range(3)]
+    results = provider.classify_batch(items)
+
+    assert [r.recommendation.decision for r in results] == ["ZOMBIE", "ACTIVE", "ACTIVE"]
+    assert mock_client.messages.create.call_count == 3
+    packed = json.loads(mock_client.messages.create.call_args_list[0].kwargs["messages"][0]["content"])
+    assert [entry["key"] for entry in packed] == ["0", "1", "2"]
+
+@patch("src.llm.providers.anthropic.AsyncAnthropic")
+@patch("src.llm.providers.anthropic.Anthropic")
+@patch.dict("os.environ", {"ANTHROPIC_API_KEY": "sk-test-123"})
+def test_async_provider_uses_async_client_and_shared_parsing(mock_client_class, mock_async_class):
+    import asyncio
+    from unittest.mock import AsyncMock
+    response = MagicMock()
+    response.content[0].text = '```json\n{"decision": "ZOMBIE", "reasoning": "Idle", "confidence": 0.9}\n```'
+    response.usage.input_tokens = 100
+    response.usage.output_tokens = 50
+    mock_async_class.return_value.messages.create = AsyncMock(return_value=response)
+    mock_client_class.return_value.messages.create.return_value = response
+
+    provider = LLMFactory.get_provider("claude")
+    async_res = asyncio.run(provider.aclassify_instance({"id": "test"}, {"max_cpu": 1.0}))
+    sync_res = provider.classify_instance({"id": "test"}, {"max_cpu": 1.0})
+
+    assert async_res == sync_res
+    assert async_res.recommendation.decision == "ZOMBIE"
+    assert async_res.usage == {"input_tokens": 100, "output_tokens": 50}
+    mock_async_class.return_value.messages.create.assert_awaited_once()
+    assert mock_client_class.return_value.messages.create.call_count == 1
+
+def test_providers_without_batch_or_async_support_fall_back_to_classify_instance():
+    import asyncio
+    from src.llm.base import AsyncCompletionProvider, BaseLLM, LLMRecommendation, LLMResponse
+
+    class SyncOnly(BaseLLM):
+        model = "sync-only"
+
+        def classify_instance(self, metadata, metrics):
+            return LLMResponse(raw_response="", model=self.model,
+                               recommendation=LLMRecommendation(decision="ACTIVE", reasoning=metadata["id"], confidence=0.8))
+
+        def _complete(self, system, user, items=1):
+            raise AssertionError("only CompletionProvider subclasses get batch requests")
+
+    provider = SyncOnly()
+    items = [({"id": "a"}, {}), ({"id": "b"}, {})]
+    assert not provider.supports_batch and not provider.supports_async
+    assert [r.recommendation.reasoning for r in provider.classify_batch(items)] == ["a", "b"]
+    assert [r.recommendation.reasoning for r in asyncio.run(provider.aclassify_batch(items))] == ["a", "b"]
+    assert asyncio.run(provider.aclassify_instance({"id": "c"}, {})).recommendation.reasoning == "c"
+
+    # Declaring the async capability without its hooks fails at construction, not mid-batch
+    class Incomplete(SyncOnly, AsyncCompletionProvider):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
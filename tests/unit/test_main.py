@@ -8,6 +8,9 @@ def mock_adapters():
         aws = MagicMock()
         azure = MagicMock()
         gcp = MagicMock()
+        # Discovery streams through scan_iter; route it to the scan() stubs below
+        for adapter in (aws, azure, gcp):
+            adapter.scan_iter.side_effect = lambda a=adapter: iter(a.scan())
         mock_all.return_value = [aws, azure, gcp]
         yield aws, azure, gcp
 
@@ -83,3 +86,260 @@ def test_main_entrypoint_with_zombies(mock_adapters, mock_brain):
             main()
     
     aws.scan.assert_called()
+
+def test_discovery_service_scans_adapters_concurrently(mock_adapters):
+    import threading
+    aws, azure, gcp = mock_adapters
+    barrier = threading.Barrier(3, timeout=5)
+
+    def scan_with_barrier(target_id):
+        # Only passes if all three scans are in flight at the same time
+        barrier.wait()
+        return [{'id': target_id}]
+
+    aws.scan.side_effect = lambda: scan_with_barrier('aws-1')
+    azure.scan.side_effect = lambda: scan_with_barrier('az-1')
+    gcp.scan.side_effect = lambda: scan_with_barrier('gcp-1')
+
+    service = DiscoveryService(region="us-east-1", simulated=True)
+    results = service.scan_all()
+
+    assert sorted(r['id'] for r in results) == ['aws-1', 'az-1', 'gcp-1']
+    assert all(entry['status'] == 'ok' for entry in service.scan_report)
+    assert all(entry['duration_s'] is not None for entry in service.scan_report)
+
+def test_discovery_service_isolates_hung_and_failing_adapters(mock_adapters):
+    import threading
+    aws, azure, gcp = mock_adapters
+    release = threading.Event()
+    aws.scan.return_value = [{'id': 'aws-1'}]
+    azure.scan.side_effect = lambda: release.wait(5) and []
+    gcp.scan.side_effect = RuntimeError("quota exceeded")
+
+    service = DiscoveryService(region="us-east-1", simulated=True, timeout=0.2)
+    try:
+        results = service.scan_all()
+    finally:
+        release.set()
+
+    assert [r['id'] for r in results] == ['aws-1']
+    statuses = [entry['status'] for entry in service.scan_report]
+    assert statuses == ['ok', 'timeout', 'error']
+    assert "quota exceeded" in service.scan_report[2]['error']
+
+def test_runner_streams_results_in_completion_order(mock_adapters, mock_brain):
+    import threading
+    aws, azure, _ = mock_adapters
+    slow_released = threading.Event()
+    aws.scan.return_value = [{'id': 'slow', 'platform': 'AWS', 'type': 'p3.2xlarge', 'metadata': {}, 'metrics': {}}]
+    azure.scan.return_value = [{'id': 'fast', 'platform': 'AZURE', 'type': 'NC6', 'metadata': {}, 'metrics': {}}]
+
+    def classify(metadata, metrics):
+        if metadata.get('slow'):
+            slow_released.wait(5)
+        report = MagicMock()
+        report.recommendation.decision = "ACTIVE"
+        report.recommendation.reasoning = "Busy"
+        return report
+
+    aws.scan.return_value[0]['metadata'] = {'slow': True}
+    mock_brain.classify_instance.side_effect = classify
+
+    renderer = MagicMock()
+    renderer.print_row.side_effect = lambda t, monthly: slow_released.set()
+
+    runner = CloudCullRunner(simulated=True, dry_run=True, max_workers=2, queue_size=1)
+    results = runner.run_audit(renderer=renderer)
+
+    # The fast target is rendered first, which is what releases the slow one
+    assert [r['id'] for r in results] == ['fast', 'slow']
+
+def test_incremental_audit_reuses_unchanged_verdicts(mock_adapters, mock_brain, tmp_path):
+    aws, _, _ = mock_adapters
+    # Metrics in the ambiguous band, so the rules tier leaves the target to the LLM
+    target = {'id': 'i-123', 'platform': 'AWS', 'type': 'p3.2xlarge', 'metadata': {},
+              'metrics': {'max_cpu': 12.0, 'network_in': 0.5}, 'owner': 'admin'}
+    aws.scan.side_effect = lambda: [dict(target, metrics=dict(target['metrics']))]
+
+    report = MagicMock()
+    report.recommendation.decision = "ZOMBIE"
+    report.recommendation.reasoning = "Idle GPU"
+    mock_brain.classify_instance.return_value = report
+
+    with patch('src.main.settings.cache_path', str(tmp_path / 'cache.db')):
+        CloudCullRunner(simulated=True, dry_run=True, incremental=True).run_audit()
+        rerun = CloudCullRunner(simulated=True, dry_run=True, incremental=True)
+        results = rerun.run_audit()
+
+    assert mock_brain.classify_instance.call_count == 1
+    assert results[0]['status'] == "ZOMBIE"
+    assert results[0]['reasoning'] == "Idle GPU"
+    assert rerun.incremental_stats == {"reused": 1, "classified": 0}
+
+def test_runner_batches_llm_requests(mock_adapters, mock_brain):
+    aws, _, _ = mock_adapters
+    aws.scan.return_value = [{'id': f'i-{n}', 'platform': 'AWS', 'type': 'p3.2xlarge', 'metadata': {},
+                              'metrics': {}, 'owner': 'admin'} for n in range(5)]
+
+    def classify_batch(items):
+        report = MagicMock()
+        report.recommendation.decision = "ZOMBIE"
+        report.recommendation.reasoning = "Idle GPU"
+        return [report] * len(items)
+    mock_brain.classify_batch.side_effect = classify_batch
+
+    results = CloudCullRunner(simulated=True, dry_run=True, llm_batch_size=2).run_audit()
+
+    assert sorted(r['id'] for r in results) == [f'i-{n}' for n in range(5)]
+    assert all(r['status'] == "ZOMBIE" for r in results)
+    assert sorted(len(c.args[0]) for c in mock_brain.classify_batch.call_args_list) == [1, 2, 2]
+    mock_brain.classify_instance.assert_not_called()
+
+def test_rules_tier_skips_llm_for_clear_cut_targets(mock_adapters, mock_brain):
+    aws, _, _ = mock_adapters
+    aws.scan.return_value = [
+        {'id': f'i-{name}', 'platform': 'AWS', 'type': 'p3.2xlarge', 'metadata': {}, 'metrics': metrics, 'owner': 'admin'}
+        for name, metrics in [('idle', {'max_cpu': 0.2, 'network_in': 0.01}),
+                              ('busy', {'max_cpu': 90.0, 'network_in': 40.0}),
+                              ('unsure', {'max_cpu': 20.0, 'network_in': 2.0})]
+    ]
+    report = MagicMock()
+    report.recommendation.decision = "ACTIVE"
+    report.recommendation.reasoning = "Periodic batch job"
+    report.recommendation.confidence = 0.7
+    mock_brain.classify_instance.return_value = report
+
+    runner = CloudCullRunner(simulated=True, dry_run=True)
+    results = {r['id']: r for r in runner.run_audit()}
+
+    assert (results['i-idle']['status'], results['i-idle']['decided_by']) == ("ZOMBIE", "rules")
+    assert (results['i-busy']['status'], results['i-busy']['decided_by']) == ("ACTIVE", "rules")
+    assert results['i-unsure']['decided_by'] == "llm"
+    mock_brain.classify_instance.assert_called_once()
+    assert runner.tier_report['rules'] == {"count": 2, "fraction": 0.6667}
+    assert runner.tier_report['llm']['count'] == 1
+
+def test_async_pipeline_keeps_requests_in_flight_without_threads(mock_adapters, mock_brain):
+    import asyncio
+    import threading
+    aws, _, _ = mock_adapters
+    aws.scan.return_value = [{'id': f'i-{n}', 'platform': 'AWS', 'type': 'p3.2xlarge', 'metadata': {},
+                              'metrics': {}, 'owner': 'admin'} for n in range(60)]
+    in_flight, peak, threads = [0], [0], []
+
+    async def aclassify_instance(metadata, metrics):
+        in_flight[0] += 1
+        peak[0] = max(peak[0], in_flight[0])
+        threads.append(threading.active_count())
+        await asyncio.sleep(0.05)
+        in_flight[0] -= 1
+        report = MagicMock()
+        report.recommendation.decision = "ACTIVE"
+        report.recommendation.reasoning = "Busy"
+        return report
+    mock_brain.aclassify_instance.side_effect = aclassify_instance
+
+    baseline = threading.active_count()
+    results = CloudCullRunner(simulated=True, dry_run=True, max_workers=40, async_llm=True).run_audit()
+
+    assert len(results) == 60 and all(r['status'] == "ACTIVE" for r in results)
+    # The per-provider semaphore caps requests in flight at --workers
+    assert peak[0] == 40
+    # Only the event loop, feed and discovery threads are added, not one per request
+    assert max(threads) - baseline < 10
+    mock_brain.classify_instance.assert_not_called()
+
+def test_async_workers_raise_the_provider_limiter_ceiling(mock_adapters, mock_brain):
+    import asyncio
+    from src.core.scheduler import scheduler
+    aws, _, _ = mock_adapters
+    aws.scan.return_value = [{'id': f'i-{n}', 'platform': 'AWS', 'type': 'p3.2xlarge', 'metadata': {},
+                              'metrics': {}, 'owner': 'admin'} for n in range(60)]
+    in_flight, peak = [0], [0]
+
+    async def request():
+        in_flight[0] += 1
+        peak[0] = max(peak[0], in_flight[0])
+        await asyncio.sleep(0.05)
+        in_flight[0] -= 1
+
+    async def aclassify_instance(metadata, metrics):
+        # Same path as BaseLLM._arequest: the SDK call waits on the provider's adaptive limiter
+        await scheduler.limiter("llm.anthropic").acall(request)
+        report = MagicMock()
+        report.recommendation.decision = "ACTIVE"
+        report.recommendation.reasoning = "Busy"
+        return report
+    mock_brain.aclassify_instance.side_effect = aclassify_instance
+
+    CloudCullRunner(simulated=True, dry_run=True, max_workers=10, async_llm=True)
+    CloudCullRunner(simulated=True, dry_run=True, max_workers=40, async_llm=True).run_audit()
+
+    # Well past the scheduler's default limit of 10
+    assert peak[0] == 40
+
+def test_preflight_checks_run_concurrently_with_timeout_and_cache(mock_adapters, mock_brain, tmp_path):
+    import threading
+    from src.adapters.aws import AWSAdapter
+    release = threading.Event()
+    hung = MagicMock()
+    hung.verify_connection.side_effect = lambda: release.wait(5)
+    cached = AWSAdapter(region="eu-west-1", simulated=True)
+
+    runner = CloudCullRunner(simulated=True, dry_run=True)
+    with patch('src.main.settings.cache_path', str(tmp_path / 'cache.db')), \
+         patch('src.main.settings.preflight_timeout', 0.2), \
+         patch.object(AWSAdapter, 'verify_connection', return_value=True) as verify:
+        try:
+            assert runner._verify_adapters([hung, cached]) == [False, True]
+        finally:
+            release.set()
+        # The second run trusts the cached success for the same region
+        assert runner._verify_adapters([cached]) == [True]
+
+    assert verify.call_count == 1
+
+def test_preflight_caches_all_scopes_and_evicts_failed_adapters(mock_adapters, mock_brain, tmp_path):
+    from src.adapters import AdapterRegistry
+    from src.adapters.aws import AWSAdapter
+    from src.adapters.azure import AzureAdapter
+    from src.core.scheduler import scheduler
+    from src.core.settings import settings
+    one = AzureAdapter(simulated=True, subscription_ids=["sub-a"])
+    both = AzureAdapter(simulated=True, subscription_ids=["sub-a", "sub-b"])
+    broken = AWSAdapter(region="ap-south-1", simulated=True)
+    AdapterRegistry.register(broken, simulated=True)
+
+    runner = CloudCullRunner(simulated=True, dry_run=True)
+    with patch('src.main.settings.cache_path', str(tmp_path / 'cache.db')), \
+         patch.object(AzureAdapter, 'verify_connection', return_value=True) as verify, \
+         patch.object(AWSAdapter, 'verify_connection', return_value=False):
+        assert runner._verify_adapters([one, broken]) == [True, False]
+        # sub-b was never verified, so sharing sub-a with a cached adapter is not enough
+        assert runner._verify_adapters([both]) == [True]
+    assert verify.call_count == 2
+
+    with pytest.raises(ConnectionError):
+        AdapterRegistry.adapter_for_target({"platform": "AWS", "region": "ap-south-1"}, simulated=True)
+    # The shared pool keeps its configured size
+    assert scheduler.limit_for("preflight") == settings.preflight_concurrency
+    AdapterRegistry.clear()
+
+def test_cli_import_skips_cloud_sdks():
+    import subprocess
+    import sys
+    from pathlib import Path
+    probe = ("import sys, src.main; "
+             "print(sorted({m.split('.')[0] for m in sys.modules if m.split('.')[0] in ('boto3', 'azure')} "
+             "| {m for m in ('google.cloud', 'src.adapters.aws') if m in sys.modules}))")
+    out = subprocess.run([sys.executable, "-c", probe], cwd=Path(__file__).resolve().parents[2],
+                         capture_output=True, text=True, check=True).stdout
+    assert out.strip() == "[]"
+
+def test_platform_selection_builds_only_requested_adapters():
+    from src.adapters import AdapterRegistry, parse_platforms
+    adapters = AdapterRegistry.get_all_adapters(simulated=True, platforms=parse_platforms("gcp, aws"))
+    assert [type(a).__name__ for a in adapters] == ["AWSAdapter", "GCPAdapter"]
+    assert parse_platforms("") is None
+    with pytest.raises(ValueError):
+        parse_platforms("aws,oracle")